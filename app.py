@@ -1,10 +1,26 @@
 import streamlit as st
-import math
+import numpy as np
 import pandas as pd
 from datetime import datetime
-import locale
 import logging
 
+import financeiro
+from financeiro import formatar_moeda, formatar_moedas
+from financeiro.antecipacao import MODOS_ANTECIPACAO
+from financeiro.cache import memoizar
+from financeiro.investimentos import TIPOS_PRODUTO
+from financeiro.monte_carlo import ler_historico
+from financeiro.sensibilidade import METRICAS, cores_mapa_calor, tabela_sensibilidade
+
+# Motores memorizados: entradas repetidas retornam o resultado já calculado, compartilhado entre sessões
+calcular_price = memoizar(financeiro.calcular_price)
+calcular_sac = memoizar(financeiro.calcular_sac)
+calcular_antecipacoes = memoizar(financeiro.calcular_antecipacoes)
+comparar_investimentos = memoizar(financeiro.comparar_investimentos)
+grade_sensibilidade = memoizar(financeiro.grade_sensibilidade)
+simular_monte_carlo = memoizar(financeiro.simular_monte_carlo)
+matriz_decisao = memoizar(financeiro.matriz_decisao)
+
 # --- Configuração inicial de logging ---
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,149 +28,6 @@ logger = logging.getLogger(__name__)
 # --- CONFIGURAÇÃO INICIAL ---
 st.set_page_config(page_title="Calculadora Financeira", page_icon="💰", layout="wide")
 
-# --- Configuração robusta do locale com cache ---
-@st.cache_resource
-def configure_locale():
-    try:
-        locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
-        logger.info("Locale configurado para pt_BR.UTF-8")
-    except locale.Error:
-        try:
-            locale.setlocale(locale.LC_ALL, 'pt_BR')
-            logger.info("Locale configurado para pt_BR")
-        except locale.Error:
-            try:
-                locale.setlocale(locale.LC_ALL, 'Portuguese_Brazil.1252')
-                logger.info("Locale configurado para Portuguese_Brazil.1252")
-            except locale.Error:
-                try:
-                    locale.setlocale(locale.LC_ALL, '')
-                    logger.info("Locale configurado para padrão do sistema")
-                except locale.Error:
-                    locale.setlocale(locale.LC_ALL, 'C.UTF-8')
-                    logger.warning("Configuração de locale específica não disponível. Usando padrão internacional.")
-
-configure_locale()
-
-# Função para formatar moeda com fallback robusto
-def formatar_moeda(valor):
-    try:
-        return locale.currency(valor, grouping=True, symbol=True)
-    except:
-        try:
-            return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-        except:
-            return f"R$ {valor:.2f}"
-
-# --- Funções de Cálculo Financeiro ---
-def calcular_price(valor_financiado, taxa_juros, prazo_meses):
-    i = taxa_juros / 100
-    parcela = valor_financiado * (i * math.pow(1 + i, prazo_meses)) / (math.pow(1 + i, prazo_meses) - 1)
-    
-    parcelas = []
-    saldo_devedor = valor_financiado
-    
-    for periodo in range(1, prazo_meses + 1):
-        juros = saldo_devedor * i
-        amortizacao = parcela - juros
-        saldo_devedor -= amortizacao
-        if saldo_devedor < 0.01:
-            saldo_devedor = 0
-        
-        parcelas.append({
-            'Período': periodo,
-            'Prestação': round(parcela, 2),
-            'Juros': round(juros, 2),
-            'Amortização': round(amortizacao, 2),
-            'Saldo Devedor': round(saldo_devedor, 2)
-        })
-    
-    return {
-        'valor_financiado': round(valor_financiado, 2),
-        'taxa_juros': round(taxa_juros, 2),
-        'prazo_meses': prazo_meses,
-        'valor_parcela': round(parcela, 2),
-        'total_pago': round(parcela * prazo_meses, 2),
-        'total_juros': round(parcela * prazo_meses - valor_financiado, 2),
-        'parcelas': parcelas
-    }
-
-def calcular_sac(valor_financiado, taxa_juros, prazo_meses):
-    i = taxa_juros / 100
-    amortizacao = valor_financiado / prazo_meses
-    
-    parcelas = []
-    saldo_devedor = valor_financiado
-    total_pago = 0
-    total_juros = 0
-    
-    for periodo in range(1, prazo_meses + 1):
-        juros = saldo_devedor * i
-        parcela = amortizacao + juros
-        saldo_devedor -= amortizacao
-        if saldo_devedor < 0.01:
-            saldo_devedor = 0
-        
-        total_pago += parcela
-        total_juros += juros
-        
-        parcelas.append({
-            'Período': periodo,
-            'Prestação': round(parcela, 2),
-            'Juros': round(juros, 2),
-            'Amortização': round(amortizacao, 2),
-            'Saldo Devedor': round(saldo_devedor, 2)
-        })
-    
-    return {
-        'valor_financiado': round(valor_financiado, 2),
-        'taxa_juros': round(taxa_juros, 2),
-        'prazo_meses': prazo_meses,
-        'valor_primeira_parc': round(parcelas[0]['Prestação'], 2),
-        'valor_ultima_parc': round(parcelas[-1]['Prestação'], 2),
-        'total_pago': round(total_pago, 2),
-        'total_juros': round(total_juros, 2),
-        'parcelas': parcelas
-    }
-
-def simular_poupanca(valor, prazo_meses, taxa=0.5):
-    montante = valor
-    historico = []
-    
-    for mes in range(1, prazo_meses + 1):
-        montante *= (1 + taxa/100)
-        historico.append({
-            'Mês': mes,
-            'Valor': round(montante, 2),
-            'Rendimento': round(montante - valor, 2)
-        })
-    
-    return {
-        'valor_inicial': valor,
-        'valor_final': round(montante, 2),
-        'rendimento_total': round(montante - valor, 2),
-        'historico': historico
-    }
-
-def simular_imobiliario(valor, prazo_meses, taxa=0.7):
-    montante = valor
-    historico = []
-    
-    for mes in range(1, prazo_meses + 1):
-        montante *= (1 + taxa/100)
-        historico.append({
-            'Mês': mes,
-            'Valor': round(montante, 2),
-            'Rendimento': round(montante - valor, 2)
-        })
-    
-    return {
-        'valor_inicial': valor,
-        'valor_final': round(montante, 2),
-        'rendimento_total': round(montante - valor, 2),
-        'historico': historico
-    }
-
 # --- Funções para Visualização ---
 def mostrar_evolucao_financiamento(df, sistema_nome):
     st.subheader(f"Evolução - Sistema {sistema_nome}")
@@ -206,35 +79,32 @@ def mostrar_comparativo_sistemas(df_price, df_sac):
         color='#d62728'  # Vermelho para diferença
     )
 
-def mostrar_evolucao_investimentos(df_poup, df_imob):
+def mostrar_evolucao_investimentos(historico):
     st.subheader("Evolução dos Investimentos")
     
-    # Combinar os dados
-    df_combinado = pd.DataFrame({
-        'Mês': df_poup['Mês'],
-        'Poupança': df_poup['Valor'],
-        'Outra Aplicação': df_imob['Valor'],
-        'Rendimento Poupança': df_poup['Rendimento'],
-        'Rendimento Outra': df_imob['Rendimento']
-    })
+    # Uma coluna por produto a partir do histórico em formato longo
+    valores = historico.pivot(index='Mês', columns='Produto', values='Valor Líquido')
+    rendimentos = historico.pivot(index='Mês', columns='Produto', values='Rendimento')
     
-    # Gráfico de valores
-    st.line_chart(
-        df_combinado.set_index('Mês')[['Poupança', 'Outra Aplicação']],
-        color=['#1f77b4', '#ff7f0e']
-    )
+    # Gráfico de valores líquidos (descontado o IR de um resgate no mês)
+    st.line_chart(valores)
     
-    # Gráfico de rendimentos
-    st.area_chart(
-        df_combinado.set_index('Mês')[['Rendimento Poupança', 'Rendimento Outra']],
-        color=['#a6cee3', '#fdbf6f']
-    )
+    # Gráfico de rendimentos brutos
+    st.area_chart(rendimentos)
+
+# Produtos iniciais da aba de investimentos (editáveis na tabela)
+PRODUTOS_PADRAO = {
+    'Produto': ["Poupança", "CDB 100% CDI", "Tesouro IPCA+", "Outra aplicação"],
+    'Tipo': ["prefixado", "cdi", "ipca", "prefixado"],
+    'Taxa': [0.5, 100.0, 6.0, 0.7],
+    'Isento de IR': [True, False, False, False]
+}
 
 # --- Interface do Streamlit ---
 st.title("💰 Calculadora Financeira Avançada")
 
 # Criar abas
-tab1, tab2, tab3 = st.tabs(["Cálculo", "Comparativo", "Investimentos"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["Cálculo", "Comparativo", "Investimentos", "Sensibilidade", "À Vista ou Financiar"])
 
 with tab1:
     st.header("Cálculo de Financiamento")
@@ -248,14 +118,34 @@ with tab1:
         prazo_meses = st.number_input("Prazo (em meses):", min_value=1, step=1, value=36)
     
     sistema = st.selectbox("Sistema de Amortização:", ["Price (Parcelas fixas)", "SAC (Amortização constante)"])
+    exato = st.checkbox("Cálculo exato em centavos (arredondamento ABNT)", value=False)
+    
+    with st.expander("Amortizações extraordinárias"):
+        st.caption("Cada antecipação é paga junto com a parcela do mês e reduz o prazo ou o valor das parcelas seguintes.")
+        antecipacoes_editadas = st.data_editor(
+            pd.DataFrame({'Mês': pd.Series(dtype="int64"), 'Valor': pd.Series(dtype="float64"), 'Reduzir': pd.Series(dtype="str")}),
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'Mês': st.column_config.NumberColumn("Mês", min_value=1, step=1),
+                'Valor': st.column_config.NumberColumn("Valor (R$)", min_value=0.0, format="%.2f"),
+                'Reduzir': st.column_config.SelectboxColumn("Reduzir", options=list(MODOS_ANTECIPACAO), default="prazo")
+            },
+            key="antecipacoes"
+        )
+    antecipacoes = [
+        {'mes': int(linha['Mês']), 'valor': float(linha['Valor']), 'modo': linha['Reduzir'] or "prazo"}
+        for linha in antecipacoes_editadas.dropna(subset=['Mês', 'Valor']).to_dict(orient="records")
+    ]
     
     if st.button("Calcular Financiamento"):
         try:
             if "Price" in sistema:
-                resultado = calcular_price(valor_financiado, taxa_juros, prazo_meses)
+                resultado = calcular_price(valor_financiado, taxa_juros, prazo_meses, exato)
                 sistema_nome = "Price"
             else:
-                resultado = calcular_sac(valor_financiado, taxa_juros, prazo_meses)
+                resultado = calcular_sac(valor_financiado, taxa_juros, prazo_meses, exato)
                 sistema_nome = "SAC"
             
             # Exibir resumo
@@ -281,20 +171,39 @@ with tab1:
             
             # Tabela de parcelas
             st.subheader("Detalhamento das Parcelas")
-            df = pd.DataFrame(resultado['parcelas'])
+            df = resultado['parcelas']
+            colunas_monetarias = ['Prestação', 'Juros', 'Amortização', 'Saldo Devedor']
             st.dataframe(
-                df.style.format({
-                    'Prestação': lambda x: formatar_moeda(x),
-                    'Juros': lambda x: formatar_moeda(x),
-                    'Amortização': lambda x: formatar_moeda(x),
-                    'Saldo Devedor': lambda x: formatar_moeda(x)
-                }),
+                df.assign(**{col: formatar_moedas(df[col]) for col in colunas_monetarias}),
                 hide_index=True,
                 use_container_width=True
             )
             
             # Gráficos
             mostrar_evolucao_financiamento(df, sistema_nome)
+            
+            if antecipacoes:
+                com_antecipacao = calcular_antecipacoes(valor_financiado, taxa_juros, prazo_meses, antecipacoes,
+                                                        sistema_nome.lower())
+                st.subheader("Com Amortizações Extraordinárias")
+                cols = st.columns(4)
+                cols[0].metric("Prazo Final", f"{com_antecipacao['prazo_final']} meses",
+                               f"-{com_antecipacao['meses_economizados']} meses", delta_color="inverse")
+                cols[1].metric("Parcela Após Antecipações", formatar_moeda(com_antecipacao['parcela_final']))
+                cols[2].metric("Total Antecipado", formatar_moeda(com_antecipacao['total_antecipado']))
+                cols[3].metric("Economia de Juros", formatar_moeda(com_antecipacao['economia_juros']))
+                
+                df_antecipacao = com_antecipacao['parcelas']
+                colunas_antecipacao = colunas_monetarias + ['Amortização Extra']
+                st.dataframe(
+                    df_antecipacao.assign(**{col: formatar_moedas(df_antecipacao[col]) for col in colunas_antecipacao}),
+                    hide_index=True,
+                    use_container_width=True
+                )
+                st.area_chart(pd.DataFrame({
+                    'Sem antecipação': df.set_index('Período')['Saldo Devedor'],
+                    'Com antecipação': df_antecipacao.set_index('Período')['Saldo Devedor']
+                }).fillna(0))
                     
         except Exception as e:
             st.error(f"Erro ao calcular financiamento: {str(e)}")
@@ -349,8 +258,8 @@ with tab2:
             cols[2].metric("Diferença", f"{formatar_moeda(diff_juros)} ({percentual_diff}%)")
             
             # Gráficos comparativos
-            df_price = pd.DataFrame(resultado_price['parcelas'])
-            df_sac = pd.DataFrame(resultado_sac['parcelas'])
+            df_price = resultado_price['parcelas']
+            df_sac = resultado_sac['parcelas']
             mostrar_comparativo_sistemas(df_price, df_sac)
             
             # Análise
@@ -371,43 +280,244 @@ with tab3:
     col1, col2, col3 = st.columns(3)
     with col1:
         valor_invest = st.number_input("Valor Disponível (R$):", min_value=0.0, step=1000.0, value=100000.0, key="valor_invest")
+        cdi_invest = st.number_input("CDI (% a.a.):", min_value=0.0, step=0.25, value=10.5, key="cdi_invest")
     with col2:
         prazo_invest = st.number_input("Prazo (em meses):", min_value=1, step=1, value=36, key="prazo_invest")
+        ipca_invest = st.number_input("IPCA (% a.a.):", min_value=0.0, step=0.25, value=4.5, key="ipca_invest")
     with col3:
-        taxa_poupanca = st.number_input("Rendimento Poupança (% a.m.):", min_value=0.0, step=0.01, value=0.5, key="taxa_poup")
+        aporte_invest = st.number_input("Aporte mensal (R$):", min_value=0.0, step=100.0, value=0.0, key="aporte_invest")
+        resgate_invest = st.number_input("Resgate mensal (R$):", min_value=0.0, step=100.0, value=0.0, key="resgate_invest")
     
-    col1, col2 = st.columns(2)
-    with col1:
-        taxa_imobiliario = st.number_input("Outra aplicação (% a.m.):", min_value=0.0, step=0.01, value=0.7, key="taxa_imob")
+    produtos_invest = st.data_editor(
+        pd.DataFrame(PRODUTOS_PADRAO),
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'Tipo': st.column_config.SelectboxColumn("Tipo", options=list(TIPOS_PRODUTO), required=True),
+            'Taxa': st.column_config.NumberColumn(
+                "Taxa", help="prefixado: % a.m. | cdi: % do CDI | ipca: spread em % a.a.", min_value=0.0, format="%.2f"
+            ),
+            'Isento de IR': st.column_config.CheckboxColumn("Isento de IR")
+        },
+        key="produtos_invest"
+    )
     
     if st.button("Simular Investimentos", key="simular"):
         try:
-            res_poupanca = simular_poupanca(valor_invest, prazo_invest, taxa_poupanca)
-            res_imobiliario = simular_imobiliario(valor_invest, prazo_invest, taxa_imobiliario)
+            produtos = [
+                {'nome': linha['Produto'], 'tipo': linha['Tipo'], 'taxa': linha['Taxa'], 'isento_ir': bool(linha['Isento de IR'])}
+                for linha in produtos_invest.dropna(subset=['Tipo', 'Taxa']).to_dict(orient="records")
+            ]
+            resultado = comparar_investimentos(
+                valor_invest, prazo_invest, produtos, aporte_invest, resgate_invest, cdi_invest, ipca_invest
+            )
+            resumo = resultado['resumo']
             
             # Resultados
             st.subheader("Resultados dos Investimentos")
             
-            cols = st.columns(2)
-            with cols[0]:
-                st.metric("Poupança - Valor Final", formatar_moeda(res_poupanca['valor_final']))
-                st.metric("Poupança - Rendimento", formatar_moeda(res_poupanca['rendimento_total']))
-                
-                df_poup = pd.DataFrame(res_poupanca['historico'])
-                st.line_chart(df_poup.set_index('Mês')['Valor'])
+            melhor = resumo.loc[resumo['valor_liquido'].idxmax()]
+            cols = st.columns(3)
+            cols[0].metric("Melhor Opção", melhor['produto'])
+            cols[1].metric("Valor Líquido", formatar_moeda(melhor['valor_liquido']))
+            cols[2].metric("Rendimento Líquido", formatar_moeda(melhor['rendimento_liquido']))
             
-            with cols[1]:
-                st.metric("Outra aplicação - Valor Final", formatar_moeda(res_imobiliario['valor_final']))
-                st.metric("Outra aplicação - Rendimento", formatar_moeda(res_imobiliario['rendimento_total']))
-                
-                df_imob = pd.DataFrame(res_imobiliario['historico'])
-                st.line_chart(df_imob.set_index('Mês')['Valor'])
+            colunas_monetarias = ['valor_final', 'total_aplicado', 'total_resgatado', 'rendimento_bruto', 'imposto', 'valor_liquido', 'rendimento_liquido']
+            st.dataframe(
+                resumo.assign(**{col: formatar_moedas(resumo[col]) for col in colunas_monetarias}).rename(columns={
+                    'produto': "Produto", 'valor_final': "Valor Final", 'total_aplicado': "Total Aplicado",
+                    'total_resgatado': "Total Resgatado", 'rendimento_bruto': "Rendimento Bruto", 'imposto': "IR no Resgate", 'valor_liquido': "Valor Líquido",
+                    'rendimento_liquido': "Rendimento Líquido", 'rentabilidade_liquida': "Rentabilidade Líquida (%)"
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
             
             # Comparativo
-            mostrar_evolucao_investimentos(df_poup, df_imob)
+            mostrar_evolucao_investimentos(resultado['historico'])
                 
         except Exception as e:
             st.error(f"Erro ao simular investimentos: {str(e)}")
+    
+    st.divider()
+    st.subheader("Cenários de Taxa (Monte Carlo)")
+    st.caption("Milhares de trajetórias de taxa mensal para o valor e o prazo acima")
+    
+    modelo_mc = st.radio(
+        "Modelo de taxa:",
+        ["reversao", "bootstrap"],
+        format_func={'reversao': "Selic com reversão à média", 'bootstrap': "Série histórica (CSV)"}.get,
+        horizontal=True,
+        key="modelo_mc"
+    )
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        qtd_caminhos_mc = st.selectbox("Cenários:", [1000, 10000, 100000], index=1, key="qtd_caminhos_mc")
+    parametros_mc = {}
+    historico_mc = None
+    if modelo_mc == "reversao":
+        with col2:
+            parametros_mc['taxa_inicial'] = st.number_input("Selic atual (% a.a.):", min_value=0.0, step=0.25, value=10.5, key="selic_mc")
+            parametros_mc['taxa_longo_prazo'] = st.number_input("Selic de longo prazo (% a.a.):", min_value=0.0, step=0.25, value=9.0, key="selic_lp_mc")
+        with col3:
+            parametros_mc['volatilidade'] = st.number_input("Volatilidade (p.p. a.a.):", min_value=0.0, step=0.1, value=2.0, key="volatilidade_mc")
+            parametros_mc['velocidade'] = st.number_input("Velocidade de reversão (por ano):", min_value=0.0, step=0.1, value=0.5, key="velocidade_mc")
+        with col1:
+            parametros_mc['percentual'] = st.number_input("Rendimento (% da Selic):", min_value=0.0, step=5.0, value=100.0, key="percentual_mc")
+    else:
+        with col2:
+            arquivo_mc = st.file_uploader("Taxas mensais históricas (% a.m., CSV)", type=["csv"], key="historico_mc")
+        with col3:
+            parametros_mc['meses_por_bloco'] = st.number_input("Meses consecutivos por sorteio:", min_value=1, step=1, value=12, key="bloco_mc")
+        if arquivo_mc is not None:
+            historico_mc = ler_historico(arquivo_mc)
+    
+    if st.button("Simular Cenários", key="monte_carlo"):
+        try:
+            if modelo_mc == "bootstrap":
+                if historico_mc is None:
+                    raise ValueError("Envie o CSV com a série histórica de taxas mensais")
+                parametros_mc['historico'] = historico_mc
+            
+            res_mc = simular_monte_carlo(valor_invest, prazo_invest, modelo_mc, qtd_caminhos_mc, semente=0, **parametros_mc)
+            percentis_mc = res_mc['percentis']
+            
+            cols = st.columns(3)
+            cols[0].metric("Pessimista (P5)", formatar_moeda(percentis_mc[5]))
+            cols[1].metric("Mediana (P50)", formatar_moeda(percentis_mc[50]))
+            cols[2].metric("Otimista (P95)", formatar_moeda(percentis_mc[95]))
+            
+            cols = st.columns(3)
+            cols[0].metric("Valor Final Médio", formatar_moeda(res_mc['valor_final_medio']))
+            cols[1].metric("Faixa Central (P25 - P75)", f"{formatar_moeda(percentis_mc[25])} - {formatar_moeda(percentis_mc[75])}")
+            cols[2].metric("Chance de Perda", f"{res_mc['probabilidade_perda'] * 100:.1f}%")
+            
+            # Leque: faixas de percentis mês a mês
+            st.line_chart(
+                res_mc['faixas'].set_index('Mês'),
+                color=['#d62728', '#ff7f0e', '#2ca02c', '#1f77b4', '#9467bd']
+            )
+            
+        except Exception as e:
+            st.error(f"Erro na simulação de Monte Carlo: {str(e)}")
+
+with tab4:
+    st.header("Sensibilidade Price vs SAC")
+    st.caption("Todas as combinações de taxa e prazo calculadas de uma vez, em forma de mapa de calor")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        valor_sens = st.number_input("Valor a Financiar (R$):", min_value=0.0, step=1000.0, value=100000.0, key="valor_sens")
+    with col2:
+        metrica_sens = st.selectbox("Métrica:", list(METRICAS), format_func=METRICAS.get, key="metrica_sens")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        taxa_min_sens = st.number_input("Taxa mínima (% a.m.):", min_value=0.0, step=0.1, value=0.5, key="taxa_min_sens")
+        prazo_min_sens = st.number_input("Prazo mínimo (meses):", min_value=1, step=1, value=12, key="prazo_min_sens")
+    with col2:
+        taxa_max_sens = st.number_input("Taxa máxima (% a.m.):", min_value=0.0, step=0.1, value=2.5, key="taxa_max_sens")
+        prazo_max_sens = st.number_input("Prazo máximo (meses):", min_value=1, step=1, value=360, key="prazo_max_sens")
+    with col3:
+        passos_taxa_sens = st.number_input("Taxas na grade:", min_value=2, max_value=100, step=1, value=20, key="passos_taxa_sens")
+        passos_prazo_sens = st.number_input("Prazos na grade:", min_value=2, max_value=100, step=1, value=15, key="passos_prazo_sens")
+    
+    if st.button("Gerar Mapa de Calor", key="sensibilidade"):
+        try:
+            if taxa_max_sens < taxa_min_sens or prazo_max_sens < prazo_min_sens:
+                raise ValueError("Os valores máximos devem ser maiores ou iguais aos mínimos")
+            taxas = np.round(np.linspace(taxa_min_sens, taxa_max_sens, int(passos_taxa_sens)), 4)
+            prazos = np.unique(np.rint(np.linspace(prazo_min_sens, prazo_max_sens, int(passos_prazo_sens))).astype(int))
+            
+            grade = grade_sensibilidade(valor_sens, np.unique(taxas), prazos)
+            tabela = tabela_sensibilidade(grade, metrica_sens)
+            tabela.index = [f"{taxa:.2f}% a.m." for taxa in tabela.index]
+            tabela.columns = [f"{prazo} meses" for prazo in tabela.columns]
+            
+            st.subheader(METRICAS[metrica_sens])
+            st.dataframe(
+                tabela.style.apply(cores_mapa_calor, axis=None).format(formatar_moeda),
+                use_container_width=True
+            )
+            st.download_button(
+                label="Baixar grade (CSV)",
+                data=grade.to_csv(index=False).encode("utf-8"),
+                file_name="sensibilidade.csv",
+                mime="text/csv",
+                key="baixar_sensibilidade"
+            )
+        
+        except Exception as e:
+            st.error(f"Erro ao gerar análise de sensibilidade: {str(e)}")
+
+with tab5:
+    st.header("Pagar à Vista ou Financiar e Investir")
+    st.caption(
+        "O valor fica aplicado em cada produto da aba Investimentos (com o CDI e o IPCA informados lá) "
+        "e as parcelas são resgatadas mês a mês. A vantagem é o que sobra no fim do prazo, já descontado o IR."
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        valor_decisao = st.number_input("Valor do Bem (R$):", min_value=0.0, step=1000.0, value=100000.0, key="valor_decisao")
+        sistemas_decisao = st.multiselect(
+            "Sistemas:", ["price", "sac"], default=["price", "sac"], format_func=str.upper, key="sistemas_decisao"
+        )
+    with col2:
+        prazos_decisao = st.multiselect(
+            "Prazos (meses):", [12, 24, 36, 48, 60, 120, 180, 240, 360, 420], default=[12, 36, 60], key="prazos_decisao"
+        )
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        taxa_min_decisao = st.number_input("Taxa mínima (% a.m.):", min_value=0.0, step=0.1, value=0.5, key="taxa_min_decisao")
+    with col2:
+        taxa_max_decisao = st.number_input("Taxa máxima (% a.m.):", min_value=0.0, step=0.1, value=1.5, key="taxa_max_decisao")
+    with col3:
+        passos_taxa_decisao = st.number_input("Taxas na matriz:", min_value=1, max_value=20, step=1, value=5, key="passos_taxa_decisao")
+    
+    if st.button("Montar Matriz de Decisão", key="decisao"):
+        try:
+            if not sistemas_decisao or not prazos_decisao:
+                raise ValueError("Escolha ao menos um sistema e um prazo")
+            if taxa_max_decisao < taxa_min_decisao:
+                raise ValueError("A taxa máxima deve ser maior ou igual à mínima")
+            produtos = [
+                {'nome': linha['Produto'], 'tipo': linha['Tipo'], 'taxa': linha['Taxa'], 'isento_ir': bool(linha['Isento de IR'])}
+                for linha in produtos_invest.dropna(subset=['Tipo', 'Taxa']).to_dict(orient="records")
+            ]
+            taxas = np.unique(np.round(np.linspace(taxa_min_decisao, taxa_max_decisao, int(passos_taxa_decisao)), 4))
+            matriz = matriz_decisao(
+                valor_decisao, produtos, taxas, sorted(prazos_decisao), sistemas_decisao, cdi_invest, ipca_invest
+            )
+            
+            # Produtos nas linhas, opções de financiamento nas colunas
+            st.subheader("Vantagem de Financiar e Investir (R$)")
+            tabela = matriz.pivot(index='produto', columns=['sistema', 'prazo_meses', 'taxa_juros'], values='vantagem_financiar').reindex(matriz['produto'].unique())
+            tabela.columns = [f"{sistema.upper()} {prazo}m {taxa:.2f}%" for sistema, prazo, taxa in tabela.columns]
+            st.dataframe(
+                tabela.style.apply(cores_mapa_calor, axis=None).format(formatar_moeda),
+                use_container_width=True
+            )
+            
+            st.subheader("Taxa de Equilíbrio (% a.m.)")
+            st.caption("Maior taxa de juros com que financiar ainda compensa")
+            equilibrio = matriz.pivot_table(index='produto', columns=['sistema', 'prazo_meses'], values='taxa_equilibrio').reindex(matriz['produto'].unique())
+            equilibrio.columns = [f"{sistema.upper()} {prazo}m" for sistema, prazo in equilibrio.columns]
+            st.dataframe(equilibrio.style.format("{:.4f}", na_rep="—"), use_container_width=True)
+            
+            st.download_button(
+                label="Baixar matriz (CSV)",
+                data=matriz.to_csv(index=False).encode("utf-8"),
+                file_name="decisao.csv",
+                mime="text/csv",
+                key="baixar_decisao"
+            )
+        
+        except Exception as e:
+            st.error(f"Erro ao montar matriz de decisão: {str(e)}")
 
 # Rodapé
 st.divider()
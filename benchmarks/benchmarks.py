@@ -0,0 +1,278 @@
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+# Permite executar a partir da raiz do repositório ou do próprio diretório benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import financeiro
+from financeiro.fatores import tabelas_fatores
+from financeiro.indices import SeriesIndices
+
+# Benchmarks no estilo asv: cada classe define params/param_names, setup() e métodos time_*.
+# O executor (benchmarks/executar.py) percorre todas as combinações e grava os tempos em JSON.
+
+PRAZOS = [12, 60, 120, 240, 360, 420]
+MODALIDADES = ["mensal", "mensal + balão", "só balão anual", "só balão semestral"]
+DATA_BASE = datetime(2025, 1, 10)
+
+def _argumentos_cronograma(modalidade, prazo, valor_financiado=450000.0, taxa_mensal=0.79, tipo_balao="anual"):
+    taxas = financeiro.calcular_taxas(taxa_mensal)
+    qtd_baloes = financeiro.atualizar_baloes(modalidade, prazo, tipo_balao)
+    if modalidade == "mensal":
+        valor_parcela = financeiro.calcular_parcela(valor_financiado, taxas['mensal'], prazo)
+        valor_balao = 0
+    elif modalidade == "mensal + balão":
+        valor_parcela = valor_financiado / prazo / 2
+        saldo_parcelas = financeiro.calcular_valor_presente_total(valor_parcela, taxas['mensal'], prazo)
+        valor_balao = financeiro.calcular_parcela(valor_financiado - saldo_parcelas, taxas[tipo_balao], qtd_baloes)
+    else:
+        periodo = "anual" if modalidade == "só balão anual" else "semestral"
+        valor_parcela = 0
+        valor_balao = financeiro.calcular_parcela(valor_financiado, taxas[periodo], qtd_baloes)
+    return (valor_financiado, valor_parcela, valor_balao, prazo, qtd_baloes, modalidade,
+            tipo_balao, DATA_BASE, taxas, 10)
+
+def _simulacao(prazo):
+    cronograma = financeiro.gerar_cronograma(*_argumentos_cronograma("mensal + balão", prazo))
+    cronograma_entrada = financeiro.gerar_cronograma_entrada(50000.0, 3, DATA_BASE, 10)
+    dados = {
+        'valor_total': 500000.0,
+        'entrada': 50000.0,
+        'qtd_parcelas_entrada': 3,
+        'valor_financiado': 450000.0,
+        'taxa_mensal': 0.79,
+        'modalidade': "mensal + balão"
+    }
+    return cronograma, cronograma_entrada, dados
+
+class CalcularPrice:
+    params = [PRAZOS]
+    param_names = ["prazo_meses"]
+
+    def time_calcular_price(self, prazo):
+        financeiro.calcular_price(350000.0, 0.99, prazo)
+
+    def time_calcular_price_exato(self, prazo):
+        financeiro.calcular_price(350000.0, 0.99, prazo, exato=True)
+
+class CalcularSac:
+    params = [PRAZOS]
+    param_names = ["prazo_meses"]
+
+    def time_calcular_sac(self, prazo):
+        financeiro.calcular_sac(350000.0, 0.99, prazo)
+
+class Antecipacoes:
+    params = [["price", "sac"], [1, 10, 50]]
+    param_names = ["sistema", "cenarios"]
+
+    def setup(self, sistema, cenarios):
+        self.cenarios = {
+            f"Cenário {n}": [{'mes': 12 * k, 'valor': 10000.0, 'modo': ("prazo", "parcela")[(n + k) % 2]}
+                             for k in range(1, n % 20 + 2)]
+            for n in range(cenarios)
+        }
+
+    def time_calcular_antecipacoes(self, sistema, cenarios):
+        financeiro.calcular_antecipacoes(350000.0, 0.99, 360, self.cenarios["Cenário 0"], sistema)
+
+    def time_comparar_antecipacoes(self, sistema, cenarios):
+        financeiro.comparar_antecipacoes(350000.0, 0.99, 360, self.cenarios, sistema)
+
+class CorrecaoIndices:
+    params = [[100, 10000]]
+    param_names = ["contratos"]
+
+    def setup(self, contratos):
+        rng = np.random.default_rng(42)
+        variacoes = rng.uniform(0.1, 0.9, 372)
+        self.series = SeriesIndices(np.cumprod(1 + variacoes / 100)[:, None], "1995-01", ["IPCA"])
+        self.datas_base = np.datetime64("2000-01") + rng.integers(0, 240, contratos).astype('timedelta64[M]')
+        _, self.tabela = financeiro.amortizar_carteira(
+            rng.uniform(50000, 1000000, contratos), 0.8, rng.integers(12, 361, contratos), cronogramas=True
+        )
+
+    def time_corrigir_carteira(self, contratos):
+        financeiro.corrigir_carteira(self.tabela, self.series, "IPCA", self.datas_base)
+
+class AmortizarCarteira:
+    params = [["price", "sac"], [1, 100, 10000, 100000]]
+    param_names = ["sistema", "contratos"]
+
+    def setup(self, sistema, contratos):
+        rng = np.random.default_rng(42)
+        self.valores = rng.uniform(50000, 1000000, contratos)
+        self.taxas = rng.uniform(0.5, 2.0, contratos)
+        self.prazos = rng.integers(12, 421, contratos)
+
+    def time_resumo(self, sistema, contratos):
+        financeiro.amortizar_carteira(self.valores, self.taxas, self.prazos, sistema)
+
+    def time_resumo_exato(self, sistema, contratos):
+        financeiro.amortizar_carteira(self.valores, self.taxas, self.prazos, sistema, exato=True)
+
+class Resolver:
+    params = [["price", "sac"], [1, 1000, 100000]]
+    param_names = ["sistema", "alvos"]
+
+    def setup(self, sistema, alvos):
+        rng = np.random.default_rng(3)
+        self.valores = rng.uniform(50000, 1000000, alvos)
+        self.prazos = rng.integers(12, 421, alvos)
+        self.parcelas = financeiro.parcela_inicial(self.valores, rng.uniform(0.3, 2.5, alvos), self.prazos, sistema)
+
+    def time_resolver_taxa(self, sistema, alvos):
+        financeiro.resolver_taxa(self.valores, self.parcelas, self.prazos, sistema)
+
+    def time_resolver_prazo(self, sistema, alvos):
+        financeiro.resolver_prazo(self.valores, 0.99, self.parcelas, sistema)
+
+    def time_resolver_valor_financiado(self, sistema, alvos):
+        financeiro.resolver_valor_financiado(self.parcelas, 0.99, self.prazos, sistema)
+
+class GradeSensibilidade:
+    params = [[10, 50, 200]]
+    param_names = ["pontos_por_eixo"]
+
+    def setup(self, pontos):
+        self.taxas = np.linspace(0.3, 2.5, pontos)
+        self.prazos = np.linspace(12, 420, pontos).astype(int)
+
+    def time_grade_sensibilidade(self, pontos):
+        financeiro.grade_sensibilidade([100000.0, 500000.0], self.taxas, self.prazos)
+
+class MatrizDecisao:
+    params = [[1, 10], [12, 360]]
+    param_names = ["produtos", "prazo_maximo"]
+
+    def setup(self, produtos, prazo_maximo):
+        tipos = ["prefixado", "cdi", "ipca"]
+        self.produtos = [{'nome': f"Produto {n}", 'tipo': tipos[n % 3], 'taxa': [0.8, 100.0, 6.0][n % 3]} for n in range(produtos)]
+        self.prazos = np.unique(np.linspace(12, prazo_maximo, 5).astype(int))
+
+    def time_matriz_decisao(self, produtos, prazo_maximo):
+        financeiro.matriz_decisao(300000.0, self.produtos, np.linspace(0.5, 2.0, 10), self.prazos)
+
+class Xirr:
+    params = [[1, 100, 1000]]
+    param_names = ["contratos"]
+
+    def setup(self, contratos):
+        rng = np.random.default_rng(5)
+        self.datas = []
+        self.fluxos = []
+        for prazo, taxa in zip(rng.integers(12, 421, contratos), rng.uniform(0.3, 2.5, contratos)):
+            parcela = financeiro.parcela_inicial(100000.0, taxa, prazo)
+            self.datas.append(np.datetime64("2025-01-10") + np.arange(prazo + 1) * 30)
+            self.fluxos.append(np.r_[100000.0, np.full(prazo, -parcela)])
+
+    def time_xirr_lote(self, contratos):
+        financeiro.xirr_lote(self.datas, self.fluxos)
+
+class MonteCarlo:
+    params = [["reversao", "bootstrap"], [1000, 100000]]
+    param_names = ["modelo", "caminhos"]
+    timeout = 120
+
+    def setup(self, modelo, caminhos):
+        self.parametros = {}
+        if modelo == "bootstrap":
+            self.parametros['historico'] = np.random.default_rng(11).uniform(0.2, 1.2, 240)
+
+    def time_simular_monte_carlo(self, modelo, caminhos):
+        financeiro.simular_monte_carlo(100000.0, 360, modelo, caminhos, semente=0, **self.parametros)
+
+class SimularPoupanca:
+    params = [PRAZOS]
+    param_names = ["prazo_meses"]
+
+    def time_simular_poupanca(self, prazo):
+        financeiro.simular_poupanca(100000.0, prazo, 0.5)
+
+class CompararInvestimentos:
+    params = [[2, 10, 100], PRAZOS]
+    param_names = ["produtos", "prazo_meses"]
+
+    def setup(self, produtos, prazo):
+        tipos = ["prefixado", "cdi", "ipca"]
+        self.produtos = [{'nome': f"Produto {n}", 'tipo': tipos[n % 3], 'taxa': 0.5 + n % 7} for n in range(produtos)]
+
+    def time_comparar_investimentos(self, produtos, prazo):
+        financeiro.comparar_investimentos(100000.0, prazo, self.produtos, aporte_mensal=1000.0)
+
+class FatoresTaxas:
+    params = [[12, 120, 420]]
+    param_names = ["prazo_meses"]
+
+    def setup(self, prazo):
+        # Cardápio de taxas: 0,50% a 2,00% a.m., de 0,01 em 0,01
+        self.taxas = [financeiro.calcular_taxas(taxa) for taxa in np.round(np.arange(0.5, 2.001, 0.01), 2)]
+
+    def time_calcular_parcela_cardapio(self, prazo):
+        for taxas in self.taxas:
+            financeiro.calcular_parcela(450000.0, taxas['mensal'], prazo)
+
+    def time_tabelas_frias(self, prazo):
+        tabelas_fatores.limpar()
+        for taxas in self.taxas:
+            financeiro.tabela_fatores(taxas['mensal'], prazo)
+
+class GerarCronograma:
+    params = [MODALIDADES, [12, 120, 240, 420]]
+    param_names = ["modalidade", "prazo_meses"]
+
+    def setup(self, modalidade, prazo):
+        self.argumentos = _argumentos_cronograma(modalidade, prazo)
+
+    def time_gerar_cronograma(self, modalidade, prazo):
+        financeiro.gerar_cronograma(*self.argumentos)
+
+class GerarCronogramaEntrada:
+    params = [[1, 3, 12]]
+    param_names = ["qtd_parcelas_entrada"]
+
+    def time_gerar_cronograma_entrada(self, qtd_parcelas_entrada):
+        financeiro.gerar_cronograma_entrada(60000.0, qtd_parcelas_entrada, DATA_BASE, 10)
+
+class FormatarMoeda:
+    params = [[1, 420, 10000]]
+    param_names = ["valores"]
+
+    def setup(self, valores):
+        self.valores = np.random.default_rng(7).uniform(-1e6, 1e7, valores)
+        self.lista = self.valores.tolist()
+
+    def time_formatar_moeda(self, valores):
+        for valor in self.lista:
+            financeiro.formatar_moeda(valor)
+
+    def time_formatar_moedas(self, valores):
+        financeiro.formatar_moedas(self.valores)
+
+class GerarPdf:
+    params = [[12, 120, 420]]
+    param_names = ["prazo_meses"]
+
+    def setup(self, prazo):
+        self.simulacao = _simulacao(prazo)
+
+    def time_gerar_pdf(self, prazo):
+        financeiro.gerar_pdf(*self.simulacao)
+
+    def time_exportar_pdf_arquivo(self, prazo):
+        with tempfile.TemporaryDirectory() as diretorio:
+            financeiro.exportar_pdf(*self.simulacao, os.path.join(diretorio, "simulacao.pdf"))
+
+class GerarExcel:
+    params = [[12, 120, 420]]
+    param_names = ["prazo_meses"]
+
+    def setup(self, prazo):
+        self.cronograma, self.cronograma_entrada, _ = _simulacao(prazo)
+
+    def time_gerar_excel(self, prazo):
+        financeiro.gerar_excel(self.cronograma, self.cronograma_entrada)
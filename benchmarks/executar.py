@@ -0,0 +1,117 @@
+import argparse
+import inspect
+import itertools
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import timeit
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import benchmarks
+
+# Executor dos benchmarks: mede cada método time_* para todas as combinações de parâmetros,
+# grava os resultados em JSON e, opcionalmente, compara com uma execução anterior.
+
+def _casos(filtro=None):
+    for nome_classe, classe in inspect.getmembers(benchmarks, inspect.isclass):
+        if classe.__module__ != benchmarks.__name__:
+            continue
+        params = getattr(classe, "params", [[]])
+        nomes = getattr(classe, "param_names", [])
+        for nome_metodo, _ in inspect.getmembers(classe, inspect.isfunction):
+            if not nome_metodo.startswith("time_"):
+                continue
+            for combinacao in itertools.product(*params):
+                nome = f"{nome_classe}.{nome_metodo}"
+                chave = f"{nome}({', '.join(map(str, combinacao))})"
+                if filtro and not re.search(filtro, chave):
+                    continue
+                yield nome, chave, classe, nome_metodo, dict(zip(nomes, combinacao)), combinacao
+
+def medir(classe, nome_metodo, combinacao, repeticoes, tempo_minimo):
+    instancia = classe()
+    if hasattr(instancia, "setup"):
+        instancia.setup(*combinacao)
+    metodo = getattr(instancia, nome_metodo)
+    temporizador = timeit.Timer(lambda: metodo(*combinacao))
+
+    # Calibra o número de chamadas por amostra para que cada amostra dure pelo menos tempo_minimo
+    numero = 1
+    while True:
+        duracao = temporizador.timeit(numero)
+        if duracao >= tempo_minimo or numero >= 10 ** 6:
+            break
+        numero *= 10 if duracao < tempo_minimo / 10 else 2
+    amostras = [t / numero for t in temporizador.repeat(repeat=repeticoes, number=numero)]
+    return {
+        'minimo_s': min(amostras),
+        'mediana_s': statistics.median(amostras),
+        'chamadas_por_amostra': numero,
+        'amostras': len(amostras)
+    }
+
+def comparar(resultados, referencia, tolerancia):
+    anteriores = {r['chave']: r for r in referencia['resultados']}
+    regressoes = []
+    for resultado in resultados:
+        anterior = anteriores.get(resultado['chave'])
+        if anterior is None:
+            continue
+        razao = resultado['minimo_s'] / anterior['minimo_s']
+        resultado['razao_referencia'] = razao
+        if razao > 1 + tolerancia:
+            regressoes.append((resultado['chave'], razao))
+    return regressoes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos motores financeiros e exportações")
+    parser.add_argument("--saida", default="resultados_benchmark.json", help="arquivo JSON de resultados")
+    parser.add_argument("--filtro", help="expressão regular aplicada ao nome do caso, ex.: 'GerarCronograma'")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--tempo-minimo", type=float, default=0.2, help="duração mínima de cada amostra (s)")
+    parser.add_argument("--rapido", action="store_true", help="uma amostra curta por caso (verificação)")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="piora relativa aceita antes de acusar regressão")
+    args = parser.parse_args(argv)
+
+    if args.rapido:
+        args.repeticoes, args.tempo_minimo = 1, 0.01
+
+    resultados = []
+    for nome, chave, classe, nome_metodo, parametros, combinacao in _casos(args.filtro):
+        medida = medir(classe, nome_metodo, combinacao, args.repeticoes, args.tempo_minimo)
+        resultados.append({'nome': nome, 'chave': chave, 'parametros': parametros, **medida})
+        print(f"{chave:<70} {medida['minimo_s'] * 1000:12.4f} ms")
+
+    relatorio = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'resultados': resultados
+    }
+
+    regressoes = []
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            regressoes = comparar(resultados, json.load(arquivo), args.tolerancia)
+        for chave, razao in regressoes:
+            print(f"REGRESSÃO: {chave} ficou {razao:.2f}x mais lento")
+
+    with open(args.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2, default=str)
+    print(f"Resultados gravados em {args.saida}")
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
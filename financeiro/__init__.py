@@ -0,0 +1,27 @@
+# Núcleo financeiro sem dependência de interface (Streamlit), compartilhado pelos apps
+from .amortizacao import calcular_price, calcular_sac, amortizar_carteira
+from .investimentos import simular_poupanca, simular_imobiliario, comparar_investimentos
+from .formatacao import formatar_moeda, formatar_moedas, formatar_datas, formatar_data
+from .calendario import gerar_datas_vencimento, somar_meses, rolar_dia_util
+from .cronograma import (
+    calcular_taxas, calcular_valor_presente, ajustar_data_vencimento, parse_date,
+    calcular_comissoes, determinar_modo_calculo, calcular_parcela,
+    calcular_valor_presente_total, atualizar_baloes, gerar_cronograma_entrada,
+    gerar_cronograma
+)
+from .tabela import Cronograma
+from .exportacao import (
+    gerar_pdf, gerar_excel, exportar_pdf, exportar_excel, gerar_pdfs_em_lote, gerar_excel_lote,
+    impressao_digital, exportacao_pronta, obter_exportacao, preparar_exportacao
+)
+from .simulacao import simular_financiamento, dados_exportacao
+from .grafo import GrafoSimulacao
+from .solver import resolver_taxa, resolver_prazo, resolver_valor_financiado, parcela_inicial
+from .cet import xirr, xirr_lote, calcular_cet, fluxo_financiamento, fluxo_com_entrada
+from .sensibilidade import grade_sensibilidade, tabela_sensibilidade, cores_mapa_calor
+from .monte_carlo import simular_monte_carlo
+from .decisao import matriz_decisao
+from .antecipacao import calcular_antecipacoes, comparar_antecipacoes
+from .indices import carregar_indices, corrigir_tabela, corrigir_carteira, corrigir_cronograma
+from .centavos import para_centavos, para_reais, amortizar_centavos
+from .fatores import tabela_fatores, fatores_desconto, fator_anuidade
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+from .centavos import amortizar_centavos, arredondar_centavos, para_centavos, para_reais
+
+# --- Funções de Cálculo Financeiro ---
+# Núcleo vetorizado: aceita escalares ou arrays (um elemento por contrato/linha)
+def _parcela_price(valor_financiado, i, prazo_meses):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fator = np.power(1 + i, prazo_meses)
+        return np.where(i > 0, valor_financiado * (i * fator) / (fator - 1), valor_financiado / prazo_meses)
+
+# Colunas da tabela a partir do saldo antes de cada pagamento, em forma fechada:
+# Price: B(k) = P(1+i)^k - PMT((1+i)^k - 1)/i  |  SAC: B(k) = P - k * P/n
+def _colunas_amortizacao(sistema, valor_financiado, i, prazo_meses, periodos_anteriores):
+    if sistema == "price":
+        parcela = _parcela_price(valor_financiado, i, prazo_meses)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fator = np.power(1 + i, periodos_anteriores)
+            saldo_anterior = np.where(
+                i > 0,
+                valor_financiado * fator - parcela * (fator - 1) / i,
+                valor_financiado - parcela * periodos_anteriores
+            )
+        juros = saldo_anterior * i
+        prestacao = np.broadcast_to(parcela, juros.shape)
+        amortizacao = prestacao - juros
+    else:
+        amortizacao = np.broadcast_to(valor_financiado / prazo_meses, np.shape(periodos_anteriores))
+        saldo_anterior = valor_financiado - amortizacao * periodos_anteriores
+        juros = saldo_anterior * i
+        prestacao = amortizacao + juros
+    
+    saldo_devedor = saldo_anterior - amortizacao
+    saldo_devedor[saldo_devedor < 0.01] = 0
+    return prestacao, juros, amortizacao, saldo_devedor
+
+# Mesmas colunas em centavos exatos (int64, ver centavos.py). Price: parcela arredondada e juros
+# arredondados sobre o saldo em centavos; SAC: amortização arredondada e juros sobre o saldo.
+# O resíduo de arredondamento vai para a última parcela de cada contrato, que zera o saldo.
+def _colunas_centavos(sistema, valor_financiado, i, prazo_meses, periodos_anteriores):
+    valor_financiado, i, prazo_meses, periodos_anteriores = np.broadcast_arrays(
+        valor_financiado, i, prazo_meses, periodos_anteriores
+    )
+    inicio = periodos_anteriores == 0
+    ultima = periodos_anteriores == prazo_meses - 1
+    saldo_inicial = para_centavos(valor_financiado)
+    
+    if sistema == "price":
+        prestacao = para_centavos(_parcela_price(valor_financiado[inicio], i[inicio], prazo_meses[inicio]))
+        prestacao = prestacao[np.cumsum(inicio) - 1]
+        juros, amortizacao, saldo_devedor = amortizar_centavos(saldo_inicial[inicio], i, prestacao, inicio)
+        amortizacao = np.where(ultima, amortizacao + saldo_devedor, amortizacao)
+        prestacao = np.where(ultima, juros + amortizacao, prestacao)
+        saldo_devedor = np.where(ultima, 0, saldo_devedor)
+    else:
+        cota = arredondar_centavos(saldo_inicial / prazo_meses)
+        saldo_anterior = saldo_inicial - cota * periodos_anteriores
+        amortizacao = np.where(ultima, saldo_anterior, cota)
+        juros = arredondar_centavos(saldo_anterior * i)
+        prestacao = amortizacao + juros
+        saldo_devedor = saldo_anterior - amortizacao
+    return prestacao, juros, amortizacao, saldo_devedor
+
+# Monta a tabela de amortização diretamente a partir das colunas (sem dicts por linha)
+def _tabela_amortizacao(periodos, prestacao, juros, amortizacao, saldo_devedor):
+    return pd.DataFrame({
+        'Período': periodos,
+        'Prestação': np.round(prestacao, 2),
+        'Juros': np.round(juros, 2),
+        'Amortização': np.round(amortizacao, 2),
+        'Saldo Devedor': np.round(saldo_devedor, 2)
+    })
+
+# exato=True: colunas e totais em centavos exatos (arredondamento ABNT, resíduo na última parcela)
+def calcular_price(valor_financiado, taxa_juros, prazo_meses, exato=False):
+    i = taxa_juros / 100
+    prazo_meses = int(prazo_meses)
+    periodos_anteriores = np.arange(prazo_meses)
+    
+    if exato:
+        centavos = _colunas_centavos("price", valor_financiado, i, prazo_meses, periodos_anteriores)
+        parcela = float(para_reais(centavos[0][0]))
+        total_pago = float(para_reais(centavos[0].sum()))
+        total_juros = float(para_reais(centavos[1].sum()))
+        colunas = [para_reais(coluna) for coluna in centavos]
+    else:
+        parcela = float(_parcela_price(valor_financiado, i, prazo_meses))
+        total_pago = parcela * prazo_meses
+        total_juros = total_pago - valor_financiado
+        colunas = _colunas_amortizacao("price", valor_financiado, i, prazo_meses, periodos_anteriores)
+    
+    return {
+        'valor_financiado': round(valor_financiado, 2),
+        'taxa_juros': round(taxa_juros, 2),
+        'prazo_meses': prazo_meses,
+        'valor_parcela': round(parcela, 2),
+        'total_pago': round(total_pago, 2),
+        'total_juros': round(total_juros, 2),
+        'parcelas': _tabela_amortizacao(periodos_anteriores + 1, *colunas)
+    }
+
+def calcular_sac(valor_financiado, taxa_juros, prazo_meses, exato=False):
+    i = taxa_juros / 100
+    prazo_meses = int(prazo_meses)
+    periodos_anteriores = np.arange(prazo_meses)
+    
+    if exato:
+        centavos = _colunas_centavos("sac", valor_financiado, i, prazo_meses, periodos_anteriores)
+        total_pago = float(para_reais(centavos[0].sum()))
+        total_juros = float(para_reais(centavos[1].sum()))
+        prestacao, juros, amortizacao, saldo_devedor = (para_reais(coluna) for coluna in centavos)
+    else:
+        prestacao, juros, amortizacao, saldo_devedor = _colunas_amortizacao("sac", valor_financiado, i, prazo_meses, periodos_anteriores)
+        total_juros = float(juros.sum())
+        total_pago = valor_financiado + total_juros
+    
+    return {
+        'valor_financiado': round(valor_financiado, 2),
+        'taxa_juros': round(taxa_juros, 2),
+        'prazo_meses': prazo_meses,
+        'valor_primeira_parc': round(float(prestacao[0]), 2),
+        'valor_ultima_parc': round(float(prestacao[-1]), 2),
+        'total_pago': round(total_pago, 2),
+        'total_juros': round(total_juros, 2),
+        'parcelas': _tabela_amortizacao(periodos_anteriores + 1, prestacao, juros, amortizacao, saldo_devedor)
+    }
+
+# --- Processamento em Lote (carteira de contratos) ---
+# Resumos em forma fechada, um elemento por contrato
+def _resumo_carteira(sistema, valor_financiado, i, prazo_meses):
+    if sistema == "price":
+        parcela = _parcela_price(valor_financiado, i, prazo_meses)
+        total_pago = parcela * prazo_meses
+        return {
+            'valor_parcela': np.round(parcela, 2),
+            'total_pago': np.round(total_pago, 2),
+            'total_juros': np.round(total_pago - valor_financiado, 2)
+        }
+    
+    amortizacao = valor_financiado / prazo_meses
+    # Soma dos juros SAC: i * A * (n + (n-1) + ... + 1) = i * P * (n + 1) / 2
+    total_juros = i * valor_financiado * (prazo_meses + 1) / 2
+    return {
+        'valor_primeira_parc': np.round(amortizacao + valor_financiado * i, 2),
+        'valor_ultima_parc': np.round(amortizacao * (1 + i), 2),
+        'total_pago': np.round(valor_financiado + total_juros, 2),
+        'total_juros': np.round(total_juros, 2)
+    }
+
+# Resumos a partir das colunas em centavos (formato longo), somando cada contrato com reduceat
+def _resumo_centavos(sistema, prestacao, juros, inicio, prazos_meses):
+    totais = {
+        'total_pago': np.round(para_reais(np.add.reduceat(prestacao, inicio)), 2),
+        'total_juros': np.round(para_reais(np.add.reduceat(juros, inicio)), 2)
+    }
+    if sistema == "price":
+        return {'valor_parcela': para_reais(prestacao[inicio]), **totais}
+    return {
+        'valor_primeira_parc': para_reais(prestacao[inicio]),
+        'valor_ultima_parc': para_reais(prestacao[inicio + prazos_meses - 1]),
+        **totais
+    }
+
+# Amortiza N contratos de uma vez. Prazos podem variar entre contratos (cronogramas irregulares).
+# Retorna o resumo por contrato e, se cronogramas=True, também a tabela completa em formato longo.
+def amortizar_carteira(valores_financiados, taxas_juros, prazos_meses, sistema="price", cronogramas=False, exato=False):
+    sistema = sistema.lower()
+    if sistema not in ("price", "sac"):
+        raise ValueError(f"Sistema de amortização desconhecido: {sistema}")
+    
+    valores_financiados, taxas_juros, prazos_meses = np.broadcast_arrays(
+        np.asarray(valores_financiados, dtype=float).ravel(),
+        np.asarray(taxas_juros, dtype=float).ravel(),
+        np.asarray(prazos_meses, dtype=np.int64).ravel()
+    )
+    if np.any(prazos_meses < 1):
+        raise ValueError("Todos os prazos devem ser de pelo menos 1 mês")
+    
+    i = taxas_juros / 100
+    resumo = pd.DataFrame({
+        'valor_financiado': np.round(valores_financiados, 2),
+        'taxa_juros': np.round(taxas_juros, 2),
+        'prazo_meses': prazos_meses
+    })
+    if not cronogramas and not exato:
+        return resumo.assign(**_resumo_carteira(sistema, valores_financiados, i, prazos_meses))
+    
+    # Formato longo: cada contrato ocupa prazo_meses linhas consecutivas
+    contrato = np.repeat(np.arange(len(prazos_meses)), prazos_meses)
+    inicio = np.cumsum(prazos_meses) - prazos_meses
+    periodos_anteriores = np.arange(len(contrato)) - inicio[contrato]
+    
+    argumentos = (sistema, valores_financiados[contrato], i[contrato], prazos_meses[contrato], periodos_anteriores)
+    if exato:
+        centavos = _colunas_centavos(*argumentos)
+        resumo = resumo.assign(**_resumo_centavos(sistema, centavos[0], centavos[1], inicio, prazos_meses))
+        colunas = [para_reais(coluna) for coluna in centavos]
+    else:
+        resumo = resumo.assign(**_resumo_carteira(sistema, valores_financiados, i, prazos_meses))
+        colunas = _colunas_amortizacao(*argumentos)
+    if not cronogramas:
+        return resumo
+    
+    tabela = _tabela_amortizacao(periodos_anteriores + 1, *colunas)
+    tabela.insert(0, 'Contrato', contrato)
+    return resumo, tabela
@@ -0,0 +1,186 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from .amortizacao import _parcela_price
+from .solver import _sistema
+
+# Amortizações extraordinárias (antecipações) em financiamentos Price e SAC. Cada antecipação é
+# paga junto com a parcela do mês indicado e escolhe o que reduzir:
+#   "prazo":   mantém a parcela (Price) ou a amortização mensal (SAC) e encurta o prazo
+#   "parcela": mantém o prazo e recalcula a parcela (Price) ou a amortização mensal (SAC)
+#
+# O cronograma é uma sequência de trechos entre antecipações, cada um definido pelo saldo no início,
+# pela quantidade de meses e pela parcela/amortização. Uma antecipação só recalcula o trecho seguinte,
+# e saldos e juros de cada trecho saem em forma fechada, sem laço mês a mês:
+#   Price: B(k) = S(1+i)^k - PMT((1+i)^k - 1)/i  |  SAC: B(k) = S - k * A
+# Por isso comparar dezenas de cenários (comparar_antecipacoes) custa O(antecipações) por cenário.
+#
+#   calcular_antecipacoes(300000, 0.9, 360, [
+#       {'mes': 12, 'valor': 20000, 'modo': "prazo"},
+#       {'mes': 24, 'valor': 20000, 'modo': "parcela"}
+#   ])
+
+MODOS_ANTECIPACAO = ("prazo", "parcela")
+
+# Antecipações validadas como (mês, valor, modo), em ordem de mês (estável para o mesmo mês)
+def _ler_antecipacoes(antecipacoes, prazo_meses):
+    eventos = []
+    for antecipacao in antecipacoes:
+        mes = int(antecipacao['mes'])
+        valor = float(antecipacao['valor'])
+        modo = antecipacao.get('modo', "prazo")
+        if modo not in MODOS_ANTECIPACAO:
+            raise ValueError(f"Modo de antecipação desconhecido: {modo}")
+        if not 1 <= mes <= prazo_meses:
+            raise ValueError(f"O mês da antecipação deve estar entre 1 e {prazo_meses}")
+        if valor < 0:
+            raise ValueError("O valor da antecipação não pode ser negativo")
+        eventos.append((mes, valor, modo))
+    return sorted(eventos, key=lambda evento: evento[0])
+
+# Parcela (Price) ou amortização mensal (SAC) que quita o saldo em "meses" meses
+def _parametro(sistema, saldo, i, meses):
+    if sistema == "price":
+        return float(_parcela_price(saldo, i, meses))
+    return saldo / meses
+
+# Saldo depois de "meses" pagamentos de um trecho
+def _saldo_apos(sistema, saldo, i, parametro, meses):
+    if sistema == "sac":
+        return saldo - parametro * meses
+    if i == 0:
+        return saldo - parametro * meses
+    fator = (1 + i) ** meses
+    return saldo * fator - parametro * (fator - 1) / i
+
+# Meses para quitar o saldo mantendo a parcela (Price) ou a amortização (SAC); o último pagamento
+# fica menor. A tolerância evita um mês a mais por erro de arredondamento.
+def _meses_restantes(sistema, saldo, i, parametro):
+    if sistema == "sac" or i == 0:
+        return math.ceil(saldo / parametro - 1e-9)
+    return math.ceil(-math.log1p(-saldo * i / parametro) / math.log1p(i) - 1e-9)
+
+# Juros pagos num trecho, em forma fechada: soma de i * B(k) para k = 0..meses-1
+def _juros_trecho(sistema, saldo, i, parametro, meses):
+    if sistema == "sac":
+        return i * (meses * saldo - parametro * meses * (meses - 1) / 2)
+    if i == 0:
+        return 0.0
+    crescimento = (1 + i) ** meses - 1
+    return saldo * crescimento - parametro * (crescimento / i - meses)
+
+# Trechos do cronograma (mês inicial, saldo inicial, meses, parcela/amortização, se é o trecho que
+# termina de pagar o saldo), o mês em que o saldo zera e o valor efetivamente antecipado em cada
+# evento (limitado ao saldo; zero depois da quitação)
+def _trechos(sistema, valor_financiado, i, prazo_meses, eventos):
+    trechos = []
+    aplicados = []
+    inicio, saldo, fim = 0, float(valor_financiado), prazo_meses
+    parametro = _parametro(sistema, saldo, i, prazo_meses)
+    for mes, valor, modo in eventos:
+        if mes >= fim:
+            aplicados.append(0.0)
+            continue
+        if mes > inicio:
+            trechos.append((inicio, saldo, mes - inicio, parametro, False))
+            saldo = _saldo_apos(sistema, saldo, i, parametro, mes - inicio)
+            inicio = mes
+        aplicado = min(valor, saldo)
+        aplicados.append(aplicado)
+        saldo -= aplicado
+        if saldo < 0.005:
+            saldo, fim = 0.0, mes
+        elif modo == "parcela":
+            parametro = _parametro(sistema, saldo, i, fim - mes)
+        else:
+            fim = mes + _meses_restantes(sistema, saldo, i, parametro)
+    if fim > inicio:
+        trechos.append((inicio, saldo, fim - inicio, parametro, True))
+    return trechos, fim, aplicados
+
+# Colunas de um trecho; no trecho final, o último pagamento quita exatamente o saldo
+def _colunas_trecho(sistema, saldo, i, meses, parametro, final):
+    k = np.arange(meses)
+    if sistema == "price":
+        fator = np.power(1 + i, k)
+        saldo_anterior = saldo * fator - parametro * (fator - 1) / i if i > 0 else saldo - parametro * k
+        juros = saldo_anterior * i
+        amortizacao = parametro - juros
+    else:
+        saldo_anterior = saldo - parametro * k
+        juros = saldo_anterior * i
+        amortizacao = np.full(meses, float(parametro))
+    if final:
+        amortizacao[-1] = saldo_anterior[-1]
+    return juros + amortizacao, juros, amortizacao, saldo_anterior - amortizacao
+
+# Totais de um cenário só pelos trechos, sem montar a tabela
+def _resumo_antecipacoes(sistema, valor_financiado, i, prazo_meses, eventos):
+    trechos, fim, aplicados = _trechos(sistema, valor_financiado, i, prazo_meses, eventos)
+    total_juros = sum(_juros_trecho(sistema, saldo, i, parametro, meses) for _, saldo, meses, parametro, _ in trechos)
+    # Parcela depois da última antecipação (Price) ou primeira parcela do último trecho (SAC);
+    # zero se uma antecipação quitou o saldo
+    _, saldo, _, parametro, final = trechos[-1]
+    parcela_final = (parametro if sistema == "price" else parametro + saldo * i) if final else 0.0
+    return {
+        'prazo_final': fim,
+        'meses_economizados': prazo_meses - fim,
+        'parcela_final': round(parcela_final, 2),
+        'total_antecipado': round(sum(aplicados), 2),
+        'total_juros': round(total_juros, 2),
+        'total_pago': round(valor_financiado + total_juros, 2)
+    }, trechos, aplicados
+
+def calcular_antecipacoes(valor_financiado, taxa_juros, prazo_meses, antecipacoes, sistema="price"):
+    sistema = _sistema(sistema)
+    i = taxa_juros / 100
+    prazo_meses = int(prazo_meses)
+    eventos = _ler_antecipacoes(antecipacoes, prazo_meses)
+    resumo, trechos, aplicados = _resumo_antecipacoes(sistema, valor_financiado, i, prazo_meses, eventos)
+    sem_antecipacao, _, _ = _resumo_antecipacoes(sistema, valor_financiado, i, prazo_meses, [])
+    
+    colunas = [_colunas_trecho(sistema, saldo, i, meses, parametro, final) for _, saldo, meses, parametro, final in trechos]
+    prestacao, juros, amortizacao, saldo_devedor = (np.concatenate(coluna) for coluna in zip(*colunas))
+    
+    # Antecipações somadas por mês e descontadas do saldo depois da parcela do mês
+    extra = np.zeros(len(prestacao))
+    meses_eventos = np.array([mes for mes, _, _ in eventos], dtype=np.int64)
+    aplicados = np.array(aplicados)
+    validos = aplicados > 0
+    np.add.at(extra, meses_eventos[validos] - 1, aplicados[validos])
+    saldo_devedor = saldo_devedor - extra
+    saldo_devedor[saldo_devedor < 0.01] = 0
+    
+    return {
+        'valor_financiado': round(valor_financiado, 2),
+        'taxa_juros': round(taxa_juros, 2),
+        'prazo_meses': prazo_meses,
+        'sistema': sistema,
+        **resumo,
+        'economia_juros': round(sem_antecipacao['total_juros'] - resumo['total_juros'], 2),
+        'parcelas': pd.DataFrame({
+            'Período': np.arange(1, len(prestacao) + 1),
+            'Prestação': np.round(prestacao, 2),
+            'Juros': np.round(juros, 2),
+            'Amortização': np.round(amortizacao, 2),
+            'Amortização Extra': np.round(extra, 2),
+            'Saldo Devedor': np.round(saldo_devedor, 2)
+        })
+    }
+
+# Resumo de vários cenários de antecipação do mesmo contrato ({nome: lista de antecipações}),
+# sem montar as tabelas: uma linha por cenário, mais a linha "Sem antecipação" de referência
+def comparar_antecipacoes(valor_financiado, taxa_juros, prazo_meses, cenarios, sistema="price"):
+    sistema = _sistema(sistema)
+    i = taxa_juros / 100
+    prazo_meses = int(prazo_meses)
+    linhas = {}
+    for nome, antecipacoes in {"Sem antecipação": [], **cenarios}.items():
+        eventos = _ler_antecipacoes(antecipacoes, prazo_meses)
+        linhas[nome] = _resumo_antecipacoes(sistema, valor_financiado, i, prazo_meses, eventos)[0]
+    
+    resumo = pd.DataFrame.from_dict(linhas, orient="index").rename_axis('cenario').reset_index()
+    resumo['economia_juros'] = np.round(resumo['total_juros'].iloc[0] - resumo['total_juros'], 2) + 0.0
+    return resumo
@@ -0,0 +1,153 @@
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from .tabela import Cronograma
+
+# Cache LRU com expiração (TTL) e limite de memória, compartilhado por todo o processo.
+# Os resultados guardados são os mesmos objetos entregues a todas as sessões:
+# quem os recebe deve tratá-los como somente leitura.
+
+# Estimativa do espaço ocupado por um resultado (DataFrames, cronogramas, arrays, documentos e estruturas aninhadas)
+def estimar_tamanho(valor):
+    if isinstance(valor, Cronograma):
+        return valor.nbytes + estimar_tamanho(valor.totais)
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, (np.ndarray, memoryview)):
+        return int(valor.nbytes)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(estimar_tamanho(k) + estimar_tamanho(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(estimar_tamanho(v) for v in valor)
+    return sys.getsizeof(valor)
+
+# Normaliza os argumentos para que entradas equivalentes gerem a mesma chave
+def normalizar(valor):
+    if isinstance(valor, (bool, type(None))):
+        return valor
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float):
+        return round(valor, 8)
+    if isinstance(valor, (int, str)):
+        return valor
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, date):
+        return datetime.combine(valor, datetime.min.time()).isoformat()
+    if isinstance(valor, dict):
+        return tuple(sorted((str(k), normalizar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        return tuple(normalizar(v) for v in valor)
+    return repr(valor)
+
+class CacheSimulacao:
+    def __init__(self, max_itens=256, ttl=3600, max_bytes=64 * 1024 * 1024):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._itens = OrderedDict()  # chave -> (expira_em, tamanho, valor)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def configurar(self, max_itens=None, ttl=None, max_bytes=None):
+        with self._lock:
+            if max_itens is not None:
+                self.max_itens = max_itens
+            if ttl is not None:
+                self.ttl = ttl
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._aplicar_limites()
+
+    def obter(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[0] < time.monotonic():
+                self._remover(chave)
+                item = None
+            if item is None:
+                self.falhas += 1
+                return False, None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return True, item[2]
+
+    def guardar(self, chave, valor):
+        tamanho = estimar_tamanho(valor)
+        with self._lock:
+            if chave in self._itens:
+                self._remover(chave)
+            if tamanho > self.max_bytes:
+                return
+            self._itens[chave] = (time.monotonic() + self.ttl, tamanho, valor)
+            self._bytes += tamanho
+            self._aplicar_limites()
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                'itens': len(self._itens),
+                'bytes': self._bytes,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'remocoes': self.remocoes,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0
+            }
+
+    def _remover(self, chave):
+        _, tamanho, _ = self._itens.pop(chave)
+        self._bytes -= tamanho
+
+    # Descarta os itens menos usados recentemente até respeitar os limites
+    def _aplicar_limites(self):
+        while self._itens and (len(self._itens) > self.max_itens or self._bytes > self.max_bytes):
+            self._remover(next(iter(self._itens)))
+            self.remocoes += 1
+
+# Cache padrão do processo; limites configuráveis por variáveis de ambiente
+cache_simulacoes = CacheSimulacao(
+    max_itens=int(os.environ.get("FINANCEIRO_CACHE_ITENS", 256)),
+    ttl=float(os.environ.get("FINANCEIRO_CACHE_TTL", 3600)),
+    max_bytes=int(float(os.environ.get("FINANCEIRO_CACHE_MB", 64)) * 1024 * 1024)
+)
+
+# Decorador: memoriza a função no cache indicado, com chave pelos argumentos normalizados
+def memoizar(funcao, cache=None):
+    if cache is None:
+        cache = cache_simulacoes
+    assinatura = inspect.signature(funcao)
+    nome = f"{funcao.__module__}.{funcao.__qualname__}"
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        argumentos = assinatura.bind(*args, **kwargs)
+        argumentos.apply_defaults()
+        chave = (nome, normalizar(tuple(argumentos.arguments.values())))
+        encontrado, valor = cache.obter(chave)
+        if encontrado:
+            return valor
+        valor = funcao(*args, **kwargs)
+        cache.guardar(chave, valor)
+        return valor
+
+    envoltorio.cache = cache
+    return envoltorio
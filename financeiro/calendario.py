@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import numpy as np
+
+# Datas de vencimento geradas em bloco como arrays datetime64[D]: aritmética real de meses,
+# dia limitado ao último dia do mês e, opcionalmente, rolagem para o próximo dia útil.
+# A conversão para texto (dd/mm/aaaa) fica para a hora de exibir/exportar.
+
+PERIODOS_EM_MESES = {"mensal": 1, "trimestral": 3, "semestral": 6, "anual": 12}
+
+def para_datetime64(datas):
+    if isinstance(datas, datetime):
+        datas = datas.date()
+    return np.asarray(datas, dtype='datetime64[D]')
+
+# Dia do mês (1-31) de cada data
+def dia_do_mes(datas):
+    datas = para_datetime64(datas)
+    return (datas - datas.astype('datetime64[M]')).astype(np.int64) + 1
+
+# Soma meses a cada data mantendo o dia de vencimento (ou o dia da própria data),
+# limitado ao último dia do mês de destino
+def somar_meses(datas, meses, dia_vencimento=None):
+    datas = para_datetime64(datas)
+    mes_destino = datas.astype('datetime64[M]') + np.asarray(meses, dtype='timedelta64[M]')
+    inicio_mes = mes_destino.astype('datetime64[D]')
+    ultimo_dia = ((mes_destino + 1).astype('datetime64[D]') - inicio_mes).astype(np.int64)
+    dia = dia_do_mes(datas) if dia_vencimento is None else np.asarray(dia_vencimento, dtype=np.int64)
+    return inicio_mes + (np.minimum(dia, ultimo_dia) - 1).astype('timedelta64[D]')
+
+# Rola datas que caem em fim de semana ou feriado para o próximo dia útil
+def rolar_dia_util(datas, feriados=None):
+    feriados = para_datetime64(feriados) if feriados is not None else []
+    return np.busday_offset(para_datetime64(datas), 0, roll='forward', holidays=feriados)
+
+# Série de vencimentos: períodos inicio, inicio+1, ..., cada um com intervalo_meses meses
+def gerar_datas_vencimento(data_inicial, quantidade, intervalo_meses=1, dia_vencimento=None,
+                           inicio=1, dias_uteis=False, feriados=None):
+    if dia_vencimento is None:
+        dia_vencimento = int(dia_do_mes(data_inicial))
+    periodos = np.arange(inicio, inicio + quantidade)
+    datas = somar_meses(data_inicial, periodos * intervalo_meses, dia_vencimento)
+    if dias_uteis:
+        datas = rolar_dia_util(datas, feriados)
+    return datas
+
+# Conversão pontual de volta para datetime (compatibilidade com código que espera datetime)
+def para_datetime(data):
+    return datetime.combine(para_datetime64(data).item(), datetime.min.time())
@@ -0,0 +1,52 @@
+import numpy as np
+
+# Modo exato em centavos: valores monetários como int64 (centavos), arredondados pela regra da ABNT
+# (NBR 5891: o meio centavo exato vai para o par), sem laços de Decimal. Os juros de cada período são
+# arredondados sobre o saldo já em centavos e o resíduo de arredondamento vai para a última parcela,
+# então prestação = juros + amortização em toda linha, a soma das amortizações é o valor financiado
+# e o saldo termina exatamente em zero.
+
+# Arredonda centavos em ponto flutuante para int64. O arredondamento prévio em 6 casas descarta o
+# ruído binário (2.675 * 100 = 267.49999999999997) para que o meio centavo exato vá para o par.
+def arredondar_centavos(centavos):
+    return np.rint(np.round(centavos, 6)).astype(np.int64)
+
+def para_centavos(valores):
+    return arredondar_centavos(np.asarray(valores, dtype=float) * 100)
+
+def para_reais(centavos):
+    return np.asarray(centavos) / 100
+
+# Amortiza saldos em centavos por pagamentos dados (uma linha por período, contratos consecutivos;
+# inicio = True na primeira linha de cada contrato). juros(k) = arredondar(saldo(k-1) * i(k)) depende
+# do saldo já arredondado, então a recorrência é sequencial no tempo: as linhas são dispostas numa
+# matriz período x contrato e cada período é calculado para todos os contratos de uma vez
+# (no máximo "maior prazo" passos sobre vetores). Retorna juros, amortização e saldo após cada
+# pagamento, em int64 e na ordem das linhas.
+def amortizar_centavos(saldo_inicial, taxas, pagamentos, inicio=None):
+    pagamentos = np.asarray(pagamentos, dtype=np.int64)
+    taxas = np.broadcast_to(np.asarray(taxas, dtype=float), pagamentos.shape)
+    if inicio is None:
+        inicio = np.zeros(len(pagamentos), dtype=bool)
+        inicio[:1] = True
+    primeiras = np.flatnonzero(inicio)
+    contrato = np.cumsum(inicio) - 1
+    periodo = np.arange(len(pagamentos)) - primeiras[contrato]
+
+    largura = int(periodo.max()) + 1 if len(periodo) else 0
+    matriz_taxas = np.zeros((largura, len(primeiras)))
+    matriz_taxas[periodo, contrato] = taxas
+    matriz_pagamentos = np.zeros((largura, len(primeiras)), dtype=np.int64)
+    matriz_pagamentos[periodo, contrato] = pagamentos
+    juros = np.zeros_like(matriz_pagamentos)
+    saldos = np.zeros_like(matriz_pagamentos)
+
+    # Posições além do prazo de um contrato têm taxa e pagamento zero e não alteram seu saldo
+    saldo = np.broadcast_to(np.asarray(saldo_inicial, dtype=np.int64), (len(primeiras),)).copy()
+    for k in range(largura):
+        juros[k] = arredondar_centavos(saldo * matriz_taxas[k])
+        saldo += juros[k] - matriz_pagamentos[k]
+        saldos[k] = saldo
+
+    juros = juros[periodo, contrato]
+    return juros, pagamentos - juros, saldos[periodo, contrato]
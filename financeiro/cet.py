@@ -0,0 +1,125 @@
+import numpy as np
+
+from .calendario import para_datetime64
+
+# XIRR e CET (Custo Efetivo Total) sobre fluxos com datas irregulares.
+# O VPL de todos os fluxos é avaliado de uma vez (matriz fluxo x prazo) e a raiz é encontrada por
+# Newton com salvaguarda de bisseção; um chute inicial próximo (a taxa do contrato, ou a solução
+# anterior) faz a convergência acontecer em poucas iterações. Base de 365 dias corridos, como no CET.
+#
+# Em lote, os fluxos de tamanhos diferentes são completados com zeros, que não alteram o VPL.
+
+DIAS_ANO = 365
+TAXA_MINIMA = -0.99
+
+# VPL e sua derivada para cada linha: soma de c * (1 + r)^-t
+def _vpl(taxas, tempos, fluxos):
+    log_base = np.log1p(taxas)[:, None]
+    descontos = np.exp(-tempos * log_base)
+    vpl = (fluxos * descontos).sum(axis=1)
+    derivada = -(tempos * fluxos * descontos).sum(axis=1) / (1 + taxas)
+    return vpl, derivada
+
+# Newton vetorizado com intervalo de segurança. Linhas sem troca de sinal no intervalo: NaN.
+def _xirr_matriz(tempos, fluxos, chute, tolerancia=1e-10, max_iteracoes=100):
+    linhas = len(fluxos)
+    baixo = np.full(linhas, TAXA_MINIMA)
+    alto = np.ones(linhas)
+    f_baixo, _ = _vpl(baixo, tempos, fluxos)
+    f_alto, _ = _vpl(alto, tempos, fluxos)
+    # Amplia o limite superior até encontrar a troca de sinal (taxas de até ~1e6 a.a.)
+    for _ in range(20):
+        sem_troca = np.sign(f_baixo) == np.sign(f_alto)
+        if not sem_troca.any():
+            break
+        alto = np.where(sem_troca, alto * 2 + 1, alto)
+        f_alto = np.where(sem_troca, _vpl(alto, tempos, fluxos)[0], f_alto)
+    valido = np.sign(f_baixo) != np.sign(f_alto)
+    crescente = f_alto > f_baixo
+
+    taxa = np.clip(np.broadcast_to(np.asarray(chute, dtype=float), (linhas,)), baixo, alto)
+    for _ in range(max_iteracoes):
+        f, df = _vpl(taxa, tempos, fluxos)
+        # Mantém a raiz entre baixo e alto conforme o sinal do VPL
+        acima = (f > 0) == crescente
+        alto = np.where(acima & (f != 0), taxa, alto)
+        baixo = np.where(~acima & (f != 0), taxa, baixo)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            nova = taxa - f / df
+        fora = ~np.isfinite(nova) | (nova < baixo) | (nova > alto)
+        nova = np.where(fora, (baixo + alto) / 2, nova)
+        nova = np.where(f == 0, taxa, nova)
+        convergiu = np.abs(nova - taxa) <= tolerancia * np.maximum(1.0, np.abs(taxa))
+        taxa = nova
+        if convergiu[valido].all():
+            break
+    return np.where(valido, taxa, np.nan)
+
+def _tempos(datas, data_base=None):
+    datas = para_datetime64(datas)
+    base = datas.min() if data_base is None else para_datetime64(data_base)
+    return (datas - base).astype(np.int64) / DIAS_ANO
+
+# Taxa anual efetiva (fração) que zera o VPL dos fluxos nas datas indicadas
+def xirr(datas, fluxos, chute=0.1):
+    tempos = _tempos(datas)
+    fluxos = np.asarray(fluxos, dtype=float)
+    return float(_xirr_matriz(tempos[None, :], fluxos[None, :], chute)[0])
+
+# XIRR de vários fluxos (listas de datas e de valores, uma por contrato) de uma vez.
+# chutes: escalar ou um por contrato (por exemplo, as soluções de uma execução anterior).
+def xirr_lote(lista_datas, lista_fluxos, chutes=0.1):
+    tamanhos = np.array([len(f) for f in lista_fluxos])
+    largura = tamanhos.max() if len(tamanhos) else 0
+    tempos = np.zeros((len(tamanhos), largura))
+    fluxos = np.zeros((len(tamanhos), largura))
+    for linha, (datas, valores) in enumerate(zip(lista_datas, lista_fluxos)):
+        tempos[linha, :len(valores)] = _tempos(datas)
+        fluxos[linha, :len(valores)] = valores
+    return _xirr_matriz(tempos, fluxos, chutes)
+
+def taxa_mensal_equivalente(taxa_anual):
+    return (1 + taxa_anual) ** (1 / 12) - 1
+
+# Fluxo do tomador: recebe o valor financiado (menos custos iniciais) na liberação e paga cada
+# parcela/balão do cronograma no vencimento. A liberação é a data base do cronograma
+# (data_primeira_parcela), a partir da qual gerar_cronograma conta os dias de cada pagamento.
+def fluxo_financiamento(cronograma, valor_financiado, data_liberacao, custos_iniciais=0.0):
+    pagos = cronograma['Valor'] != 0
+    datas = np.concatenate([para_datetime64([data_liberacao]), cronograma['Data_Vencimento'][pagos]])
+    fluxos = np.concatenate([[valor_financiado - custos_iniciais], -cronograma['Valor'][pagos]])
+    return datas, fluxos
+
+# Fluxo completo do comprador: recebe o imóvel (valor total, menos custos iniciais) na data da
+# entrada, paga a entrada (à vista nessa data ou nas datas do cronograma de entrada parcelada) e
+# depois cada parcela/balão do cronograma financiado
+def fluxo_com_entrada(simulacao, custos_iniciais=0.0):
+    cronograma_entrada = simulacao['cronograma_entrada']
+    data_entrada = para_datetime64([simulacao['data_entrada']])
+    if cronograma_entrada:
+        datas_entrada, valores_entrada = cronograma_entrada['Data_Vencimento'], cronograma_entrada['Valor']
+    else:
+        datas_entrada, valores_entrada = data_entrada, [simulacao['entrada']]
+    datas, fluxos = fluxo_financiamento(simulacao['cronograma'], simulacao['valor_total'] - custos_iniciais,
+                                        simulacao['data_entrada'])
+    return (np.concatenate([datas[:1], datas_entrada, datas[1:]]),
+            np.concatenate([fluxos[:1], -np.asarray(valores_entrada, dtype=float), fluxos[1:]]))
+
+# CET anual e mensal (%) de uma simulação (resultado de simular_financiamento). Por padrão é o CET
+# da operação de crédito: só o valor financiado, liberado em data_primeira_parcela, e as parcelas
+# e balões. Com incluir_entrada=True, o fluxo parte da data da entrada, com o valor total do imóvel
+# e as parcelas da entrada (fluxo_com_entrada), e o CET reflete também o parcelamento da entrada.
+def calcular_cet(simulacao, custos_iniciais=0.0, incluir_entrada=False):
+    if incluir_entrada:
+        datas, fluxos = fluxo_com_entrada(simulacao, custos_iniciais)
+    else:
+        datas, fluxos = fluxo_financiamento(simulacao['cronograma'], simulacao['valor_financiado'],
+                                            simulacao['data_primeira_parcela'], custos_iniciais)
+    if len(fluxos) < 2:
+        return {'cet_anual': None, 'cet_mensal': None}
+    # A taxa do contrato, anualizada, é um ótimo ponto de partida
+    chute = (1 + simulacao['taxas']['mensal']) ** 12 - 1
+    taxa = xirr(datas, fluxos, chute)
+    if np.isnan(taxa):
+        return {'cet_anual': None, 'cet_mensal': None}
+    return {'cet_anual': taxa * 100, 'cet_mensal': taxa_mensal_equivalente(taxa) * 100}
@@ -0,0 +1,331 @@
+import logging
+from datetime import datetime
+from math import ceil
+
+import numpy as np
+
+from .centavos import amortizar_centavos, para_centavos, para_reais
+from .calendario import (
+    PERIODOS_EM_MESES, dia_do_mes, gerar_datas_vencimento, para_datetime, para_datetime64,
+    rolar_dia_util, somar_meses
+)
+from .fatores import fator_anuidade, fatores_desconto, tabela_fatores
+from .tabela import Cronograma
+
+logger = logging.getLogger(__name__)
+
+COLUNAS_ENTRADA = ('Item', 'Tipo', 'Data_Vencimento', 'Valor', 'Valor_Presente', 'Desconto_Aplicado')
+
+def calcular_taxas(taxa_mensal):
+    try:
+        taxa_mensal_decimal = float(taxa_mensal) / 100
+        # Equivalentes lidas da tabela da taxa mensal, que também serve à parcela e ao cronograma
+        crescimento = tabela_fatores(taxa_mensal_decimal)['crescimento']
+        taxa_anual = float(crescimento[12]) - 1
+        taxa_semestral = float(crescimento[6]) - 1
+        taxa_trimestral = float(crescimento[3]) - 1
+        taxa_diaria = ((1 + taxa_mensal_decimal) ** (1/30)) - 1
+        
+        return {
+            'anual': taxa_anual,
+            'semestral': taxa_semestral,
+            'trimestral': taxa_trimestral,
+            'mensal': taxa_mensal_decimal,
+            'diaria': taxa_diaria
+        }
+    except:
+        return {
+            'anual': 0,
+            'semestral': 0,
+            'trimestral': 0,
+            'mensal': 0,
+            'diaria': 0
+        }
+
+def calcular_valor_presente(valor_futuro, taxa, dias):
+    try:
+        if dias <= 0 or taxa <= 0:
+            return valor_futuro
+        return valor_futuro / ((1 + taxa) ** (dias / 30))
+    except:
+        return valor_futuro
+
+# Vencimento pontual do n-ésimo período (mensal, semestral ou anual) a partir da data de referência
+def ajustar_data_vencimento(data, periodo, num_periodo=1, dia_vencimento=None, data_referencia=None):
+    if periodo not in PERIODOS_EM_MESES:
+        return None
+    
+    dia_vencimento = dia_vencimento or int(dia_do_mes(data))
+    data_referencia = data_referencia or data
+    meses = PERIODOS_EM_MESES[periodo] * num_periodo
+    return para_datetime(somar_meses(data_referencia, meses, dia_vencimento))
+
+def parse_date(date_str):
+    try:
+        return datetime.strptime(date_str, '%d/%m/%Y')
+    except ValueError:
+        return datetime.now()
+
+def calcular_comissoes(valor_total, comissao_coordenacao, comissao_imobiliaria):
+    try:
+        coord = (float(comissao_coordenacao) / 100) * float(valor_total)
+        imob = (float(comissao_imobiliaria) / 100) * float(valor_total)
+        return {
+            'coord': coord,
+            'imob': imob,
+            'total': coord + imob
+        }
+    except:
+        return {
+            'coord': 0,
+            'imob': 0,
+            'total': 0
+        }
+
+def determinar_modo_calculo(modalidade):
+    if modalidade == "mensal":
+        return 1
+    elif modalidade == "mensal + balão":
+        return 2
+    elif modalidade == "só balão anual":
+        return 3
+    elif modalidade == "só balão semestral":
+        return 4
+    else:
+        return 1
+
+def calcular_parcela(valor, taxa, periodos):
+    try:
+        if periodos <= 0 or taxa <= 0 or valor <= 0:
+            return 0
+            
+        parcela = valor / fator_anuidade(taxa, periodos)
+        
+        if np.isnan(parcela) or np.isinf(parcela):
+            return 0
+            
+        return abs(float(parcela))
+    except Exception as e:
+        logger.error(f"Erro no cálculo da parcela: {str(e)}")
+        return 0
+
+def calcular_valor_presente_total(valor, taxa, periodos):
+    try:
+        if periodos <= 0 or taxa <= 0:
+            return 0
+            
+        valor_presente = valor * fator_anuidade(taxa, periodos)
+        
+        if np.isnan(valor_presente) or np.isinf(valor_presente):
+            return 0
+            
+        return abs(float(valor_presente))
+    except:
+        return 0
+
+def atualizar_baloes(modalidade, qtd_parcelas, tipo_balao=None):
+    try:
+        qtd_parcelas = int(qtd_parcelas)
+        if modalidade == "mensal + balão":
+            if tipo_balao == "anual":
+                return max(qtd_parcelas // 12, 0)
+            elif tipo_balao == "semestral":
+                return max(qtd_parcelas // 6, 0)
+        elif modalidade == "só balão anual":
+            return max(ceil(qtd_parcelas / 12), 0)
+        elif modalidade == "só balão semestral":
+            return max(ceil(qtd_parcelas / 6), 0)
+        return 0
+    except:
+        return 0
+
+def gerar_cronograma_entrada(valor_entrada, qtd_parcelas_entrada, data_entrada, dia_vencimento,
+                             dias_uteis=False, feriados=None):
+    if qtd_parcelas_entrada <= 0 or valor_entrada <= 0:
+        return Cronograma.vazio(COLUNAS_ENTRADA)
+        
+    valor_parcela_entrada = np.full(qtd_parcelas_entrada, valor_entrada / qtd_parcelas_entrada)
+    datas = gerar_datas_vencimento(data_entrada, qtd_parcelas_entrada, 1, dia_vencimento,
+                                   dias_uteis=dias_uteis, feriados=feriados)
+    numeros = np.arange(1, qtd_parcelas_entrada + 1).astype(str)
+    
+    return Cronograma({
+        'Item': np.char.add(np.char.add("Entrada ", numeros), f"/{qtd_parcelas_entrada}"),
+        'Tipo': np.full(qtd_parcelas_entrada, "Entrada"),
+        'Data_Vencimento': datas,
+        'Valor': valor_parcela_entrada,
+        'Valor_Presente': valor_parcela_entrada,
+        'Desconto_Aplicado': np.zeros(qtd_parcelas_entrada)
+    })
+
+# --- Etapas de gerar_cronograma ---
+# eventos_cronograma -> fluxo_cronograma -> datas_cronograma -> linhas_cronograma. São públicas para que
+# GrafoSimulacao execute cada etapa separadamente e só refaça as afetadas por uma mudança de entrada.
+
+# Sequência de pagamentos na ordem em que ocorrem: parcelas mensais e balões intercalados.
+# Para cada evento: se é balão, seu número, o mês de referência e a taxa de juros do período.
+def eventos_cronograma(modalidade, tipo_balao, qtd_parcelas, qtd_baloes, taxas):
+    vazio = np.zeros(0, dtype=np.int64)
+    
+    if modalidade == "mensal":
+        meses = np.arange(1, qtd_parcelas + 1)
+        return np.zeros(len(meses), dtype=bool), meses, meses, np.full(len(meses), taxas['mensal'])
+    
+    if modalidade in ["só balão anual", "só balão semestral"]:
+        periodo = "anual" if modalidade == "só balão anual" else "semestral"
+        numeros = np.arange(1, qtd_baloes + 1)
+        meses = numeros * (12 if periodo == "anual" else 6)
+        return np.ones(len(numeros), dtype=bool), numeros, meses, np.full(len(numeros), taxas[periodo])
+    
+    if modalidade == "mensal + balão":
+        intervalo_balao = 12 if tipo_balao == "anual" else 6
+        taxa_periodo = taxas['anual'] if tipo_balao == "anual" else taxas['semestral']
+        numeros_parcela = np.arange(1, qtd_parcelas + 1)
+        numeros_balao = np.arange(1, min(qtd_baloes, qtd_parcelas // intervalo_balao) + 1)
+        
+        # O balão vence no mesmo mês da parcela múltipla do intervalo e é pago logo após ela
+        e_balao = np.concatenate([np.zeros(len(numeros_parcela), dtype=bool), np.ones(len(numeros_balao), dtype=bool)])
+        numeros = np.concatenate([numeros_parcela, numeros_balao])
+        meses = np.concatenate([numeros_parcela, numeros_balao * intervalo_balao])
+        ordem = np.argsort(meses * 2 + e_balao, kind='stable')
+        taxas_evento = np.where(e_balao, taxa_periodo, taxas['mensal'])
+        return e_balao[ordem], numeros[ordem], meses[ordem], taxas_evento[ordem]
+    
+    return np.zeros(0, dtype=bool), vazio, vazio, np.zeros(0)
+
+# Valores efetivamente pagos em cada evento. O saldo segue S(e) = S(e-1) * (1 + r(e)) - p(e),
+# resolvido em forma fechada: S(e) = G(e) * (S0 - soma(p / G)), com G o produto acumulado de (1 + r).
+# O pagamento que ultrapassa o saldo é reduzido ao saldo com juros e os seguintes ficam zerados.
+def _valores_eventos(saldo_inicial, taxas_evento, pagamentos):
+    if len(pagamentos) == 0:
+        return pagamentos
+    
+    crescimento = np.cumprod(1 + taxas_evento)
+    saldo = crescimento * (saldo_inicial - np.cumsum(pagamentos / crescimento))
+    saldo_anterior_corrigido = np.concatenate([[saldo_inicial], saldo[:-1]]) * (1 + taxas_evento)
+    
+    valores = pagamentos.copy()
+    quitacao = np.flatnonzero(pagamentos > saldo_anterior_corrigido)
+    if len(quitacao):
+        primeiro = quitacao[0]
+        valores[primeiro] = saldo_anterior_corrigido[primeiro]
+        valores[primeiro + 1:] = 0
+    return valores
+
+# Mesmo fluxo em centavos exatos: pagamentos arredondados (ABNT) e juros de cada evento arredondados
+# sobre o saldo em centavos. Se o plano quita o saldo, o resíduo de arredondamento vai para o último
+# pagamento, e o saldo termina exatamente em zero.
+def _valores_eventos_centavos(saldo_inicial, taxas_evento, pagamentos):
+    if len(pagamentos) == 0:
+        return pagamentos
+    
+    centavos = para_centavos(pagamentos)
+    _, _, saldo = amortizar_centavos(para_centavos(saldo_inicial), taxas_evento, centavos)
+    quitacao = np.flatnonzero(saldo < 0)
+    if len(quitacao):
+        primeiro = quitacao[0]
+        centavos[primeiro] += saldo[primeiro]
+        centavos[primeiro + 1:] = 0
+    else:
+        crescimento = np.cumprod(1 + taxas_evento)
+        saldo_final = crescimento[-1] * (saldo_inicial - np.sum(pagamentos / crescimento))
+        pagos = np.flatnonzero(centavos)
+        if para_centavos(saldo_final) == 0 and len(pagos):
+            centavos[pagos[-1]] += saldo[-1]
+    return para_reais(centavos)
+
+# Eventos na ordem de apresentação (parcelas primeiro, depois balões) com os valores pagos
+def fluxo_cronograma(valor_financiado, valor_parcela, valor_balao, e_balao, numeros, meses, taxas_evento, exato=False):
+    pagamentos = np.where(e_balao, float(valor_balao), float(valor_parcela))
+    calcular_valores = _valores_eventos_centavos if exato else _valores_eventos
+    valores = calcular_valores(float(valor_financiado), taxas_evento, pagamentos)
+    ordem = np.argsort(e_balao, kind='stable')
+    return e_balao[ordem], numeros[ordem], meses[ordem], valores[ordem]
+
+# Vencimentos, dias corridos e meses de desconto de cada evento (já na ordem de apresentação)
+def datas_cronograma(e_balao, meses, modalidade, data_primeira_parcela, dia_vencimento,
+                     data_primeiro_balao=None, dias_uteis=False, feriados=None):
+    # Todos os vencimentos de uma vez: cada evento vence "meses" meses após a data base
+    data_base = para_datetime64(data_primeira_parcela)
+    datas = somar_meses(data_base, meses, dia_vencimento)
+    if dias_uteis:
+        datas = rolar_dia_util(datas, feriados)
+    dias = meses * 30
+    meses_desconto = meses.astype(float)
+    
+    # Balões do plano "mensal + balão" descontam pelos dias corridos até o vencimento,
+    # e o primeiro pode ter data personalizada
+    if modalidade == "mensal + balão" and e_balao.any():
+        if data_primeiro_balao:
+            datas[np.argmax(e_balao)] = para_datetime64(data_primeiro_balao)
+        dias[e_balao] = (datas[e_balao] - data_base).astype(np.int64)
+        meses_desconto[e_balao] = dias[e_balao] / 30
+    return datas, dias, meses_desconto
+
+# Valores presentes em centavos (ABNT) somando exatamente o valor financiado: o resíduo de
+# arredondamento vai para o último vencimento, sem reescalar os demais
+def _valores_presentes_centavos(valor_financiado, valores_presentes, meses_desconto):
+    centavos = para_centavos(valores_presentes)
+    if len(centavos) and centavos.sum() > 0:
+        ultimo = len(meses_desconto) - 1 - np.argmax(meses_desconto[::-1])
+        centavos[ultimo] += para_centavos(valor_financiado) - centavos.sum()
+    return centavos
+
+# Cronograma em colunas (totais à parte) a partir do fluxo e das datas
+def linhas_cronograma(valor_financiado, taxa_mensal, e_balao, numeros, valores, datas, dias, meses_desconto,
+                      exato=False):
+    valores_presentes = valores * fatores_desconto(taxa_mensal, meses_desconto)
+    
+    if exato:
+        centavos = para_centavos(valores)
+        centavos_presentes = _valores_presentes_centavos(valor_financiado, valores_presentes, meses_desconto)
+        valores, valores_presentes = para_reais(centavos), para_reais(centavos_presentes)
+        descontos = para_reais(centavos - centavos_presentes)
+        total_valor_presente = float(para_reais(centavos_presentes.sum()))
+        total_desconto = float(para_reais((centavos - centavos_presentes).sum()))
+    else:
+        # Ajuste final para garantir precisão: reescala os valores presentes para somarem o valor financiado
+        total_valor_presente = float(valores_presentes.sum())
+        total_desconto = float((valores - valores_presentes).sum())
+        if len(valores) and total_valor_presente > 0 and abs(total_valor_presente - valor_financiado) > 0.01:
+            valores_presentes = valores_presentes * (valor_financiado / total_valor_presente)
+            total_valor_presente = valor_financiado
+            total_desconto = float(valores.sum()) - total_valor_presente
+        descontos = valores - valores_presentes
+    
+    return Cronograma({
+        'Item': np.char.add(np.where(e_balao, "Balão ", "Parcela "), numeros.astype(str)),
+        'Tipo': np.where(e_balao, "Balão", "Parcela"),
+        'Data_Vencimento': datas,
+        'Dias': dias,
+        'Valor': valores,
+        'Valor_Presente': valores_presentes,
+        'Desconto_Aplicado': descontos
+    }, totais={
+        'Valor': float(para_reais(centavos.sum())) if exato else float(valores.sum()),
+        'Valor_Presente': total_valor_presente,
+        'Desconto_Aplicado': total_desconto
+    })
+
+MENSAGEM_ERRO_CRONOGRAMA = "Erro no cálculo"
+
+def gerar_cronograma(valor_financiado, valor_parcela, valor_balao,
+                    qtd_parcelas, qtd_baloes, modalidade, tipo_balao,
+                    data_primeira_parcela, taxas, dia_vencimento, data_primeiro_balao=None,
+                    dias_uteis=False, feriados=None, exato=False):
+    try:
+        e_balao, numeros, meses, taxas_evento = eventos_cronograma(
+            modalidade, tipo_balao, int(qtd_parcelas), int(qtd_baloes), taxas
+        )
+        e_balao, numeros, meses, valores = fluxo_cronograma(
+            valor_financiado, valor_parcela, valor_balao, e_balao, numeros, meses, taxas_evento, exato
+        )
+        datas, dias, meses_desconto = datas_cronograma(
+            e_balao, meses, modalidade, data_primeira_parcela, dia_vencimento,
+            data_primeiro_balao, dias_uteis, feriados
+        )
+        return linhas_cronograma(valor_financiado, taxas['mensal'], e_balao, numeros, valores, datas, dias,
+                                  meses_desconto, exato)
+    except Exception as e:
+        logger.error(f"Erro ao gerar cronograma: {str(e)}")
+        return Cronograma.vazio(erro=MENSAGEM_ERRO_CRONOGRAMA)
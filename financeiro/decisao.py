@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from .amortizacao import _parcela_price
+from .investimentos import _imposto_resgate, _taxas_produtos
+from .solver import SISTEMAS, _sistema
+
+# Pagar à vista ou financiar e investir o dinheiro? Para cada produto de investimento e cada opção
+# de financiamento (sistema x taxa x prazo), o valor fica aplicado e as parcelas são resgatadas
+# mês a mês; a vantagem de financiar é o que sobra no fim do prazo, já descontado o IR do resgate
+# (negativa: o investimento não cobriu as parcelas e pagar à vista era melhor).
+# Toda a matriz produto x opção é calculada de uma vez, com arrays produto x opção x mês.
+#
+# A taxa de equilíbrio é a maior taxa de juros do financiamento (% a.m.) com que financiar ainda
+# compensa para aquele produto, sistema e prazo, encontrada por bisseção vetorizada.
+#
+#   matriz_decisao(300000, produtos, taxas_juros=[0.8, 1.0, 1.2], prazos_meses=[60, 120])
+
+# Parcelas de cada opção (... x mês), zeradas depois do prazo
+def _parcelas(valor, e_price, i, prazos, horizonte):
+    k = np.arange(horizonte)
+    amortizacao = valor / prazos
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price = _parcela_price(valor, i, prazos)
+    sac = amortizacao[..., None] + (valor - amortizacao[..., None] * k) * i[..., None]
+    parcelas = np.where(e_price[..., None], price[..., None], sac)
+    return np.where(k < prazos[..., None], parcelas, 0.0)
+
+# Patrimônio líquido no fim do prazo de cada opção: valor aplicado no mês 0 menos as parcelas
+# resgatadas no fim de cada mês, com IR por lote (os resgates entram como lotes negativos).
+# fatores: produto x mês; taxas: produto x opção (fração ao mês).
+def _vantagem(valor, fatores, isentos, e_price, taxas, prazos):
+    qtd_produtos, horizonte = fatores.shape
+    acumulado = np.cumprod(np.hstack([np.ones((qtd_produtos, 1)), fatores]), axis=1)[:, None, :]
+    parcelas = _parcelas(valor, e_price, taxas, prazos, horizonte)
+
+    fluxos = np.concatenate([np.full(parcelas.shape[:-1] + (1,), float(valor)), -parcelas], axis=-1)
+    acumulado = np.broadcast_to(acumulado, fluxos.shape)
+    saldo = acumulado * np.cumsum(fluxos / acumulado, axis=-1)
+
+    linhas = fluxos.reshape(-1, horizonte + 1)
+    fator_linhas = acumulado.reshape(-1, horizonte + 1)
+    imposto = _imposto_resgate(fator_linhas, linhas / fator_linhas, linhas).reshape(fluxos.shape)
+    imposto[isentos] = 0
+
+    fim = np.broadcast_to(prazos, saldo.shape[:-1])[..., None]
+    return (np.take_along_axis(saldo, fim, axis=-1)[..., 0],
+            np.take_along_axis(imposto, fim, axis=-1)[..., 0],
+            parcelas)
+
+# Maior taxa de juros (fração ao mês) que ainda deixa vantagem em financiar
+def _taxa_equilibrio(valor, fatores, isentos, e_price, prazos, taxa_maxima=0.05, tolerancia=1e-10):
+    forma = (len(fatores), len(prazos))
+    def vantagem(taxas):
+        saldo, imposto, _ = _vantagem(valor, fatores, isentos, np.broadcast_to(e_price, forma), taxas,
+                                      np.broadcast_to(prazos, forma))
+        return saldo - imposto
+
+    baixo = np.zeros(forma)
+    alto = np.full(forma, taxa_maxima)
+    # Produtos que rendem muito: amplia o limite superior até a vantagem ficar negativa
+    for _ in range(10):
+        positiva = vantagem(alto) > 0
+        if not positiva.any():
+            break
+        baixo = np.where(positiva, alto, baixo)
+        alto = np.where(positiva, alto * 2, alto)
+    while (alto - baixo).max() > tolerancia:
+        meio = (baixo + alto) / 2
+        positiva = vantagem(meio) > 0
+        baixo = np.where(positiva, meio, baixo)
+        alto = np.where(positiva, alto, meio)
+    # Nem a juro zero compensa financiar
+    return np.where(vantagem(np.zeros(forma)) > 0, (baixo + alto) / 2, np.nan)
+
+def matriz_decisao(valor, produtos, taxas_juros, prazos_meses, sistemas=SISTEMAS, cdi=10.5, ipca=4.5):
+    if not produtos:
+        raise ValueError("Informe ao menos um produto")
+    if valor <= 0:
+        raise ValueError("O valor deve ser maior que zero")
+    sistemas = [_sistema(sistema) for sistema in sistemas]
+    taxas_juros = np.atleast_1d(np.asarray(taxas_juros, dtype=float))
+    prazos_meses = np.atleast_1d(np.asarray(prazos_meses, dtype=np.int64))
+    if np.any(prazos_meses < 1):
+        raise ValueError("Todos os prazos devem ser de pelo menos 1 mês")
+    if np.any(taxas_juros < 0):
+        raise ValueError("As taxas de juros não podem ser negativas")
+
+    # Opções de financiamento: todas as combinações sistema x taxa x prazo
+    sistema, taxa, prazo = (eixo.ravel() for eixo in np.meshgrid(np.array(sistemas), taxas_juros, prazos_meses, indexing='ij'))
+    e_price = sistema == "price"
+    nomes = [str(produto.get('nome') or f"Produto {n + 1}") for n, produto in enumerate(produtos)]
+    isentos = np.array([bool(produto.get('isento_ir', False)) for produto in produtos])
+
+    horizonte = int(prazos_meses.max())
+    fatores = 1 + _taxas_produtos(produtos, horizonte, cdi, ipca)
+    forma = (len(produtos), len(sistema))
+    saldo, imposto, parcelas = _vantagem(valor, fatores, isentos, e_price, np.broadcast_to(taxa / 100, forma),
+                                         np.broadcast_to(prazo, forma))
+    vantagem = np.round(saldo - imposto, 2) + 0.0  # + 0.0 evita "-0,00"
+
+    # A taxa de equilíbrio só depende do sistema e do prazo: calculada uma vez por par
+    pares, indice_par = np.unique(np.stack([e_price, prazo]), axis=1, return_inverse=True)
+    equilibrio = _taxa_equilibrio(valor, fatores, isentos, pares[0].astype(bool), pares[1])[:, indice_par.ravel()]
+
+    return pd.DataFrame({
+        'produto': np.repeat(nomes, len(sistema)),
+        'sistema': np.tile(sistema, len(produtos)),
+        'taxa_juros': np.tile(taxa, len(produtos)),
+        'prazo_meses': np.tile(prazo, len(produtos)),
+        'primeira_parcela': np.round(parcelas[..., 0], 2).ravel(),
+        'total_pago': np.round(parcelas.sum(axis=-1), 2).ravel(),
+        'saldo_investimento': np.round(saldo, 2).ravel(),
+        'imposto': np.round(imposto, 2).ravel(),
+        'vantagem_financiar': vantagem.ravel(),
+        'taxa_equilibrio': np.round(equilibrio * 100, 4).ravel(),
+        'decisao': np.where(vantagem > 0, "Financiar e investir", "Pagar à vista").ravel()
+    })
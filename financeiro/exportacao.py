@@ -0,0 +1,318 @@
+import hashlib
+import itertools
+import logging
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+
+from .cache import cache_simulacoes, normalizar
+from .formatacao import formatar_datas, formatar_moeda, formatar_moedas
+
+# fpdf e openpyxl são importados sob demanda, apenas quando uma exportação é pedida
+logger = logging.getLogger(__name__)
+
+ALTURA_LINHA_PDF = 10
+
+# Desenha uma tabela paginada: o cabeçalho é repetido no topo de cada nova página
+def _tabela_pdf(pdf, colunas, larguras, linhas):
+    def cabecalho():
+        for col, larg in zip(colunas, larguras):
+            pdf.cell(larg, ALTURA_LINHA_PDF, text=col, border=1)
+        pdf.ln()
+    
+    cabecalho()
+    for linha in linhas:
+        if pdf.will_page_break(ALTURA_LINHA_PDF):
+            pdf.add_page()
+            cabecalho()
+        for texto, larg in zip(linha, larguras):
+            pdf.cell(larg, ALTURA_LINHA_PDF, text=texto, border=1)
+        pdf.ln()
+
+def _montar_pdf(cronograma, cronograma_entrada, dados):
+    from fpdf import FPDF
+    from fpdf.enums import XPos, YPos
+    
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    
+    pdf.cell(200, 10, text="Simulação de Financiamento", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+    pdf.ln(10)
+    
+    pdf.cell(200, 10, text=f"Valor Total: {formatar_moeda(dados['valor_total'])}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(200, 10, text=f"Entrada: {formatar_moeda(dados['entrada'])} ({dados['qtd_parcelas_entrada']}x)", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(200, 10, text=f"Valor Financiado: {formatar_moeda(dados['valor_financiado'])}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(200, 10, text=f"Taxa Mensal: {dados['taxa_mensal']}%", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.cell(200, 10, text=f"Modalidade: {dados['modalidade']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.ln(10)
+    
+    if cronograma_entrada:
+        pdf.cell(200, 10, text="Cronograma de Entrada:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        _tabela_pdf(pdf, ["Item", "Data Venc.", "Valor"], [60, 60, 60], zip(
+            cronograma_entrada['Item'].tolist(),
+            formatar_datas(cronograma_entrada['Data_Vencimento']),
+            formatar_moedas(cronograma_entrada['Valor'])
+        ))
+    
+    if cronograma.erro:
+        raise ValueError(cronograma.erro)
+    pdf.cell(200, 10, text="Cronograma de Pagamentos:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    larguras = [40, 30, 40, 40, 40]
+    _tabela_pdf(pdf, ["Item", "Tipo", "Data Venc.", "Valor", "Valor Presente"], larguras, zip(
+        cronograma['Item'].tolist(),
+        cronograma['Tipo'].tolist(),
+        formatar_datas(cronograma['Data_Vencimento']),
+        formatar_moedas(cronograma['Valor']),
+        formatar_moedas(cronograma['Valor_Presente'])
+    ))
+    
+    if pdf.will_page_break(ALTURA_LINHA_PDF):
+        pdf.add_page()
+    pdf.cell(sum(larguras[:3]), 10, text="TOTAL", border=1, align='R')
+    pdf.cell(larguras[3], 10, text=formatar_moeda(cronograma.totais['Valor']), border=1)
+    pdf.cell(larguras[4], 10, text=formatar_moeda(cronograma.totais['Valor_Presente']), border=1)
+    return pdf
+
+# Escreve o PDF direto no destino: caminho de arquivo ou objeto com .write (sem cópia intermediária).
+# Sem destino, grava em um arquivo temporário e retorna o caminho.
+def exportar_pdf(cronograma, cronograma_entrada, dados, destino=None):
+    if destino is None:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as arquivo:
+            destino = arquivo.name
+    _montar_pdf(cronograma, cronograma_entrada, dados).output(destino)
+    return destino
+
+def gerar_pdf(cronograma, cronograma_entrada, dados):
+    try:
+        pdf_output = BytesIO()
+        exportar_pdf(cronograma, cronograma_entrada, dados, pdf_output)
+        pdf_output.seek(0)
+        return pdf_output
+    except Exception as e:
+        logger.error(f"Erro ao gerar PDF: {str(e)}")
+        return BytesIO()
+
+def _exportar_pdf_lote(argumentos):
+    simulacao, caminho = argumentos
+    return exportar_pdf(simulacao['cronograma'], simulacao.get('cronograma_entrada'), simulacao['dados'], caminho)
+
+# Nome de arquivo seguro para o PDF de uma simulação: só o último componente do nome, com
+# caracteres fora de letras, dígitos, espaço, "-", "_" e "." trocados por "_", sempre com ".pdf".
+# Nomes repetidos (sem diferenciar maiúsculas) ganham o índice da simulação.
+def _nome_arquivo_pdf(nome, indice, usados):
+    base = os.path.basename(str(nome or "").replace("\\", "/"))
+    if base.lower().endswith(".pdf"):
+        base = base[:-4]
+    base = re.sub(r"[^\w\- .]", "_", base).strip(" .")
+    base = base or f"simulacao_{indice:05d}"
+    while base.lower() in usados:
+        base = f"{base}_{indice:05d}"
+    usados.add(base.lower())
+    return f"{base}.pdf"
+
+# Gera um PDF por simulação no diretório indicado, distribuindo o trabalho em processos.
+# Cada simulação é um dict com 'cronograma', 'dados' e, opcionalmente, 'cronograma_entrada' e 'nome'
+# (nome do arquivo, ajustado por _nome_arquivo_pdf).
+def gerar_pdfs_em_lote(simulacoes, diretorio, max_processos=None):
+    os.makedirs(diretorio, exist_ok=True)
+    usados = set()
+    tarefas = [
+        (simulacao, os.path.join(diretorio, _nome_arquivo_pdf(simulacao.get('nome'), indice, usados)))
+        for indice, simulacao in enumerate(simulacoes, start=1)
+    ]
+    with ProcessPoolExecutor(max_workers=max_processos) as executor:
+        return list(executor.map(_exportar_pdf_lote, tarefas, chunksize=max(1, len(tarefas) // 64)))
+
+FORMATO_MOEDA_EXCEL = '"R$" #,##0.00'
+FORMATO_DATA_EXCEL = 'DD/MM/YYYY'
+COLUNAS_MONETARIAS = ['Valor', 'Valor_Presente', 'Desconto_Aplicado']
+COLUNAS_CONSOLIDADO = ['Item', 'Tipo', 'Data_Vencimento', 'Dias'] + COLUNAS_MONETARIAS
+
+# Escreve uma aba em modo somente escrita: cada linha (sequência de valores na ordem das colunas)
+# é serializada assim que anexada, então uma única célula com formato nativo (moeda/data) por
+# coluna é reaproveitada em todas as linhas
+def _escrever_aba(workbook, titulo, colunas, linhas):
+    from openpyxl.cell import WriteOnlyCell
+    
+    aba = workbook.create_sheet(title=titulo)
+    aba.append(colunas)
+    
+    celulas = {}
+    for indice, coluna in enumerate(colunas):
+        if coluna in COLUNAS_MONETARIAS or coluna == 'Data_Vencimento':
+            celulas[indice] = WriteOnlyCell(aba)
+            celulas[indice].number_format = FORMATO_MOEDA_EXCEL if coluna in COLUNAS_MONETARIAS else FORMATO_DATA_EXCEL
+    
+    for linha in linhas:
+        valores = list(linha)
+        for indice, celula in celulas.items():
+            if valores[indice] is not None and valores[indice] != "":
+                celula.value = valores[indice]
+                valores[indice] = celula
+        aba.append(valores)
+
+# Linhas de um cronograma nas colunas pedidas (valores Python, datas como datetime.date),
+# seguidas da linha TOTAL quando o cronograma tem totais
+def _linhas_excel(cronograma, colunas, prefixo=()):
+    valores = [cronograma[coluna].tolist() for coluna in colunas]
+    for linha in zip(*valores):
+        yield prefixo + linha
+    if cronograma.totais:
+        yield prefixo + tuple(
+            "TOTAL" if coluna == 'Item' else cronograma.totais.get(coluna, "") for coluna in colunas
+        )
+
+ABAS_SIMULACAO = ("Entrada", "Financiamento")
+LIMITE_TITULO_ABA = 31
+
+# Títulos das abas de uma simulação no lote ("<nome> - Entrada", "<nome> - Financiamento"), válidos
+# no Excel: o nome perde os caracteres []:*?/\ e é encurtado (nunca o sufixo) para caber em 31
+# caracteres. Se algum título já foi usado (sem diferenciar maiúsculas), o nome ganha o índice da simulação.
+def _titulos_abas(nome, indice, usados):
+    nome = re.sub(r"[\[\]:*?/\\]", "_", str(nome)).strip(" '") or str(indice)
+    for tentativa in itertools.count():
+        marca = "" if tentativa == 0 else f" ({indice})" if tentativa == 1 else f" ({indice}-{tentativa})"
+        titulos = []
+        for aba in ABAS_SIMULACAO:
+            sufixo = f"{marca} - {aba}"
+            titulos.append(nome[:LIMITE_TITULO_ABA - len(sufixo)].rstrip(" '") + sufixo)
+        if not any(titulo.lower() in usados for titulo in titulos):
+            usados.update(titulo.lower() for titulo in titulos)
+            return titulos
+
+def _escrever_simulacao(workbook, cronograma, cronograma_entrada, titulos=ABAS_SIMULACAO):
+    if cronograma.erro:
+        raise ValueError(cronograma.erro)
+    if not cronograma:
+        raise ValueError("Nenhum dado encontrado no cronograma")
+    
+    titulo_entrada, titulo_financiamento = titulos
+    if cronograma_entrada:
+        _escrever_aba(workbook, titulo_entrada, cronograma_entrada.nomes,
+                      _linhas_excel(cronograma_entrada, cronograma_entrada.nomes))
+    _escrever_aba(workbook, titulo_financiamento, cronograma.nomes, _linhas_excel(cronograma, cronograma.nomes))
+
+# Exporta para um destino (caminho ou objeto com .write) sem montar a planilha inteira em memória
+def exportar_excel(cronograma, cronograma_entrada, destino):
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    _escrever_simulacao(workbook, cronograma, cronograma_entrada)
+    workbook.save(destino)
+    return destino
+
+def gerar_excel(cronograma, cronograma_entrada):
+    try:
+        output = BytesIO()
+        exportar_excel(cronograma, cronograma_entrada, output)
+        output.seek(0)
+        return output
+        
+    except Exception as e:
+        logger.error(f"Erro ao gerar Excel: {str(e)}")
+        return BytesIO()
+
+# Várias simulações em um só arquivo. Cada simulação é um dict com 'cronograma' e, opcionalmente,
+# 'cronograma_entrada' e 'nome'. Por padrão cada uma ganha suas abas (títulos de _titulos_abas); com
+# consolidado=True todas as linhas vão para uma única aba, identificadas pela coluna 'Simulacao'.
+def gerar_excel_lote(simulacoes, destino, consolidado=False):
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    if consolidado:
+        def linhas():
+            for indice, simulacao in enumerate(simulacoes, start=1):
+                nome = simulacao.get('nome') or f"Simulação {indice}"
+                yield from _linhas_excel(simulacao['cronograma'], COLUNAS_CONSOLIDADO, (nome,))
+        
+        _escrever_aba(workbook, "Financiamento", ['Simulacao', *COLUNAS_CONSOLIDADO], linhas())
+    else:
+        usados = set()
+        for indice, simulacao in enumerate(simulacoes, start=1):
+            titulos = _titulos_abas(simulacao.get('nome') or indice, indice, usados)
+            _escrever_simulacao(workbook, simulacao['cronograma'], simulacao.get('cronograma_entrada'), titulos)
+    
+    workbook.save(destino)
+    return destino
+
+# --- Exportações sob demanda ---
+# PDF e Excel só são gerados quando pedidos e ficam no cache de simulações pela impressão digital
+# da simulação, então pedir de novo (outra sessão, outro clique) não refaz o documento.
+
+TIPOS_EXPORTACAO = {
+    'pdf': ("application/pdf", "simulacao_financiamento.pdf"),
+    'excel': ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "simulacao_financiamento.xlsx")
+}
+
+# Identifica uma simulação pelas suas entradas (ou por qualquer estrutura que a determine)
+def impressao_digital(valor):
+    return hashlib.sha1(repr(normalizar(valor)).encode("utf-8")).hexdigest()
+
+# Documento como visão somente leitura do buffer em que foi gerado (o bytearray do fpdf ou o
+# BytesIO da planilha), sem copiá-lo de novo para bytes; falhas geram documento vazio
+def _gerar_exportacao(formato, cronograma, cronograma_entrada, dados):
+    if formato not in TIPOS_EXPORTACAO:
+        raise ValueError(f"Formato de exportação inválido: {formato}")
+    try:
+        if formato == "pdf":
+            documento = _montar_pdf(cronograma, cronograma_entrada, dados).output()
+        else:
+            saida = BytesIO()
+            exportar_excel(cronograma, cronograma_entrada, saida)
+            documento = saida.getbuffer()
+    except Exception as e:
+        logger.error(f"Erro ao gerar {formato}: {str(e)}")
+        documento = b""
+    return memoryview(documento).toreadonly()
+
+# Documento já gerado para a simulação, ou None
+def exportacao_pronta(chave, formato, cache=None):
+    cache = cache or cache_simulacoes
+    _, conteudo = cache.obter(('exportacao', formato, chave))
+    return conteudo
+
+# Gera (ou reaproveita do cache) o documento da simulação identificada por chave; sem chave,
+# o documento é gerado sem passar pelo cache
+def obter_exportacao(chave, formato, cronograma, cronograma_entrada, dados=None, cache=None):
+    if chave is None:
+        return _gerar_exportacao(formato, cronograma, cronograma_entrada, dados)
+    cache = cache or cache_simulacoes
+    encontrado, conteudo = cache.obter(('exportacao', formato, chave))
+    if encontrado:
+        return conteudo
+    conteudo = _gerar_exportacao(formato, cronograma, cronograma_entrada, dados)
+    if conteudo:  # falhas geram documento vazio, que não deve ficar no cache
+        cache.guardar(('exportacao', formato, chave), conteudo)
+    return conteudo
+
+_executor_exportacao = None
+_pendentes = {}
+_lock_pendentes = threading.Lock()
+
+# Agenda a geração numa thread de fundo e retorna o Future; pedidos repetidos para a mesma
+# simulação e formato compartilham a mesma tarefa. O resultado vai para o cache.
+def preparar_exportacao(chave, formato, cronograma, cronograma_entrada, dados=None, cache=None):
+    global _executor_exportacao
+    with _lock_pendentes:
+        if (chave, formato) in _pendentes:
+            return _pendentes[(chave, formato)]
+        if _executor_exportacao is None:
+            _executor_exportacao = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("FINANCEIRO_EXPORTACAO_THREADS", 1)),
+                thread_name_prefix="exportacao"
+            )
+        futuro = _executor_exportacao.submit(
+            obter_exportacao, chave, formato, cronograma, cronograma_entrada, dados, cache
+        )
+        _pendentes[(chave, formato)] = futuro
+
+    def concluir(_):
+        with _lock_pendentes:
+            _pendentes.pop((chave, formato), None)
+
+    futuro.add_done_callback(concluir)
+    return futuro
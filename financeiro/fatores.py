@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+
+from .cache import CacheSimulacao
+
+# Tabelas de fatores por taxa, calculadas uma vez e compartilhadas por todo o processo. As taxas
+# vêm de um cardápio pequeno (0,50% a 2,00% a.m., de 0,01 em 0,01, e suas equivalentes anual e
+# semestral), então cada taxa i (fração por período) ganha vetores com k = 0..horizonte:
+#   crescimento(k) = (1 + i)^k
+#   desconto(k)    = (1 + i)^-k
+#   anuidade(k)    = (1 - (1 + i)^-k) / i   (valor presente de k pagamentos de 1; k quando i = 0)
+# Parcela e valor presente viram uma consulta (valor / anuidade(n) e valor * anuidade(n)) e o
+# desconto do cronograma, um gather no vetor de desconto. As tabelas ficam num cache LRU limitado
+# (FINANCEIRO_FATORES_ITENS taxas, padrão 1024, ~12 KB cada) e são refeitas maiores quando um
+# prazo além do horizonte é pedido. Os vetores são somente leitura.
+#
+#   tabela_fatores(0.0079)['anuidade'][360]
+
+HORIZONTE_TABELA = 480
+
+tabelas_fatores = CacheSimulacao(
+    max_itens=int(os.environ.get("FINANCEIRO_FATORES_ITENS", 1024)),
+    ttl=float("inf"),
+    max_bytes=32 * 1024 * 1024
+)
+
+def _montar_tabela(taxa, tamanho):
+    k = np.arange(tamanho + 1, dtype=float)
+    crescimento = np.power(1 + taxa, k)
+    desconto = 1 / crescimento
+    anuidade = (1 - desconto) / taxa if taxa != 0 else k
+    tabela = {'crescimento': crescimento, 'desconto': desconto, 'anuidade': anuidade}
+    for vetor in tabela.values():
+        vetor.setflags(write=False)
+    return tabela
+
+# Tabela da taxa com pelo menos "horizonte" períodos
+def tabela_fatores(taxa, horizonte=HORIZONTE_TABELA):
+    taxa = float(taxa)
+    horizonte = int(horizonte)
+    encontrado, tabela = tabelas_fatores.obter(taxa)
+    if not encontrado or len(tabela['crescimento']) <= horizonte:
+        tabela = _montar_tabela(taxa, max(horizonte, HORIZONTE_TABELA))
+        tabelas_fatores.guardar(taxa, tabela)
+    return tabela
+
+_FORMULAS = {
+    'desconto': lambda taxa, k: np.power(1 + taxa, -k),
+    'anuidade': lambda taxa, k: (1 - np.power(1 + taxa, -k)) / taxa if taxa != 0 else k
+}
+
+# Fator de cada período: períodos inteiros não negativos vêm da tabela; os fracionários (balões
+# descontados por dias corridos) e os negativos são calculados pela fórmula
+def _fatores(nome, taxa, periodos):
+    periodos = np.asarray(periodos, dtype=float)
+    inteiros = (periodos >= 0) & (periodos == np.floor(periodos))
+    fatores = np.empty(periodos.shape)
+    if inteiros.any():
+        vetor = tabela_fatores(taxa, periodos[inteiros].max())[nome]
+        fatores[inteiros] = vetor[periodos[inteiros].astype(np.int64)]
+    if not inteiros.all():
+        fatores[~inteiros] = _FORMULAS[nome](float(taxa), periodos[~inteiros])
+    return fatores
+
+def fatores_desconto(taxa, periodos):
+    return _fatores('desconto', taxa, periodos)
+
+# Um único prazo (parcela, valor presente): prazos inteiros são uma consulta direta à tabela
+def fator_anuidade(taxa, periodos):
+    if periodos >= 0 and float(periodos).is_integer():
+        return float(tabela_fatores(taxa, periodos)['anuidade'][int(periodos)])
+    return float(_fatores('anuidade', taxa, periodos))
@@ -0,0 +1,88 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Formatação em padrão brasileiro (R$ 1.234,56) sem depender do locale do processo.
+# O valor é arredondado para centavos inteiros, que são então separados em milhares e decimais.
+# Ao contrário do formatador original, que arredondava só a parte decimal, 0.999 vira "1,00" (e não
+# "0,100"), e meios centavos podem arredondar de outro modo (2.675 -> "2,68"; 1234.565 -> "1.234,56").
+def formatar_moeda(valor, simbolo=True):
+    try:
+        if valor is None:
+            return "R$ 0,00" if simbolo else "0,00"
+        
+        if isinstance(valor, str):
+            valor = re.sub(r'[^\d,]', '', valor).replace(',', '.')
+            valor = float(valor)
+        
+        centavos = round(abs(valor) * 100)
+        parte_inteira_str = f"{centavos // 100:,}".replace(",", ".")
+        valor_formatado = f"{parte_inteira_str},{centavos % 100:02d}"
+        
+        if valor < 0:
+            valor_formatado = f"-{valor_formatado}"
+        
+        return f"R$ {valor_formatado}" if simbolo else valor_formatado
+    except Exception:
+        return "R$ 0,00" if simbolo else "0,00"
+
+# Tabelas de grupos de milhar: "0".."999" para o grupo inicial e "000".."999" para os demais
+_GRUPO_INICIAL = np.array([str(n) for n in range(1000)])
+_GRUPO = np.array([f"{n:03d}" for n in range(1000)])
+_CENTAVOS = np.array([f"{n:02d}" for n in range(100)])
+
+# Versão vetorizada de formatar_moeda: formata uma coluna inteira (array, lista ou Series)
+# de uma vez, com a mesma saída do formatador escalar
+def formatar_moedas(valores, simbolo=True):
+    serie = valores if isinstance(valores, pd.Series) else None
+    valores = np.asarray(valores)
+    if valores.dtype.kind not in 'biuf':
+        valores = np.array([formatar_moeda_para_numero(v) for v in valores.ravel()]).reshape(valores.shape)
+    valores = valores.astype(float)
+    
+    validos = np.isfinite(valores)
+    centavos = np.rint(np.abs(np.where(validos, valores, 0)) * 100).astype(np.int64)
+    inteiro = centavos // 100
+    
+    # Separa os milhares do grupo menos significativo para o mais significativo
+    texto = np.full(valores.shape, "", dtype="U32")
+    while np.any(inteiro >= 1000):
+        maiores = inteiro >= 1000
+        texto[maiores] = np.char.add(np.char.add(".", _GRUPO[inteiro[maiores] % 1000]), texto[maiores])
+        inteiro[maiores] //= 1000
+    texto = np.char.add(np.char.add(_GRUPO_INICIAL[inteiro], texto), ",")
+    texto = np.char.add(texto, _CENTAVOS[centavos % 100])
+    texto = np.where(validos & (valores < 0), np.char.add("-", texto), texto)
+    if simbolo:
+        texto = np.char.add("R$ ", texto)
+    
+    if serie is not None:
+        return pd.Series(texto, index=serie.index, name=serie.name)
+    return texto
+
+# Converte entradas não numéricas (None, textos como "R$ 1.234,56") como o formatador escalar faz
+def formatar_moeda_para_numero(valor):
+    try:
+        if valor is None:
+            return np.nan
+        if isinstance(valor, str):
+            return float(re.sub(r'[^\d,]', '', valor).replace(',', '.'))
+        return float(valor)
+    except (TypeError, ValueError):
+        return np.nan
+
+# Formata um array de datas como dd/mm/aaaa de uma só vez (sem strftime por linha).
+# Datas ausentes (NaT) viram texto vazio.
+def formatar_datas(datas):
+    datas = np.asarray(datas, dtype='datetime64[D]')
+    iso = np.datetime_as_string(datas.ravel(), unit='D').astype('U10')
+    caracteres = iso.view('U1').reshape(-1, 10)[:, [8, 9, 4, 5, 6, 7, 0, 1, 2, 3]].copy()
+    caracteres[:, [2, 5]] = '/'
+    texto = caracteres.view('U10').reshape(datas.shape)
+    return np.where(np.isnat(datas), '', texto)
+
+def formatar_data(data):
+    if data is None or data == "":
+        return ""
+    return str(formatar_datas(data))
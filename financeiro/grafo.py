@@ -0,0 +1,247 @@
+import logging
+from collections import Counter
+
+import pandas as pd
+
+from .cache import cache_simulacoes, normalizar
+from .cet import calcular_cet
+from .cronograma import (
+    MENSAGEM_ERRO_CRONOGRAMA, atualizar_baloes, calcular_comissoes, calcular_taxas, datas_cronograma,
+    eventos_cronograma, fluxo_cronograma, linhas_cronograma
+)
+from .exportacao import impressao_digital
+from .formatacao import formatar_datas, formatar_moedas
+from .tabela import Cronograma
+from .simulacao import (
+    data_para_datetime, entrada_financiamento, tipo_balao_modalidade, valores_financiamento
+)
+
+# Simulação como grafo de etapas com dependências explícitas. Cada etapa guarda seu resultado
+# e só é recalculada quando uma entrada (ou etapa) da qual depende muda: alterar as comissões
+# recalcula apenas "comissoes", alterar o dia de vencimento refaz "entrada", "datas" e o que vem depois,
+# e o fluxo de pagamentos é reaproveitado.
+#
+#   grafo = GrafoSimulacao(valor_total=500000, entrada=50000, taxa_mensal=0.79, modalidade="mensal", qtd_parcelas=120)
+#   grafo.resultado()
+#   grafo.atualizar(comissao_imobiliaria=4.0)
+#   grafo.resultado()   # só "comissoes" é executada
+#
+# As etapas mais caras (ETAPAS_COMPARTILHADAS) também ficam no cache do processo, com chave pelas
+# entradas normalizadas das quais dependem: outra sessão que simula o mesmo imóvel e prazo
+# reaproveita o fluxo, o cronograma, o CET e as tabelas de exibição sem executá-los.
+logger = logging.getLogger(__name__)
+
+ENTRADAS_PADRAO = {
+    'valor_total': 0.0,
+    'entrada': 0.0,
+    'taxa_mensal': 0.0,
+    'modalidade': "mensal",
+    'qtd_parcelas': 0,
+    'valor_parcela': 0.0,
+    'valor_balao': 0.0,
+    'tipo_balao': None,
+    'qtd_parcelas_entrada': 1,
+    'data_entrada': None,
+    'dia_vencimento': None,
+    'comissao_coordenacao': 0.5,
+    'comissao_imobiliaria': 5.0,
+    'data_primeiro_balao': None,
+    'exato': False
+}
+
+def _etapa_taxas(e, obter):
+    return calcular_taxas(e['taxa_mensal'])
+
+def _etapa_comissoes(e, obter):
+    return calcular_comissoes(e['valor_total'], e['comissao_coordenacao'], e['comissao_imobiliaria'])
+
+def _etapa_valores(e, obter):
+    tipo_balao = tipo_balao_modalidade(e['modalidade'], e['tipo_balao'])
+    return valores_financiamento(e['valor_total'], e['entrada'], e['modalidade'], e['qtd_parcelas'],
+                                 e['valor_parcela'], e['valor_balao'], tipo_balao, obter('taxas'))
+
+def _etapa_entrada(e, obter):
+    data_entrada = data_para_datetime(e['data_entrada'])
+    dia_vencimento = e['dia_vencimento'] or data_entrada.day
+    cronograma_entrada, data_primeira_parcela = entrada_financiamento(
+        e['entrada'], e['qtd_parcelas_entrada'], data_entrada, dia_vencimento
+    )
+    return {
+        'cronograma_entrada': cronograma_entrada,
+        'data_entrada': data_entrada,
+        'data_primeira_parcela': data_primeira_parcela,
+        'dia_vencimento': dia_vencimento
+    }
+
+# Estrutura dos pagamentos (quais eventos, em que mês, a que taxa): não depende dos valores
+def _etapa_eventos(e, obter):
+    tipo_balao = tipo_balao_modalidade(e['modalidade'], e['tipo_balao'])
+    qtd_parcelas = int(e['qtd_parcelas'])
+    qtd_baloes = atualizar_baloes(e['modalidade'], qtd_parcelas, tipo_balao)
+    return eventos_cronograma(e['modalidade'], tipo_balao, qtd_parcelas, qtd_baloes, obter('taxas'))
+
+def _etapa_fluxo(e, obter):
+    valores = obter('valores')
+    return fluxo_cronograma(valores['valor_financiado'], valores['valor_parcela'], valores['valor_balao'],
+                            *obter('eventos'), e['exato'])
+
+# As datas só dependem da ordem dos eventos (parcelas antes dos balões), não dos valores pagos
+def _etapa_datas(e, obter):
+    e_balao, _, meses, _ = obter('eventos')
+    ordem = e_balao.argsort(kind='stable')
+    entrada = obter('entrada')
+    data_primeiro_balao = e['data_primeiro_balao'] if e['modalidade'] == "mensal + balão" else None
+    return datas_cronograma(e_balao[ordem], meses[ordem], e['modalidade'], entrada['data_primeira_parcela'],
+                            entrada['dia_vencimento'], data_primeiro_balao)
+
+def _etapa_cronograma(e, obter):
+    valor_financiado = obter('valores')['valor_financiado']
+    try:
+        e_balao, numeros, _, valores = obter('fluxo')
+        return linhas_cronograma(valor_financiado, obter('taxas')['mensal'], e_balao, numeros, valores, *obter('datas'),
+                                 e['exato'])
+    except Exception as erro:
+        logger.error(f"Erro ao gerar cronograma: {str(erro)}")
+        return Cronograma.vazio(erro=MENSAGEM_ERRO_CRONOGRAMA)
+
+def _etapa_cet(e, obter):
+    return calcular_cet({
+        'cronograma': obter('cronograma'),
+        'valor_financiado': obter('valores')['valor_financiado'],
+        'data_primeira_parcela': obter('entrada')['data_primeira_parcela'],
+        'taxas': obter('taxas')
+    })
+
+# CET com a entrada parcelada no fluxo (fluxo_com_entrada); sem parcelamento da entrada não é exibido
+def _etapa_cet_entrada(e, obter):
+    entrada = obter('entrada')
+    if not entrada['cronograma_entrada']:
+        return {'cet_anual': None, 'cet_mensal': None}
+    return calcular_cet({
+        'cronograma': obter('cronograma'),
+        'valor_total': e['valor_total'],
+        'entrada': e['entrada'],
+        'data_entrada': entrada['data_entrada'],
+        'cronograma_entrada': entrada['cronograma_entrada'],
+        'taxas': obter('taxas')
+    }, incluir_entrada=True)
+
+# Tabelas formatadas para exibição (datas dd/mm/aaaa e valores em R$)
+def _etapa_exibicao(e, obter):
+    cronograma = obter('cronograma')
+    df_cronograma = cronograma.com_colunas(
+        Data_Vencimento=formatar_datas(cronograma['Data_Vencimento']),
+        **{coluna: formatar_moedas(cronograma[coluna]) for coluna in ['Valor', 'Valor_Presente', 'Desconto_Aplicado']}
+    ).to_pandas()
+
+    entrada = obter('entrada')['cronograma_entrada']
+    df_entrada = pd.DataFrame({
+        'Item': entrada['Item'],
+        'Data_Vencimento': formatar_datas(entrada['Data_Vencimento']),
+        'Valor': formatar_moedas(entrada['Valor'])
+    })
+    return {'cronograma': df_cronograma, 'entrada': df_entrada}
+
+# etapa -> (função, entradas usadas, etapas das quais depende)
+ETAPAS = {
+    'taxas': (_etapa_taxas, ('taxa_mensal',), ()),
+    'comissoes': (_etapa_comissoes, ('valor_total', 'comissao_coordenacao', 'comissao_imobiliaria'), ()),
+    'valores': (_etapa_valores, ('valor_total', 'entrada', 'modalidade', 'qtd_parcelas', 'valor_parcela',
+                                 'valor_balao', 'tipo_balao'), ('taxas',)),
+    'entrada': (_etapa_entrada, ('entrada', 'qtd_parcelas_entrada', 'data_entrada', 'dia_vencimento'), ()),
+    'eventos': (_etapa_eventos, ('modalidade', 'tipo_balao', 'qtd_parcelas'), ('taxas',)),
+    'fluxo': (_etapa_fluxo, ('exato',), ('valores', 'eventos')),
+    'datas': (_etapa_datas, ('modalidade', 'data_primeiro_balao'), ('eventos', 'entrada')),
+    'cronograma': (_etapa_cronograma, ('exato',), ('fluxo', 'datas', 'valores', 'taxas')),
+    'cet': (_etapa_cet, (), ('cronograma', 'valores', 'entrada', 'taxas')),
+    'cet_entrada': (_etapa_cet_entrada, ('valor_total', 'entrada'), ('cronograma', 'entrada', 'taxas')),
+    'exibicao': (_etapa_exibicao, (), ('cronograma', 'entrada'))
+}
+
+ETAPAS_COMPARTILHADAS = ('fluxo', 'cronograma', 'cet', 'cet_entrada', 'exibicao')
+
+# Entradas das quais cada etapa depende, direta ou indiretamente
+def _entradas_etapas():
+    entradas = {}
+    for etapa, (_, usadas, dependencias) in ETAPAS.items():
+        entradas[etapa] = set(usadas).union(*(entradas[dependencia] for dependencia in dependencias))
+    return {etapa: tuple(sorted(nomes)) for etapa, nomes in entradas.items()}
+
+ENTRADAS_ETAPAS = _entradas_etapas()
+
+class GrafoSimulacao:
+    def __init__(self, cache=None, **entradas):
+        self.entradas = dict(ENTRADAS_PADRAO)
+        self._chaves = {nome: normalizar(valor) for nome, valor in self.entradas.items()}
+        self._resultados = {}
+        self._cache = cache_simulacoes if cache is None else cache
+        self.execucoes = Counter()
+        self.atualizar(**entradas)
+
+    # Altera entradas e invalida apenas as etapas que dependem (direta ou indiretamente) delas.
+    # Retorna o conjunto de etapas invalidadas.
+    def atualizar(self, **entradas):
+        desconhecidas = set(entradas) - set(ENTRADAS_PADRAO)
+        if desconhecidas:
+            raise ValueError(f"Parâmetros desconhecidos: {', '.join(sorted(desconhecidas))}")
+
+        alteradas = set()
+        for nome, valor in entradas.items():
+            chave = normalizar(valor)
+            if chave != self._chaves[nome]:
+                self.entradas[nome] = valor
+                self._chaves[nome] = chave
+                alteradas.add(nome)
+
+        invalidas = set()
+        for etapa, (_, usadas, dependencias) in ETAPAS.items():  # ETAPAS está em ordem topológica
+            if alteradas.intersection(usadas) or invalidas.intersection(dependencias):
+                invalidas.add(etapa)
+        for etapa in invalidas:
+            self._resultados.pop(etapa, None)
+        return invalidas
+
+    def obter(self, etapa):
+        if etapa not in self._resultados:
+            chave = self._chave_compartilhada(etapa)
+            encontrado, resultado = self._cache.obter(chave) if chave else (False, None)
+            if not encontrado:
+                resultado = ETAPAS[etapa][0](self.entradas, self.obter)
+                self.execucoes[etapa] += 1
+                if chave:
+                    self._cache.guardar(chave, resultado)
+            self._resultados[etapa] = resultado
+        return self._resultados[etapa]
+
+    # Chave da etapa no cache do processo, ou None se ela não é compartilhada. Sem data de entrada
+    # a simulação parte de hoje, e o resultado não é reaproveitado entre sessões.
+    def _chave_compartilhada(self, etapa):
+        nomes = ENTRADAS_ETAPAS[etapa]
+        if etapa not in ETAPAS_COMPARTILHADAS or ('data_entrada' in nomes and self.entradas['data_entrada'] is None):
+            return None
+        return ('grafo', etapa, tuple((nome, self._chaves[nome]) for nome in nomes))
+
+    # Identifica a simulação atual (chave das exportações sob demanda)
+    def impressao_digital(self):
+        return impressao_digital(self._chaves)
+
+    # Mesmo formato de simular_financiamento
+    def resultado(self):
+        valores = self.obter('valores')
+        entrada = self.obter('entrada')
+        return {
+            'valor_total': self.entradas['valor_total'],
+            'entrada': self.entradas['entrada'],
+            'qtd_parcelas_entrada': self.entradas['qtd_parcelas_entrada'],
+            'taxa_mensal': self.entradas['taxa_mensal'],
+            'modalidade': self.entradas['modalidade'],
+            'tipo_balao': tipo_balao_modalidade(self.entradas['modalidade'], self.entradas['tipo_balao']),
+            'taxas': self.obter('taxas'),
+            'comissoes': self.obter('comissoes'),
+            **valores,
+            'data_entrada': entrada['data_entrada'],
+            'data_primeira_parcela': entrada['data_primeira_parcela'],
+            'cronograma_entrada': entrada['cronograma_entrada'],
+            'cronograma': self.obter('cronograma'),
+            'cet': self.obter('cet')
+        }
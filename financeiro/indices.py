@@ -0,0 +1,219 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .cache import CacheSimulacao
+from .calendario import para_datetime64
+
+# Correção monetária por índices (IPCA, INCC, TR, IGP-M...). As séries mensais (variação em % no mês)
+# vêm de um CSV ou Parquet local com uma coluna de datas e uma coluna por índice, e ficam gravadas
+# num .npy ao lado do arquivo (ou em diretorio_cache), aberto com memmap: uma matriz mês x índice
+# com os números-índice acumulados N(t) = (1 + r(1))...(1 + r(t)), indexada pela posição do mês
+# (mês inicial + t). O fator de correção entre dois meses é N(fim) / N(inicio), sem percorrer a série,
+# e os vetores de fatores por (índice, mês base, horizonte) ficam num cache LRU.
+#
+# Depois do último mês com dado, a série é projetada com uma taxa mensal constante (padrão: média
+# geométrica dos últimos 12 meses, ou a informada em "projecao").
+#
+#   series = carregar_indices("indices.csv")
+#   corrigir_tabela(calcular_price(300000, 0.9, 360)['parcelas'], series, "INCC", "2025-01")
+
+SUFIXO_CACHE = ".indices.npy"
+MESES_PROJECAO = 12
+
+# Números de uma coluna lida como texto, aceitando vírgula decimal (formato das séries do Banco Central)
+def ler_numeros(serie):
+    if serie.dtype.kind in 'biuf':
+        return serie.astype(float)
+    texto = serie.astype(str)
+    if texto.str.contains(",", regex=False).any():
+        texto = texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(texto, errors="coerce")
+
+# Variações mensais (%) por índice, uma linha por mês (índice datetime64[M] contínuo, NaN onde falta dado)
+def ler_series(caminho, coluna_data=None):
+    if os.path.splitext(caminho)[1].lower() in (".parquet", ".pq"):
+        tabela = pd.read_parquet(caminho)
+    else:
+        tabela = pd.read_csv(caminho, sep=None, engine="python")
+    coluna_data = coluna_data or tabela.columns[0]
+    datas = tabela[coluna_data]
+    if datas.dtype.kind != 'M':
+        datas = pd.to_datetime(datas.astype(str), dayfirst=True, format="mixed")
+    meses = datas.to_numpy(dtype='datetime64[M]')
+    if len(np.unique(meses)) != len(meses):
+        raise ValueError("A série de índices tem meses repetidos")
+
+    valores = tabela.drop(columns=[coluna_data]).apply(ler_numeros)
+    valores.index = meses
+    todos = np.arange(meses.min(), meses.max() + 1)
+    return valores.reindex(todos).sort_index()
+
+# Números-índice acumulados de cada coluna, NaN antes do primeiro dado; meses sem dado no meio da
+# série não são aceitos (não há como acumular a correção através deles)
+def _acumular(variacoes):
+    fatores = 1 + variacoes / 100
+    validos = np.isfinite(fatores)
+    niveis = np.full(fatores.shape, np.nan)
+    for coluna in range(fatores.shape[1]):
+        meses = np.flatnonzero(validos[:, coluna])
+        if len(meses) == 0:
+            continue
+        if len(meses) != meses[-1] - meses[0] + 1:
+            raise ValueError("A série de índices tem meses sem dado")
+        niveis[meses, coluna] = np.cumprod(fatores[meses, coluna])
+    return niveis
+
+# Grava a matriz de números-índice e os metadados (mês inicial, nomes, arquivo de origem)
+def _gravar_cache(caminho_cache, niveis, inicio, nomes, origem):
+    temporario = caminho_cache + ".tmp.npy"
+    np.save(temporario, niveis)
+    os.replace(temporario, caminho_cache)
+    with open(caminho_cache + ".json", "w", encoding="utf-8") as arquivo:
+        json.dump({'inicio': str(inicio), 'nomes': nomes, 'origem': origem}, arquivo)
+
+def _assinatura(caminho):
+    estado = os.stat(caminho)
+    return [estado.st_mtime_ns, estado.st_size]
+
+class SeriesIndices:
+    def __init__(self, niveis, inicio, nomes, projecao=None, max_itens=4096):
+        self.niveis = niveis
+        self.inicio = np.datetime64(inicio, 'M')
+        self.nomes = list(nomes)
+        self._colunas = {nome: posicao for posicao, nome in enumerate(self.nomes)}
+        validos = np.isfinite(np.asarray(niveis))
+        self._primeiros = validos.argmax(axis=0)
+        self._ultimos = len(validos) - 1 - validos[::-1].argmax(axis=0)
+        self._projecao = {nome: self._taxa_recente(nome) for nome in self.nomes if validos[:, self._colunas[nome]].any()}
+        self._projecao.update(projecao or {})
+        self._cache = CacheSimulacao(max_itens=max_itens, ttl=float("inf"))
+
+    # Média geométrica das últimas variações mensais (% a.m.)
+    def _taxa_recente(self, indice):
+        coluna = self._colunas[indice]
+        ultimo, primeiro = self._ultimos[coluna], self._primeiros[coluna]
+        meses = min(MESES_PROJECAO, ultimo - primeiro)
+        if meses == 0:
+            return 0.0
+        return float((self.niveis[ultimo, coluna] / self.niveis[ultimo - meses, coluna]) ** (1 / meses) - 1) * 100
+
+    def _coluna(self, indice):
+        if indice not in self._colunas:
+            raise ValueError(f"Índice desconhecido: {indice}")
+        return self._colunas[indice]
+
+    # Posição do mês de cada data na série
+    def posicao(self, datas):
+        meses = para_datetime64(datas).astype('datetime64[M]')
+        return (meses - self.inicio).astype(np.int64)
+
+    # Números-índice nas posições pedidas, projetados depois do último mês com dado
+    def _niveis(self, indice, posicoes):
+        coluna = self._coluna(indice)
+        posicoes = np.asarray(posicoes, dtype=np.int64)
+        primeiro, ultimo = self._primeiros[coluna], self._ultimos[coluna]
+        if indice not in self._projecao:
+            raise ValueError(f"Índice sem dados: {indice}")
+        if np.any(posicoes < primeiro):
+            raise ValueError(f"{indice} só tem dados a partir de {self.inicio + primeiro}")
+        base = np.asarray(self.niveis[np.minimum(posicoes, ultimo), coluna], dtype=float)
+        excedentes = np.maximum(posicoes - ultimo, 0)
+        return base * np.power(1 + self._projecao[indice] / 100, excedentes)
+
+    # Fatores de correção do mês base até cada um dos "horizonte" meses seguintes (posição 0 = 1),
+    # com a defasagem usual dos contratos (ex.: INCC do mês anterior, defasagem=1). O vetor é
+    # compartilhado pelo cache: somente leitura.
+    def fatores(self, indice, data_base, horizonte, defasagem=0):
+        base = int(self.posicao(data_base)) - defasagem
+        chave = (indice, base, int(horizonte))
+        encontrado, fatores = self._cache.obter(chave)
+        if not encontrado:
+            niveis = self._niveis(indice, base + np.arange(int(horizonte) + 1))
+            fatores = niveis / niveis[0]
+            fatores.setflags(write=False)
+            self._cache.guardar(chave, fatores)
+        return fatores
+
+    # Variações mensais (%) de um índice, com a projeção depois do último dado
+    def variacoes(self, indice, data_inicial, meses):
+        posicoes = self.posicao(data_inicial) + np.arange(-1, int(meses))
+        niveis = self._niveis(indice, posicoes)
+        return pd.Series((niveis[1:] / niveis[:-1] - 1) * 100, index=self.inicio + posicoes[1:], name=indice)
+
+    def estatisticas(self):
+        return self._cache.estatisticas()
+
+_abertas = {}
+
+# Abre as séries de um CSV/Parquet, convertendo para o .npy só quando o arquivo de origem mudou.
+# Cada arquivo é aberto uma vez por processo, e o cache de fatores é reaproveitado entre chamadas.
+def carregar_indices(caminho, coluna_data=None, diretorio_cache=None, projecao=None):
+    caminho = os.path.abspath(caminho)
+    nome_cache = os.path.basename(caminho) + SUFIXO_CACHE
+    if diretorio_cache:
+        os.makedirs(diretorio_cache, exist_ok=True)
+    caminho_cache = os.path.join(diretorio_cache or os.path.dirname(caminho), nome_cache)
+    origem = _assinatura(caminho)
+    chave = (caminho_cache, coluna_data, json.dumps(projecao, sort_keys=True))
+    aberta = _abertas.get(chave)
+    if aberta is not None and aberta[0] == origem:
+        return aberta[1]
+
+    metadados = None
+    if os.path.exists(caminho_cache + ".json"):
+        with open(caminho_cache + ".json", encoding="utf-8") as arquivo:
+            metadados = json.load(arquivo)
+    if metadados is None or metadados['origem'] != origem or not os.path.exists(caminho_cache):
+        variacoes = ler_series(caminho, coluna_data)
+        metadados = {'inicio': str(variacoes.index[0]), 'nomes': [str(nome) for nome in variacoes.columns], 'origem': origem}
+        _gravar_cache(caminho_cache, _acumular(variacoes.to_numpy(dtype=float)), metadados['inicio'],
+                      metadados['nomes'], origem)
+
+    series = SeriesIndices(np.load(caminho_cache, mmap_mode="r"), metadados['inicio'], metadados['nomes'], projecao)
+    _abertas[chave] = (origem, series)
+    return series
+
+COLUNAS_CORRIGIDAS = ('Prestação', 'Juros', 'Amortização', 'Saldo Devedor')
+
+# Tabela Price/SAC corrigida: cada linha multiplicada pelo fator do mês base até o seu período
+# (parcelas e saldo crescem com o índice; a taxa de juros passa a ser real, acima do índice)
+def corrigir_tabela(tabela, series, indice, data_base, defasagem=0, colunas=COLUNAS_CORRIGIDAS):
+    periodos = tabela['Período'].to_numpy(dtype=np.int64)
+    fatores = series.fatores(indice, data_base, periodos.max(initial=0), defasagem)[periodos]
+    corrigida = tabela.assign(**{coluna: np.round(tabela[coluna].to_numpy() * fatores, 2) for coluna in colunas})
+    corrigida['Fator de Correção'] = np.round(fatores, 8)
+    return corrigida
+
+# Carteira em formato longo (amortizar_carteira(..., cronogramas=True)) corrigida, com um mês base
+# por contrato. Os fatores vêm de um vetor por mês base distinto (cacheado), sem reler a série por contrato.
+def corrigir_carteira(tabela, series, indice, datas_base, defasagem=0, colunas=COLUNAS_CORRIGIDAS):
+    contratos = tabela['Contrato'].to_numpy(dtype=np.int64)
+    periodos = tabela['Período'].to_numpy(dtype=np.int64)
+    bases, base_contrato = np.unique(series.posicao(datas_base), return_inverse=True)
+    # Um mês base para todos os contratos ou um por contrato
+    base_contrato = np.broadcast_to(base_contrato.ravel(), (contratos.max(initial=-1) + 1,))
+    horizonte = int(periodos.max(initial=0))
+    matriz = np.stack([series.fatores(indice, series.inicio + base, horizonte, defasagem) for base in bases])
+    fatores = matriz[base_contrato[contratos], periodos]
+    corrigida = tabela.assign(**{coluna: np.round(tabela[coluna].to_numpy() * fatores, 2) for coluna in colunas})
+    corrigida['Fator de Correção'] = np.round(fatores, 8)
+    return corrigida
+
+# Cronograma de gerar_cronograma com o valor de cada vencimento corrigido do mês base até o mês do
+# vencimento (colunas Fator_Correcao e Valor_Corrigido, e o total dos valores corrigidos)
+def corrigir_cronograma(cronograma, series, indice, data_base, defasagem=0):
+    if not cronograma:
+        return cronograma
+    meses = series.posicao(cronograma['Data_Vencimento']) - series.posicao(data_base)
+    if np.any(meses < 0):
+        raise ValueError("Há vencimentos anteriores ao mês base da correção")
+    fatores = series.fatores(indice, data_base, meses.max(), defasagem)[meses]
+    valores = cronograma['Valor'] * fatores
+    return cronograma.com_colunas(
+        totais={'Valor_Corrigido': float(valores.sum())},
+        Fator_Correcao=np.round(fatores, 8),
+        Valor_Corrigido=valores
+    )
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+# --- Simulação de Investimentos ---
+# Motor único para N produtos de uma vez. As taxas de cada produto formam uma matriz produto x mês
+# e o saldo sai de produtos acumulados (cumprod), sem laço por mês nem por produto:
+#   F(t) = (1 + i1)...(1 + it)   |   saldo(t) = F(t) * (valor + soma dos fluxos c(j) / F(j), j <= t)
+#
+# Tipos de produto (dict com nome, tipo, taxa e, opcionalmente, isento_ir, aporte_mensal, resgate_mensal):
+#   "prefixado": taxa em % ao mês
+#   "cdi":       taxa em % do CDI (o CDI, em % ao ano, é comum a todos os produtos)
+#   "ipca":      taxa = spread em % ao ano sobre o IPCA (também em % ao ano)
+# CDI, IPCA, aportes e resgates aceitam um valor fixo ou um valor por mês.
+#
+#   comparar_investimentos(100000, 36, [
+#       {'nome': "Poupança", 'tipo': "prefixado", 'taxa': 0.5, 'isento_ir': True},
+#       {'nome': "CDB 110% CDI", 'tipo': "cdi", 'taxa': 110},
+#       {'nome': "Tesouro IPCA+ 6%", 'tipo': "ipca", 'taxa': 6.0}
+#   ], aporte_mensal=1000, cdi=10.5, ipca=4.5)
+
+TIPOS_PRODUTO = ("prefixado", "cdi", "ipca")
+
+# Tabela regressiva do IR: (prazo máximo em meses de 30 dias, alíquota %) — até 180, 360 e 720 dias;
+# acima disso, ALIQUOTA_IR_MINIMA
+FAIXAS_IR = ((6, 22.5), (12, 20.0), (24, 17.5))
+ALIQUOTA_IR_MINIMA = 15.0
+
+def _serie_mensal(valor, prazo_meses, nome):
+    serie = np.asarray(valor, dtype=float)
+    if serie.ndim == 1 and len(serie) != prazo_meses:
+        raise ValueError(f"{nome} deve ter um valor por mês ({prazo_meses})")
+    return np.broadcast_to(serie, (prazo_meses,))
+
+def _anual_para_mensal(taxa_anual):
+    return np.expm1(np.log1p(np.asarray(taxa_anual) / 100) / 12)
+
+# Matriz produto x mês de taxas (fração ao mês)
+def _taxas_produtos(produtos, prazo_meses, cdi, ipca):
+    cdi_mensal = _anual_para_mensal(_serie_mensal(cdi, prazo_meses, "CDI"))
+    ipca_mensal = _anual_para_mensal(_serie_mensal(ipca, prazo_meses, "IPCA"))
+    taxas = np.empty((len(produtos), prazo_meses))
+    for linha, produto in enumerate(produtos):
+        tipo = produto.get('tipo', "prefixado")
+        if tipo == "prefixado":
+            taxas[linha] = produto['taxa'] / 100
+        elif tipo == "cdi":
+            taxas[linha] = cdi_mensal * (produto['taxa'] / 100)
+        elif tipo == "ipca":
+            taxas[linha] = (1 + ipca_mensal) * (1 + _anual_para_mensal(produto['taxa'])) - 1
+        else:
+            raise ValueError(f"Tipo de produto desconhecido: {tipo}")
+    return taxas
+
+# IR devido se tudo fosse resgatado no mês t, somando cada aplicação (lote) com a alíquota do seu
+# prazo. Como a alíquota é uma escada, soma(aliquota(t - j) * z(j)) sai de somas acumuladas:
+# 15% sobre todos os lotes + 2,5 p.p. sobre os lotes com até 24, 12 e 6 meses.
+# Resgates mensais entram como lotes negativos do mês em que ocorrem (aproximação).
+def _imposto_resgate(acumulado, ganho_fator, ganho_fixo):
+    def soma_ponderada(z):
+        soma = np.cumsum(z, axis=1)
+        total = soma * ALIQUOTA_IR_MINIMA
+        aliquotas = [aliquota for _, aliquota in FAIXAS_IR] + [ALIQUOTA_IR_MINIMA]
+        for (limite, aliquota), seguinte in zip(FAIXAS_IR, aliquotas[1:]):
+            anteriores = np.zeros_like(soma)
+            anteriores[:, limite + 1:] = soma[:, :-(limite + 1)]
+            total += (aliquota - seguinte) * (soma - anteriores)
+        return total / 100
+    return np.maximum(acumulado * soma_ponderada(ganho_fator) - soma_ponderada(ganho_fixo), 0)
+
+# Saldo de cada produto mês a mês: coluna 0 = aplicação inicial (mês 0); fluxos (aportes - resgates)
+# no fim de cada mês
+def _saldos(valor, fatores, fluxos):
+    acumulado = np.cumprod(np.hstack([np.ones((len(fatores), 1)), fatores]), axis=1)
+    # Sem fluxos, o saldo é exatamente valor * (1 + i1) * (1 + i2)..., como na capitalização mês a mês
+    saldo = np.cumprod(np.hstack([np.full((len(fatores), 1), float(valor)), fatores]), axis=1)
+    saldo += acumulado * np.cumsum(np.hstack([np.zeros((len(fatores), 1)), fluxos[:, 1:] / acumulado[:, 1:]]), axis=1)
+    return acumulado, saldo
+
+# Resgates limitados ao saldo disponível (como a quitação em cronograma._valores_eventos): no primeiro
+# mês em que o saldo ficaria negativo, o resgate leva só o que há; a partir daí o produto fica zerado,
+# sem aportes nem resgates. Devolve os resgates ajustados e o mês em que o saldo zerou (ou None).
+def _limitar_resgates(saldo, fatores, aportes, resgates):
+    esgotado = [None] * len(saldo)
+    for linha in np.flatnonzero((saldo[:, 1:] < 0).any(axis=1)):
+        mes = 1 + np.argmax(saldo[linha, 1:] < 0)
+        resgates[linha, mes] = saldo[linha, mes - 1] * fatores[linha, mes - 1] + aportes[linha, mes]
+        aportes[linha, mes + 1:] = 0
+        resgates[linha, mes + 1:] = 0
+        esgotado[linha] = mes
+    return resgates, esgotado
+
+def comparar_investimentos(valor, prazo_meses, produtos, aporte_mensal=0.0, resgate_mensal=0.0, cdi=10.5, ipca=4.5):
+    prazo_meses = int(prazo_meses)
+    if not produtos:
+        raise ValueError("Informe ao menos um produto")
+    nomes = [str(produto.get('nome') or f"Produto {n + 1}") for n, produto in enumerate(produtos)]
+    isentos = np.array([bool(produto.get('isento_ir', False)) for produto in produtos])
+
+    fatores = 1 + _taxas_produtos(produtos, prazo_meses, cdi, ipca)
+    aportes = np.zeros((len(produtos), prazo_meses + 1))
+    resgates = np.zeros((len(produtos), prazo_meses + 1))
+    for linha, produto in enumerate(produtos):
+        aportes[linha, 1:] = _serie_mensal(produto.get('aporte_mensal', aporte_mensal), prazo_meses, "Aporte mensal")
+        resgates[linha, 1:] = _serie_mensal(produto.get('resgate_mensal', resgate_mensal), prazo_meses, "Resgate mensal")
+    aportes[:, 0] = valor
+
+    _, saldo = _saldos(valor, fatores, aportes - resgates)
+    resgates, esgotado = _limitar_resgates(saldo, fatores, aportes, resgates)
+    fluxos = aportes - resgates
+    acumulado, saldo = _saldos(valor, fatores, fluxos)
+    for linha, mes in enumerate(esgotado):
+        if mes is not None:
+            saldo[linha, mes:] = 0
+    # Aplicado = valor inicial + aportes (bruto); o rendimento conta o que já foi resgatado
+    aplicado = np.cumsum(aportes, axis=1)
+    resgatado = np.cumsum(resgates, axis=1)
+    rendimento = saldo + resgatado - aplicado
+
+    imposto = _imposto_resgate(acumulado, fluxos / acumulado, fluxos)
+    imposto[isentos] = 0
+    imposto[saldo <= 0] = 0
+    liquido = saldo - imposto
+
+    meses = slice(1, None)
+    historico = pd.DataFrame({
+        'Produto': np.repeat(nomes, prazo_meses),
+        'Mês': np.tile(np.arange(1, prazo_meses + 1), len(produtos)),
+        'Valor': np.round(saldo[:, meses], 2).ravel(),
+        'Aplicado': np.round(aplicado[:, meses], 2).ravel(),
+        'Resgatado': np.round(resgatado[:, meses], 2).ravel(),
+        'Rendimento': np.round(rendimento[:, meses], 2).ravel(),
+        'Imposto': np.round(imposto[:, meses], 2).ravel(),
+        'Valor Líquido': np.round(liquido[:, meses], 2).ravel()
+    })
+    resumo = pd.DataFrame({
+        'produto': nomes,
+        'valor_final': np.round(saldo[:, -1], 2),
+        'total_aplicado': np.round(aplicado[:, -1], 2),
+        'total_resgatado': np.round(resgatado[:, -1], 2),
+        'rendimento_bruto': np.round(rendimento[:, -1], 2),
+        'imposto': np.round(imposto[:, -1], 2),
+        'valor_liquido': np.round(liquido[:, -1], 2),
+        'rendimento_liquido': np.round(rendimento[:, -1] - imposto[:, -1], 2)
+    })
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resumo['rentabilidade_liquida'] = np.round(resumo['rendimento_liquido'] / resumo['total_aplicado'] * 100, 2)
+    return {'resumo': resumo, 'historico': historico}
+
+# Aplicação única a uma taxa fixa mensal, sem IR. O histórico é o DataFrame colunar de
+# comparar_investimentos (Mês, Valor, Rendimento), sem conversão para lista de dicts.
+def _simular_taxa_fixa(valor, prazo_meses, taxa):
+    produto = {'nome': "", 'tipo': "prefixado", 'taxa': taxa, 'isento_ir': True}
+    resultado = comparar_investimentos(valor, prazo_meses, [produto])
+    final = resultado['resumo'].iloc[0]
+    return {
+        'valor_inicial': valor,
+        'valor_final': float(final['valor_final']),
+        'rendimento_total': float(final['rendimento_bruto']),
+        'historico': resultado['historico'][['Mês', 'Valor', 'Rendimento']]
+    }
+
+def simular_poupanca(valor, prazo_meses, taxa=0.5):
+    return _simular_taxa_fixa(valor, prazo_meses, taxa)
+
+def simular_imobiliario(valor, prazo_meses, taxa=0.7):
+    return _simular_taxa_fixa(valor, prazo_meses, taxa)
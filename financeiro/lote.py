@@ -0,0 +1,200 @@
+import argparse
+import inspect
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .simulacao import parametros_simulacao, simular_financiamento
+
+# Simulação em lote: lê as entradas de um CSV ou Parquet em blocos, calcula os cronogramas
+# num pool de processos e grava o resultado bloco a bloco (CSV ou Parquet), com memória limitada
+# pelo tamanho do bloco e pelo número de blocos em andamento.
+#
+#   python -m financeiro.lote entradas.parquet cronogramas.parquet --resumo resumo.csv --processos 8
+#
+# Colunas de entrada: os parâmetros de simular_financiamento (valor_total, entrada, taxa_mensal,
+# modalidade, qtd_parcelas, tipo_balao, data_entrada, comissões...) e, opcionalmente, "id".
+# Outras colunas são ignoradas.
+logger = logging.getLogger(__name__)
+
+COLUNAS_CRONOGRAMA = ['id', 'Item', 'Tipo', 'Data_Vencimento', 'Dias', 'Valor', 'Valor_Presente', 'Desconto_Aplicado']
+COLUNAS_RESUMO = [
+    'id', 'valor_financiado', 'valor_parcela', 'valor_balao', 'qtd_parcelas', 'qtd_baloes',
+    'data_primeira_parcela', 'total_pago', 'valor_presente', 'comissoes', 'cet_anual', 'erro'
+]
+# O id é sempre texto, para que o esquema não dependa do que cada bloco contém
+TIPOS_CRONOGRAMA = {
+    'id': 'string', 'Item': 'string', 'Tipo': 'string', 'Data_Vencimento': 'datetime64[ns]', 'Dias': 'int64',
+    'Valor': 'float64', 'Valor_Presente': 'float64', 'Desconto_Aplicado': 'float64'
+}
+TIPOS_RESUMO = {
+    'id': 'string', 'valor_financiado': 'float64', 'valor_parcela': 'float64', 'valor_balao': 'float64',
+    'qtd_parcelas': 'Int64', 'qtd_baloes': 'Int64', 'data_primeira_parcela': 'datetime64[ns]',
+    'total_pago': 'float64', 'valor_presente': 'float64', 'comissoes': 'float64', 'cet_anual': 'float64', 'erro': 'string'
+}
+COLUNAS_ENTRADA = tuple(inspect.signature(simular_financiamento).parameters)
+
+def _formato(caminho):
+    return "parquet" if os.path.splitext(caminho)[1].lower() in (".parquet", ".pq") else "csv"
+
+# Lê o arquivo de entradas em blocos de até tamanho_bloco linhas. No CSV o id e os parâmetros são
+# lidos como texto (parametros_simulacao converte cada campo), então um bloco não muda de tipo
+# por ter só números, só vazios ou um valor inválido numa coluna.
+def ler_entradas(caminho, tamanho_bloco=1000):
+    if _formato(caminho) == "parquet":
+        import pyarrow.parquet as pq
+
+        for lote in pq.ParquetFile(caminho).iter_batches(batch_size=tamanho_bloco):
+            yield lote.to_pandas()
+    else:
+        tipos = {coluna: str for coluna in ('id', *COLUNAS_ENTRADA)}
+        yield from pd.read_csv(caminho, chunksize=tamanho_bloco, dtype=tipos)
+
+# Simula cada registro do bloco; erros de uma linha ficam no resumo e não interrompem o lote
+def simular_bloco(registros):
+    cronogramas = []
+    resumo = []
+    for identificador, registro in registros:
+        try:
+            simulacao = simular_financiamento(**parametros_simulacao(registro))
+        except Exception as e:
+            resumo.append({'id': identificador, 'erro': str(e)})
+            continue
+
+        cronograma = simulacao['cronograma']
+        if cronograma.erro:
+            resumo.append({'id': identificador, 'erro': "Erro ao gerar cronograma"})
+            continue
+        cronogramas.append((identificador, cronograma))
+        resumo.append({
+            'id': identificador,
+            'valor_financiado': simulacao['valor_financiado'],
+            'valor_parcela': simulacao['valor_parcela'],
+            'valor_balao': simulacao['valor_balao'],
+            'qtd_parcelas': simulacao['qtd_parcelas'],
+            'qtd_baloes': simulacao['qtd_baloes'],
+            'data_primeira_parcela': simulacao['data_primeira_parcela'],
+            'total_pago': cronograma.totais['Valor'],
+            'valor_presente': cronograma.totais['Valor_Presente'],
+            'comissoes': simulacao['comissoes']['total'],
+            'cet_anual': simulacao['cet']['cet_anual'],
+            'erro': None
+        })
+
+    # Tipos fixos para que todos os blocos tenham o mesmo esquema, mesmo vazios ou só com erros
+    resumo = pd.DataFrame(resumo, columns=COLUNAS_RESUMO).astype(TIPOS_RESUMO)
+    cronogramas = pd.DataFrame(_colunas_bloco(cronogramas), columns=COLUNAS_CRONOGRAMA).astype(TIPOS_CRONOGRAMA)
+    return cronogramas, resumo
+
+# Colunas dos cronogramas do bloco concatenadas, com o id de cada simulação repetido nas suas linhas
+def _colunas_bloco(cronogramas):
+    if not cronogramas:
+        return {}
+    ids = np.empty(len(cronogramas), dtype=object)
+    ids[:] = [identificador for identificador, _ in cronogramas]
+    colunas = {'id': np.repeat(ids, [len(cronograma) for _, cronograma in cronogramas])}
+    for coluna in COLUNAS_CRONOGRAMA[1:]:
+        colunas[coluna] = np.concatenate([cronograma[coluna] for _, cronograma in cronogramas])
+    return colunas
+
+# Grava DataFrames em sequência num único arquivo CSV ou Parquet. No Parquet, o esquema do primeiro
+# bloco vale para o arquivo e cada bloco é convertido para ele antes de ser gravado.
+class EscritorBlocos:
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.formato = _formato(caminho)
+        self.linhas = 0
+        self._escritor = None
+
+    def escrever(self, df):
+        if self.formato == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            tabela = pa.Table.from_pandas(df, preserve_index=False)
+            if self._escritor is None:
+                self._escritor = pq.ParquetWriter(self.caminho, tabela.schema)
+            self._escritor.write_table(tabela.cast(self._escritor.schema))
+        else:
+            primeiro = self._escritor is None
+            df.to_csv(self.caminho, mode="w" if primeiro else "a", header=primeiro, index=False, date_format="%Y-%m-%d")
+            self._escritor = True
+        self.linhas += len(df)
+
+    def fechar(self):
+        if self.formato == "parquet" and self._escritor is not None:
+            self._escritor.close()
+
+def _registros(bloco, inicio):
+    colunas = [c for c in bloco.columns if c in COLUNAS_ENTRADA]
+    ids = (bloco['id'] if 'id' in bloco.columns else pd.RangeIndex(inicio, inicio + len(bloco))).astype("string")
+    ids = ids.tolist()
+    return list(zip(ids, bloco[colunas].to_dict(orient="records")))
+
+# Processa o arquivo de entradas inteiro. Os blocos são distribuídos ao pool mantendo no máximo
+# 2 blocos por processo em andamento, e os resultados são gravados na ordem de entrada.
+def simular_lote(entradas, saida=None, resumo=None, tamanho_bloco=1000, max_processos=None):
+    if saida is None and resumo is None:
+        raise ValueError("Informe ao menos um destino: saida ou resumo")
+    max_processos = max_processos or os.cpu_count() or 1
+    escritor_saida = EscritorBlocos(saida) if saida else None
+    escritor_resumo = EscritorBlocos(resumo) if resumo else None
+    estatisticas = {'simulacoes': 0, 'erros': 0, 'linhas': 0}
+
+    def gravar(futuro):
+        cronogramas, tabela_resumo = futuro.result()
+        if escritor_saida:
+            escritor_saida.escrever(cronogramas)
+        if escritor_resumo:
+            escritor_resumo.escrever(tabela_resumo)
+        estatisticas['simulacoes'] += len(tabela_resumo)
+        estatisticas['erros'] += int(tabela_resumo['erro'].notna().sum())
+        estatisticas['linhas'] += len(cronogramas)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_processos) as executor:
+            pendentes = deque()
+            inicio = 0
+            for bloco in ler_entradas(entradas, tamanho_bloco):
+                pendentes.append(executor.submit(simular_bloco, _registros(bloco, inicio)))
+                inicio += len(bloco)
+                while len(pendentes) >= 2 * max_processos:
+                    gravar(pendentes.popleft())
+            while pendentes:
+                gravar(pendentes.popleft())
+    finally:
+        for escritor in (escritor_saida, escritor_resumo):
+            if escritor:
+                escritor.fechar()
+    return estatisticas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulação de financiamentos em lote (CSV/Parquet)")
+    parser.add_argument("entradas", help="arquivo CSV ou Parquet com uma simulação por linha")
+    parser.add_argument("saida", nargs="?", help="arquivo de cronogramas (.csv ou .parquet)")
+    parser.add_argument("--resumo", help="arquivo com uma linha de resumo por simulação (.csv ou .parquet)")
+    parser.add_argument("--bloco", type=int, default=1000, help="simulações por bloco")
+    parser.add_argument("--processos", type=int, help="processos do pool (padrão: número de CPUs)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if not args.saida and not args.resumo:
+        parser.error("informe o arquivo de saída e/ou --resumo")
+
+    inicio = time.perf_counter()
+    estatisticas = simular_lote(args.entradas, args.saida, args.resumo, args.bloco, args.processos)
+    duracao = time.perf_counter() - inicio
+    logger.info(
+        f"{estatisticas['simulacoes']} simulações ({estatisticas['erros']} com erro), "
+        f"{estatisticas['linhas']} parcelas em {duracao:.1f}s"
+    )
+    return 1 if estatisticas['erros'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
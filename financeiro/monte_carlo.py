@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from .indices import ler_numeros
+
+# Simulação de Monte Carlo de investimentos: milhares de trajetórias de taxa mensal, capitalizadas
+# como uma matriz caminho x mês. Os caminhos são gerados e capitalizados em blocos de
+# tamanho_bloco linhas, então a memória fica limitada pelo bloco (10 mil caminhos x 360 meses ~ 30 MB)
+# e não pelo total de caminhos.
+#
+# Modelos de taxa:
+#   "reversao":  Selic anual com reversão à média (Vasicek, discretização exata mensal);
+#                o investimento rende "percentual" % da Selic do mês
+#   "bootstrap": blocos de meses consecutivos sorteados de uma série histórica de taxas mensais
+#
+#   simular_monte_carlo(100000, 360, "reversao", qtd_caminhos=100000, taxa_inicial=10.5)
+#
+# Os percentis do valor final são exatos (todos os valores finais são guardados); as faixas mês a
+# mês (o "leque" do gráfico) vêm de uma amostra de até amostra_faixas caminhos.
+
+MODELOS = ("reversao", "bootstrap")
+PERCENTIS = (5, 25, 50, 75, 95)
+
+# Taxas mensais (% a.m.) com a Selic seguindo r' = θ + (r - θ)e^(-κΔt) + σ·√((1 - e^(-2κΔt)) / 2κ)·ε
+def caminhos_reversao(rng, qtd_caminhos, prazo_meses, taxa_inicial=10.5, taxa_longo_prazo=9.0,
+                      velocidade=0.5, volatilidade=2.0, percentual=100.0, taxa_minima=0.0):
+    dt = 1 / 12
+    persistencia = np.exp(-velocidade * dt)
+    if velocidade > 0:
+        desvio = volatilidade * np.sqrt((1 - persistencia ** 2) / (2 * velocidade))
+    else:
+        desvio = volatilidade * np.sqrt(dt)
+
+    # Os choques são sobrescritos pela Selic de cada mês e convertidos no próprio array
+    selic = rng.standard_normal((qtd_caminhos, prazo_meses))
+    selic *= desvio
+    anterior = np.full(qtd_caminhos, float(taxa_inicial))
+    for mes in range(prazo_meses):
+        anterior = taxa_longo_prazo + (anterior - taxa_longo_prazo) * persistencia + selic[:, mes]
+        selic[:, mes] = anterior
+    np.maximum(selic, taxa_minima, out=selic)
+    selic /= 100
+    np.log1p(selic, out=selic)
+    selic /= 12
+    np.expm1(selic, out=selic)
+    selic *= percentual
+    return selic
+
+# Taxas mensais (% a.m.) sorteando blocos de meses consecutivos da série histórica, o que preserva
+# a autocorrelação de curto prazo da série
+def caminhos_bootstrap(rng, qtd_caminhos, prazo_meses, historico, meses_por_bloco=12):
+    historico = np.asarray(historico, dtype=float)
+    historico = historico[np.isfinite(historico)]
+    if len(historico) == 0:
+        raise ValueError("Série histórica vazia")
+    meses_por_bloco = max(1, min(int(meses_por_bloco), len(historico)))
+    qtd_blocos = -(-prazo_meses // meses_por_bloco)
+    inicios = rng.integers(0, len(historico) - meses_por_bloco + 1, (qtd_caminhos, qtd_blocos))
+    indices = (inicios[:, :, None] + np.arange(meses_por_bloco)).reshape(qtd_caminhos, -1)
+    return historico[indices[:, :prazo_meses]]
+
+# Série histórica de taxas mensais (% a.m.) de um CSV. Aceita o formato das séries do Banco
+# Central (separador ";" e vírgula decimal); sem "coluna", usa a última coluna da planilha.
+def ler_historico(caminho, coluna=None):
+    tabela = pd.read_csv(caminho, sep=None, engine="python")
+    serie = tabela[coluna] if coluna is not None else tabela.iloc[:, -1]
+    return ler_numeros(serie).dropna().to_numpy(dtype=float)
+
+def simular_monte_carlo(valor, prazo_meses, modelo="reversao", qtd_caminhos=10000, percentis=PERCENTIS,
+                        tamanho_bloco=10000, amostra_faixas=2000, semente=None, **parametros):
+    if modelo not in MODELOS:
+        raise ValueError(f"Modelo de taxa desconhecido: {modelo}")
+    prazo_meses = int(prazo_meses)
+    qtd_caminhos = int(qtd_caminhos)
+    if prazo_meses < 1 or qtd_caminhos < 1:
+        raise ValueError("Prazo e quantidade de caminhos devem ser maiores que zero")
+    gerar = caminhos_reversao if modelo == "reversao" else caminhos_bootstrap
+
+    rng = np.random.default_rng(semente)
+    finais = np.empty(qtd_caminhos)
+    amostra = []
+    qtd_amostra = 0
+    for inicio in range(0, qtd_caminhos, tamanho_bloco):
+        linhas = min(tamanho_bloco, qtd_caminhos - inicio)
+        fatores = gerar(rng, linhas, prazo_meses, **parametros)
+        fatores /= 100
+        fatores += 1
+        finais[inicio:inicio + linhas] = valor * fatores.prod(axis=1)
+        # Os caminhos são independentes: as primeiras linhas de cada bloco já são uma amostra aleatória
+        faltam = min(amostra_faixas - qtd_amostra, linhas)
+        if faltam > 0:
+            amostra.append(valor * np.cumprod(fatores[:faltam], axis=1))
+            qtd_amostra += faltam
+
+    percentis = list(percentis)
+    faixas = np.percentile(np.concatenate(amostra), percentis, axis=0)
+    return {
+        'valor_inicial': valor,
+        'prazo_meses': prazo_meses,
+        'qtd_caminhos': qtd_caminhos,
+        'valor_final_medio': round(float(finais.mean()), 2),
+        'percentis': {p: round(float(v), 2) for p, v in zip(percentis, np.percentile(finais, percentis))},
+        'probabilidade_perda': float((finais < valor).mean()),
+        'faixas': pd.DataFrame({
+            'Mês': np.arange(1, prazo_meses + 1),
+            **{f"P{p}": np.round(faixa, 2) for p, faixa in zip(percentis, faixas)}
+        })
+    }
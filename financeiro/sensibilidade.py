@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from .amortizacao import _resumo_carteira
+
+# Análise de sensibilidade: Price e SAC avaliados numa grade taxa x prazo (x valor financiado)
+# inteira de uma vez, pelos resumos em forma fechada de amortizar_carteira (sem gerar as
+# tabelas de parcelas). Uma grade 50 x 50 leva poucos milissegundos.
+#
+#   grade = grade_sensibilidade(100000, np.linspace(0.5, 2.5, 50), np.arange(12, 361, 12))
+#   tabela = tabela_sensibilidade(grade, 'diferenca_juros')
+#   tabela.style.apply(cores_mapa_calor, axis=None)
+
+METRICAS = {
+    'diferenca_juros': "Diferença de juros (Price - SAC)",
+    'total_juros_price': "Total de juros (Price)",
+    'total_juros_sac': "Total de juros (SAC)",
+    'parcela_price': "Parcela (Price)",
+    'primeira_parcela_sac': "1ª parcela (SAC)",
+    'ultima_parcela_sac': "Última parcela (SAC)",
+    'diferenca_primeira_parcela': "Diferença na 1ª parcela (Price - SAC)",
+    'diferenca_ultima_parcela': "Diferença na última parcela (Price - SAC)"
+}
+
+# Escala de cores do mapa de calor: verde (menores valores), amarelo, vermelho (maiores)
+ESCALA_CORES = np.array([[26, 152, 80], [254, 224, 139], [215, 48, 39]])
+
+_HEX = np.array([f"{n:02x}" for n in range(256)])
+
+# Uma linha por combinação (valor financiado, taxa, prazo), com as métricas de METRICAS
+def grade_sensibilidade(valores_financiados, taxas_juros, prazos_meses):
+    valores = np.atleast_1d(np.asarray(valores_financiados, dtype=float))
+    taxas = np.atleast_1d(np.asarray(taxas_juros, dtype=float))
+    prazos = np.atleast_1d(np.asarray(prazos_meses, dtype=np.int64))
+    if np.any(prazos < 1):
+        raise ValueError("Todos os prazos devem ser de pelo menos 1 mês")
+
+    valor, taxa, prazo = (eixo.ravel() for eixo in np.meshgrid(valores, taxas, prazos, indexing='ij'))
+    i = taxa / 100
+    price = _resumo_carteira("price", valor, i, prazo)
+    sac = _resumo_carteira("sac", valor, i, prazo)
+    return pd.DataFrame({
+        'valor_financiado': valor,
+        'taxa_juros': taxa,
+        'prazo_meses': prazo,
+        'diferenca_juros': price['total_juros'] - sac['total_juros'],
+        'total_juros_price': price['total_juros'],
+        'total_juros_sac': sac['total_juros'],
+        'parcela_price': price['valor_parcela'],
+        'primeira_parcela_sac': sac['valor_primeira_parc'],
+        'ultima_parcela_sac': sac['valor_ultima_parc'],
+        'diferenca_primeira_parcela': price['valor_parcela'] - sac['valor_primeira_parc'],
+        'diferenca_ultima_parcela': price['valor_parcela'] - sac['valor_ultima_parc']
+    })
+
+# Tabela taxa (linhas) x prazo (colunas) de uma métrica, para um valor financiado da grade
+# (o primeiro, se não for indicado)
+def tabela_sensibilidade(grade, metrica, valor_financiado=None):
+    if metrica not in METRICAS:
+        raise ValueError(f"Métrica desconhecida: {metrica}")
+    if valor_financiado is None:
+        valor_financiado = grade['valor_financiado'].iloc[0]
+    recorte = grade[np.isclose(grade['valor_financiado'], valor_financiado)]
+    if recorte.empty:
+        raise ValueError(f"Valor financiado fora da grade: {valor_financiado}")
+    return recorte.pivot(index='taxa_juros', columns='prazo_meses', values=metrica)
+
+# Estilos CSS de mapa de calor para Styler.apply(..., axis=None), calculados com NumPy
+# (sem matplotlib): cada célula recebe a cor da escala na posição do seu valor entre o mínimo e o máximo
+def cores_mapa_calor(tabela, escala=ESCALA_CORES):
+    valores = tabela.to_numpy(dtype=float)
+    validos = np.isfinite(valores)
+    if not validos.any():
+        return pd.DataFrame("", index=tabela.index, columns=tabela.columns)
+
+    minimo, maximo = valores[validos].min(), valores[validos].max()
+    posicao = (np.where(validos, valores, minimo) - minimo) / (maximo - minimo) if maximo > minimo else np.zeros(valores.shape)
+    pontos = np.linspace(0, 1, len(escala))
+    rgb = np.stack([np.interp(posicao, pontos, escala[:, canal]) for canal in range(3)], axis=-1)
+    rgb = np.rint(rgb).astype(np.int64)
+
+    fundo = np.char.add(np.char.add(np.char.add("background-color: #", _HEX[rgb[..., 0]]), _HEX[rgb[..., 1]]), _HEX[rgb[..., 2]])
+    # Texto escuro sobre fundos claros (luminância relativa aproximada)
+    claro = rgb @ np.array([0.299, 0.587, 0.114]) > 150
+    estilos = np.char.add(fundo, np.where(claro, "; color: #000000", "; color: #ffffff"))
+    return pd.DataFrame(np.where(validos, estilos, ""), index=tabela.index, columns=tabela.columns)
@@ -0,0 +1,226 @@
+import inspect
+import math
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from .cet import calcular_cet
+from .cronograma import (
+    atualizar_baloes, calcular_comissoes, calcular_parcela, calcular_taxas,
+    calcular_valor_presente_total, determinar_modo_calculo, gerar_cronograma, gerar_cronograma_entrada
+)
+
+# Tipo de balão efetivo de cada modalidade (minúsculo, como usado nas taxas)
+def tipo_balao_modalidade(modalidade, tipo_balao=None):
+    if modalidade == "só balão anual":
+        return "anual"
+    if modalidade == "só balão semestral":
+        return "semestral"
+    if modalidade == "mensal + balão":
+        return (tipo_balao or "anual").lower()
+    return None
+
+# Maior quantidade de parcelas aceita (no financiamento e na entrada parcelada): 50 anos
+MAXIMO_PARCELAS = 600
+
+# Valor financiado, parcela, balão e quantidades conforme a modalidade
+def valores_financiamento(valor_total, entrada, modalidade, qtd_parcelas, valor_parcela, valor_balao, tipo_balao, taxas):
+    if valor_total <= 0 or entrada < 0:
+        raise ValueError("Valor total e entrada são obrigatórios")
+
+    valor_financiado = max(valor_total - entrada, 0)
+    if valor_financiado <= 0:
+        raise ValueError("Valor financiado deve ser maior que zero")
+
+    qtd_parcelas = int(qtd_parcelas)
+    if qtd_parcelas > MAXIMO_PARCELAS:
+        raise ValueError(f"A quantidade de parcelas deve ser no máximo {MAXIMO_PARCELAS}")
+    qtd_baloes = atualizar_baloes(modalidade, qtd_parcelas, tipo_balao)
+    modo = determinar_modo_calculo(modalidade)
+
+    if modo == 1:  # Somente parcelas mensais
+        valor_parcela = calcular_parcela(valor_financiado, taxas['mensal'], qtd_parcelas)
+        valor_balao = 0
+        qtd_baloes = 0
+    elif modo == 2:  # Parcela + balão
+        if valor_parcela > 0:
+            saldo_parcelas = calcular_valor_presente_total(valor_parcela, taxas['mensal'], qtd_parcelas)
+            saldo_baloes = max(valor_financiado - saldo_parcelas, 0)
+            valor_balao = calcular_parcela(saldo_baloes, taxas[tipo_balao], qtd_baloes)
+        else:
+            saldo_baloes = calcular_valor_presente_total(valor_balao, taxas[tipo_balao], qtd_baloes)
+            saldo_parcelas = max(valor_financiado - saldo_baloes, 0)
+            valor_parcela = calcular_parcela(saldo_parcelas, taxas['mensal'], qtd_parcelas)
+    elif modo == 3:  # Só balão anual
+        valor_balao = calcular_parcela(valor_financiado, taxas['anual'], qtd_baloes)
+        valor_parcela = 0
+        qtd_parcelas = 0
+    elif modo == 4:  # Só balão semestral
+        valor_balao = calcular_parcela(valor_financiado, taxas['semestral'], qtd_baloes)
+        valor_parcela = 0
+        qtd_parcelas = 0
+
+    return {
+        'valor_financiado': valor_financiado,
+        'valor_parcela': valor_parcela,
+        'valor_balao': valor_balao,
+        'qtd_parcelas': qtd_parcelas,
+        'qtd_baloes': qtd_baloes
+    }
+
+def data_para_datetime(data):
+    data = data or datetime.now()
+    if not isinstance(data, datetime):
+        data = datetime.combine(data, datetime.min.time())
+    return data
+
+# Cronograma da entrada (só quando parcelada) e data da primeira parcela, 30 dias após a última entrada
+def entrada_financiamento(entrada, qtd_parcelas_entrada, data_entrada, dia_vencimento):
+    if qtd_parcelas_entrada > MAXIMO_PARCELAS:
+        raise ValueError(f"A quantidade de parcelas da entrada deve ser no máximo {MAXIMO_PARCELAS}")
+    cronograma_entrada = gerar_cronograma_entrada(
+        entrada, qtd_parcelas_entrada if qtd_parcelas_entrada > 1 else 0, data_entrada, dia_vencimento
+    )
+
+    data_primeira_parcela = data_entrada + timedelta(days=30)
+    if cronograma_entrada:
+        ultima_entrada = datetime.combine(cronograma_entrada['Data_Vencimento'][-1].item(), datetime.min.time())
+        data_primeira_parcela = ultima_entrada + timedelta(days=30)
+    return cronograma_entrada, data_primeira_parcela
+
+# Simulação completa de financiamento imobiliário, do formulário ao cronograma:
+# valida as entradas, resolve parcela/balão conforme a modalidade e gera os cronogramas.
+# Usada pelo app Streamlit, pelo servidor HTTP e pelo processamento em lote.
+def simular_financiamento(valor_total, entrada, taxa_mensal, modalidade, qtd_parcelas,
+                          valor_parcela=0.0, valor_balao=0.0, tipo_balao=None,
+                          qtd_parcelas_entrada=1, data_entrada=None, dia_vencimento=None,
+                          comissao_coordenacao=0.5, comissao_imobiliaria=5.0, data_primeiro_balao=None,
+                          exato=False):
+    tipo_balao = tipo_balao_modalidade(modalidade, tipo_balao)
+    taxas = calcular_taxas(taxa_mensal)
+    valores = valores_financiamento(valor_total, entrada, modalidade, qtd_parcelas, valor_parcela, valor_balao,
+                                    tipo_balao, taxas)
+    comissoes = calcular_comissoes(valor_total, comissao_coordenacao, comissao_imobiliaria)
+
+    data_entrada = data_para_datetime(data_entrada)
+    dia_vencimento = dia_vencimento or data_entrada.day
+    cronograma_entrada, data_primeira_parcela = entrada_financiamento(
+        entrada, qtd_parcelas_entrada, data_entrada, dia_vencimento
+    )
+
+    cronograma = gerar_cronograma(
+        valores['valor_financiado'],
+        valores['valor_parcela'],
+        valores['valor_balao'],
+        valores['qtd_parcelas'],
+        valores['qtd_baloes'],
+        modalidade,
+        tipo_balao,
+        data_primeira_parcela,
+        taxas,
+        dia_vencimento,
+        data_primeiro_balao if modalidade == "mensal + balão" else None,
+        exato=exato
+    )
+
+    simulacao = {
+        'valor_total': valor_total,
+        'entrada': entrada,
+        'qtd_parcelas_entrada': qtd_parcelas_entrada,
+        'taxa_mensal': taxa_mensal,
+        'modalidade': modalidade,
+        'tipo_balao': tipo_balao,
+        'taxas': taxas,
+        'comissoes': comissoes,
+        **valores,
+        'data_entrada': data_entrada,
+        'data_primeira_parcela': data_primeira_parcela,
+        'cronograma_entrada': cronograma_entrada,
+        'cronograma': cronograma
+    }
+    simulacao['cet'] = calcular_cet(simulacao)
+    return simulacao
+
+# Dados do cabeçalho usados pelas exportações (PDF)
+def dados_exportacao(simulacao):
+    return {chave: simulacao[chave] for chave in (
+        'valor_total', 'entrada', 'qtd_parcelas_entrada', 'taxa_mensal', 'modalidade', 'comissoes', 'valor_financiado'
+    )}
+
+CAMPOS_NUMERICOS = ('valor_total', 'entrada', 'taxa_mensal', 'valor_parcela', 'valor_balao',
+                    'comissao_coordenacao', 'comissao_imobiliaria')
+CAMPOS_INTEIROS = ('qtd_parcelas', 'qtd_parcelas_entrada', 'dia_vencimento')
+CAMPOS_DATA = ('data_entrada', 'data_primeiro_balao')
+CAMPOS_BOOLEANOS = ('exato',)
+
+# Booleano informado como bool, número ou texto ("sim", "true", "1", "não", "false", "0")
+def ler_booleano(valor):
+    if isinstance(valor, str):
+        texto = valor.strip().lower()
+        if texto in ("1", "true", "sim", "s", "verdadeiro", "on"):
+            return True
+        if texto in ("0", "false", "não", "nao", "n", "falso", "off"):
+            return False
+        raise ValueError(f"Valor booleano inválido: {valor}")
+    return bool(valor)
+
+# Data informada como dd/mm/aaaa, ISO (aaaa-mm-dd) ou já como date/datetime/Timestamp
+def ler_data(valor):
+    if isinstance(valor, pd.Timestamp):
+        return valor.to_pydatetime()
+    if isinstance(valor, (datetime, date)):
+        return valor
+    try:
+        return datetime.strptime(valor, '%d/%m/%Y')
+    except ValueError:
+        return datetime.fromisoformat(valor)
+
+# Número finito informado como número ou texto; booleanos, NaN e infinito são recusados
+def ler_numero(valor):
+    if isinstance(valor, bool):
+        raise TypeError(valor)
+    numero = float(valor)
+    if not math.isfinite(numero):
+        raise ValueError(valor)
+    return numero
+
+# Texto como "3.0" (coluna inteira com vazios gravada pelo pandas) também é aceito
+def ler_inteiro(valor):
+    return int(ler_numero(valor) if isinstance(valor, (str, float, bool)) else valor)
+
+# Erros de conversão (tipo errado, texto inválido, infinito, NaN) viram ValueError com o nome do campo
+def converter_campo(nome, valor, conversao):
+    try:
+        return conversao(valor)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"Valor inválido para {nome}: {valor!r}") from None
+
+# Parâmetros de simular_financiamento a partir de um registro externo (JSON, linha de CSV/Parquet):
+# descarta campos vazios, converte tipos e datas e acusa campos desconhecidos ou faltando
+def parametros_simulacao(registro):
+    parametros_validos = inspect.signature(simular_financiamento).parameters
+    desconhecidos = set(registro) - set(parametros_validos)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    parametros = {nome: valor for nome, valor in registro.items()
+                  if valor is not None and valor != "" and not (isinstance(valor, float) and pd.isna(valor))
+                  and valor is not pd.NaT}
+    faltando = [nome for nome, p in parametros_validos.items()
+                if p.default is inspect.Parameter.empty and nome not in parametros]
+    if faltando:
+        raise ValueError(f"Parâmetros obrigatórios: {', '.join(faltando)}")
+
+    for nome in CAMPOS_NUMERICOS:
+        if nome in parametros:
+            parametros[nome] = converter_campo(nome, parametros[nome], ler_numero)
+    for nome in CAMPOS_INTEIROS:
+        if nome in parametros:
+            parametros[nome] = converter_campo(nome, parametros[nome], ler_inteiro)
+    for nome in CAMPOS_DATA:
+        if nome in parametros:
+            parametros[nome] = converter_campo(nome, parametros[nome], ler_data)
+    for nome in CAMPOS_BOOLEANOS:
+        if nome in parametros:
+            parametros[nome] = ler_booleano(parametros[nome])
+    return parametros
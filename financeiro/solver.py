@@ -0,0 +1,117 @@
+import numpy as np
+
+from .amortizacao import _parcela_price
+
+# Problemas inversos de amortização: qual taxa, prazo ou valor financiado leva a uma parcela-alvo.
+# Taxas em % ao mês (como em calcular_price/calcular_sac). Para o SAC, a parcela considerada é a
+# primeira (a maior), que é a usada na análise de capacidade de pagamento.
+# Todas as funções aceitam escalares ou arrays (broadcast entre os argumentos) e resolvem o lote
+# inteiro de uma vez; combinações sem solução retornam NaN.
+
+SISTEMAS = ("price", "sac")
+
+def _sistema(sistema):
+    sistema = sistema.lower()
+    if sistema not in SISTEMAS:
+        raise ValueError(f"Sistema de amortização desconhecido: {sistema}")
+    return sistema
+
+def _arrays(*valores):
+    return np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in valores))
+
+# Escalar na entrada, float na saída; arrays continuam arrays
+def _saida(resultado):
+    return float(resultado) if np.ndim(resultado) == 0 else resultado
+
+# Maior valor financiado cuja parcela não passa de "parcela" (forma fechada)
+def resolver_valor_financiado(parcela, taxa_juros, prazo_meses, sistema="price"):
+    sistema = _sistema(sistema)
+    parcela, taxa_juros, prazo_meses = _arrays(parcela, taxa_juros, prazo_meses)
+    i = taxa_juros / 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if sistema == "price":
+            # P = PMT * (1 - (1+i)^-n) / i
+            valor = np.where(i > 0, parcela * -np.expm1(-prazo_meses * np.log1p(i)) / i, parcela * prazo_meses)
+        else:
+            # Primeira parcela SAC: PMT = P/n + P*i
+            valor = parcela / (1 / prazo_meses + i)
+    valor = np.where((prazo_meses >= 1) & (parcela >= 0) & (i >= 0), valor, np.nan)
+    return _saida(valor)
+
+# Prazo (meses) que leva à parcela-alvo. Com inteiro=True, arredonda para cima: o menor prazo
+# inteiro cuja parcela não passa do alvo. Parcela que não cobre os juros do mês: NaN.
+def resolver_prazo(valor_financiado, taxa_juros, parcela, sistema="price", inteiro=True):
+    sistema = _sistema(sistema)
+    valor_financiado, taxa_juros, parcela = _arrays(valor_financiado, taxa_juros, parcela)
+    i = taxa_juros / 100
+    juros_mes = valor_financiado * i
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if sistema == "price":
+            # n = -ln(1 - P*i/PMT) / ln(1+i)
+            prazo = np.where(i > 0, -np.log1p(-juros_mes / parcela) / np.log1p(i), valor_financiado / parcela)
+        else:
+            # n = P / (PMT - P*i)
+            prazo = valor_financiado / (parcela - juros_mes)
+    prazo = np.where((parcela > juros_mes) & (valor_financiado > 0) & (i >= 0), prazo, np.nan)
+    if inteiro:
+        # Tolerância para não somar um mês por erro de arredondamento (ex.: 120.0000001)
+        prazo = np.ceil(prazo - 1e-6)
+    return _saida(prazo)
+
+# Parcela Price e sua derivada em relação à taxa, estáveis para taxas próximas de zero
+def _parcela_e_derivada(valor_financiado, i, prazo_meses):
+    desconto = -np.expm1(-prazo_meses * np.log1p(i))  # 1 - (1+i)^-n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        parcela = valor_financiado * i / desconto
+        derivada = valor_financiado * (desconto - i * prazo_meses * np.exp(-(prazo_meses + 1) * np.log1p(i))) / desconto ** 2
+    pequena = i < 1e-12
+    parcela = np.where(pequena, valor_financiado / prazo_meses, parcela)
+    derivada = np.where(pequena, valor_financiado * (prazo_meses + 1) / (2 * prazo_meses), derivada)
+    return parcela, derivada
+
+# Taxa (% ao mês) que leva à parcela-alvo. SAC em forma fechada; Price por Newton protegido por
+# bisseção: a parcela cresce com a taxa, então a raiz fica em [0, PMT/P] e cada passo de Newton
+# que sair do intervalo é trocado pelo ponto médio. Todos os elementos iteram juntos.
+def resolver_taxa(valor_financiado, parcela, prazo_meses, sistema="price", tolerancia=1e-12, max_iteracoes=100):
+    sistema = _sistema(sistema)
+    valor_financiado, parcela, prazo_meses = _arrays(valor_financiado, parcela, prazo_meses)
+    valido = (valor_financiado > 0) & (prazo_meses >= 1) & (parcela * prazo_meses >= valor_financiado)
+
+    if sistema == "sac":
+        with np.errstate(divide='ignore', invalid='ignore'):
+            taxa = (parcela - valor_financiado / prazo_meses) / valor_financiado
+        return _saida(np.where(valido, taxa * 100, np.nan))
+
+    # Intervalo e chute inicial válidos mesmo para os elementos sem solução (descartados no fim)
+    P = np.where(valido, valor_financiado, 1.0)
+    n = np.where(valido, prazo_meses, 1.0)
+    alvo = np.where(valido, parcela, 1.0)
+    baixo = np.zeros_like(P)
+    alto = alvo / P
+    # Aproximação clássica i ≈ 2(nA - P) / (P(n + 1)), limitada ao intervalo
+    i = np.clip(2 * (n * alvo - P) / (P * (n + 1)), baixo, alto)
+
+    for _ in range(max_iteracoes):
+        f, df = _parcela_e_derivada(P, i, n)
+        f = f - alvo
+        baixo = np.where(f < 0, i, baixo)
+        alto = np.where(f > 0, i, alto)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            novo = i - f / df
+        fora = ~np.isfinite(novo) | (novo < baixo) | (novo > alto)
+        novo = np.where(fora, (baixo + alto) / 2, novo)
+        ativos = np.abs(novo - i) > tolerancia * np.maximum(1.0, i)
+        i = novo
+        if not ativos.any():
+            break
+
+    return _saida(np.where(valido, i * 100, np.nan))
+
+# Parcela no sentido usado pelos resolvedores (Price: fixa; SAC: primeira), em lote
+def parcela_inicial(valor_financiado, taxa_juros, prazo_meses, sistema="price"):
+    sistema = _sistema(sistema)
+    valor_financiado, taxa_juros, prazo_meses = _arrays(valor_financiado, taxa_juros, prazo_meses)
+    i = taxa_juros / 100
+    if sistema == "price":
+        return _saida(_parcela_price(valor_financiado, i, prazo_meses))
+    return _saida(valor_financiado / prazo_meses + valor_financiado * i)
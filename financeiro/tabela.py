@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+# Cronograma em colunas: um array NumPy por coluna, todos do mesmo comprimento, com os totais
+# guardados à parte (sem linha "TOTAL") e a mensagem de erro, se o cálculo falhou (sem linha "ERRO").
+# Motor, telas e exportações leem as colunas diretamente; to_arrow e to_pandas entregam os arrays
+# numéricos e de datas sem copiá-los, e linhas() dá a visão linha a linha quando ela é necessária
+# (templates HTML, JSON). Os arrays são somente leitura: o mesmo cronograma é compartilhado pelo
+# cache entre sessões.
+
+COLUNAS_CRONOGRAMA = ('Item', 'Tipo', 'Data_Vencimento', 'Dias', 'Valor', 'Valor_Presente', 'Desconto_Aplicado')
+TIPOS_COLUNAS = {
+    'Item': str, 'Tipo': str, 'Data_Vencimento': 'datetime64[D]', 'Dias': np.int64,
+    'Valor': float, 'Valor_Presente': float, 'Desconto_Aplicado': float
+}
+
+class Cronograma:
+    def __init__(self, colunas, totais=None, erro=None):
+        self.colunas = {}
+        for nome, valores in colunas.items():
+            # Arrays mantêm o próprio tipo (ex.: datas já formatadas como texto); listas recebem o tipo
+            # usual da coluna
+            if not isinstance(valores, np.ndarray):
+                valores = np.asarray(valores, dtype=TIPOS_COLUNAS.get(nome))
+            valores = valores.view()
+            valores.flags.writeable = False
+            self.colunas[nome] = valores
+        if len({len(valores) for valores in self.colunas.values()}) > 1:
+            raise ValueError("As colunas do cronograma devem ter o mesmo comprimento")
+        self.totais = dict(totais or {})
+        self.erro = erro
+
+    # Cronograma sem linhas, com as colunas usuais (e a mensagem de erro, se houver)
+    @classmethod
+    def vazio(cls, colunas=COLUNAS_CRONOGRAMA, erro=None):
+        return cls({nome: [] for nome in colunas}, erro=erro)
+
+    def __len__(self):
+        return len(next(iter(self.colunas.values()), ()))
+
+    def __getitem__(self, nome):
+        return self.colunas[nome]
+
+    def __contains__(self, nome):
+        return nome in self.colunas
+
+    @property
+    def nomes(self):
+        return list(self.colunas)
+
+    @property
+    def nbytes(self):
+        return sum(valores.nbytes for valores in self.colunas.values())
+
+    # Novo cronograma com colunas a mais (ou substituídas) e totais atualizados; as demais colunas
+    # são compartilhadas, sem cópia
+    def com_colunas(self, totais=None, **colunas):
+        return Cronograma({**self.colunas, **colunas}, {**self.totais, **(totais or {})}, self.erro)
+
+    # Linhas como dicts de valores Python (datas como datetime.date)
+    def linhas(self):
+        nomes = self.nomes
+        for valores in zip(*(coluna.tolist() for coluna in self.colunas.values())):
+            yield dict(zip(nomes, valores))
+
+    def to_pandas(self):
+        return pd.DataFrame(self.colunas, copy=False)
+
+    # Tabela Arrow com os totais e o erro nos metadados do esquema
+    def to_arrow(self):
+        import pyarrow as pa
+
+        tabela = pa.table({nome: pa.array(valores) for nome, valores in self.colunas.items()})
+        return tabela.replace_schema_metadata({
+            'totais': json.dumps(self.totais),
+            'erro': json.dumps(self.erro)
+        })
+
+    @classmethod
+    def from_arrow(cls, tabela):
+        metadados = tabela.schema.metadata or {}
+        return cls(
+            {nome: tabela.column(nome).to_numpy() for nome in tabela.column_names},
+            json.loads(metadados.get(b'totais', b'{}')),
+            json.loads(metadados.get(b'erro', b'null'))
+        )
@@ -0,0 +1,236 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.routing import Route
+
+import financeiro
+from financeiro import atualizar_baloes, dados_exportacao, formatar_datas, formatar_moeda
+from financeiro.cache import memoizar
+from financeiro.exportacao import TIPOS_EXPORTACAO, exportacao_pronta, impressao_digital, obter_exportacao
+from financeiro.simulacao import (
+    MAXIMO_PARCELAS, converter_campo, ler_data, ler_inteiro, ler_numero, parametros_simulacao
+)
+
+# Serviço HTTP sem interface Streamlit: renderiza os templates HTML (simulador, resultado, erro)
+# e expõe a simulação, Price e SAC como endpoints JSON. O trabalho pesado (cronogramas,
+# renderização e exportações) roda num pool de processos, deixando o laço assíncrono livre.
+# As exportações ficam no cache de cada processo pela impressão digital dos parâmetros.
+#
+#   uvicorn servidor:app --host 0.0.0.0 --port 8000
+#
+# FINANCEIRO_PROCESSOS define o tamanho do pool (padrão: número de CPUs).
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DIRETORIO_TEMPLATES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Os templates foram escritos para Flask (request.form, now), então são renderizados
+# diretamente por um Environment com esses nomes no contexto
+templates = Environment(loader=FileSystemLoader(DIRETORIO_TEMPLATES), autoescape=select_autoescape(["html"]))
+templates.globals['formatar_moeda'] = formatar_moeda
+
+# Cada processo do pool mantém seu próprio cache de simulações
+_simular_financiamento = memoizar(financeiro.simular_financiamento)
+calcular_price = memoizar(financeiro.calcular_price)
+calcular_sac = memoizar(financeiro.calcular_sac)
+
+# Sem data de entrada a simulação parte de hoje, então o resultado não vai para o cache
+# (mesma regra das etapas compartilhadas de GrafoSimulacao)
+def simular_financiamento(**parametros):
+    if parametros.get('data_entrada') is None:
+        return financeiro.simular_financiamento(**parametros)
+    return _simular_financiamento(**parametros)
+
+def _impressao_digital(parametros):
+    return impressao_digital(parametros) if parametros.get('data_entrada') is not None else None
+
+# Converte datas, escalares NumPy e DataFrames em tipos aceitos pelo JSON
+def para_json(valor):
+    if isinstance(valor, dict):
+        return {str(chave): para_json(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [para_json(v) for v in valor]
+    if isinstance(valor, pd.DataFrame):
+        return para_json(valor.to_dict(orient="records"))
+    if isinstance(valor, financeiro.Cronograma):
+        return {'linhas': para_json(list(valor.linhas())), 'totais': valor.totais, 'erro': valor.erro}
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+# Parâmetros da simulação a partir do formulário de templates/simulador.html
+def parametros_formulario(form):
+    def numero(nome, padrao):
+        valor = form.get(nome)
+        return float(valor) if valor not in (None, "") else padrao
+
+    data_entrada = form.get('data_entrada')
+
+    return {
+        'valor_total': numero('valor_total', 0.0),
+        'entrada': numero('entrada', 0.0),
+        'taxa_mensal': numero('taxa_mensal', 0.0),
+        'modalidade': form.get('modalidade_plano') or "mensal",
+        'qtd_parcelas': int(numero('quantidade_parcelas', 0)),
+        'valor_parcela': numero('valor_parcela', 0.0),
+        'valor_balao': numero('valor_balao', 0.0),
+        'tipo_balao': form.get('tipo_balao'),
+        'qtd_parcelas_entrada': int(numero('qtd_parcelas_entrada', 1)),
+        'data_entrada': ler_data(data_entrada) if data_entrada else None,
+        'dia_vencimento': int(numero('dia_vencimento', 0)) or None,
+        'comissao_coordenacao': numero('comissao_coordenacao', 0.5),
+        'comissao_imobiliaria': numero('comissao_imobiliaria', 5.0)
+    }
+
+def _pagina(nome, form=None, **contexto):
+    return templates.get_template(nome).render(request={'form': form or {}}, now=datetime.now(), **contexto)
+
+# --- Tarefas executadas no pool de processos (funções de módulo para serem serializáveis) ---
+
+def _tarefa_simulacao(parametros):
+    return para_json(simular_financiamento(**parametros))
+
+def _tarefa_amortizacao(sistema, valor_financiado, taxa_juros, prazo_meses):
+    calcular = calcular_price if sistema == "price" else calcular_sac
+    return para_json(calcular(valor_financiado, taxa_juros, prazo_meses))
+
+def _tarefa_resultado(parametros, form):
+    simulacao = simular_financiamento(**parametros)
+    cronograma = simulacao['cronograma']
+    linhas = cronograma.com_colunas(Data_Vencimento=formatar_datas(cronograma['Data_Vencimento'])).linhas()
+    return _pagina("resultado.html", form, **{**simulacao, 'cronograma': linhas, 'total': cronograma.totais,
+                                              'erro_cronograma': cronograma.erro})
+
+def _tarefa_exportacao(parametros, formato):
+    chave = _impressao_digital(parametros)
+    conteudo = exportacao_pronta(chave, formato) if chave else None
+    if conteudo is None:
+        simulacao = simular_financiamento(**parametros)
+        conteudo = obter_exportacao(chave, formato, simulacao['cronograma'], simulacao['cronograma_entrada'],
+                                    dados_exportacao(simulacao))
+    # Falhas na geração resultam em documento vazio, que não deve ser enviado como anexo
+    if not conteudo:
+        raise RuntimeError(f"Não foi possível gerar o arquivo {formato.upper()}")
+    # O documento volta ao processo principal serializado; a visão do cache não é serializável
+    return conteudo.tobytes()
+
+async def _executar(request, funcao, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(request.app.state.processos, funcao, *args)
+
+# --- Rotas ---
+
+async def simulador(request):
+    if request.method == "GET":
+        return HTMLResponse(_pagina("simulador.html"))
+
+    form = dict(await request.form())
+    try:
+        parametros = parametros_formulario(form)
+        formato = form.get('exportar')
+        if formato in TIPOS_EXPORTACAO:
+            conteudo = await _executar(request, _tarefa_exportacao, parametros, formato)
+            tipo, nome_arquivo = TIPOS_EXPORTACAO[formato]
+            return Response(conteudo, media_type=tipo,
+                            headers={'Content-Disposition': f'attachment; filename="{nome_arquivo}"'})
+        return HTMLResponse(await _executar(request, _tarefa_resultado, parametros, form))
+    except ValueError as e:
+        return HTMLResponse(_pagina("erro.html", form, erro=str(e)), status_code=400)
+    except Exception as e:
+        logger.exception("Erro na simulação")
+        return HTMLResponse(_pagina("erro.html", form, erro=f"Ocorreu um erro durante a simulação: {str(e)}"),
+                            status_code=500)
+
+# Corpo JSON da requisição; JSON inválido ou que não seja um objeto gera ValueError
+async def _corpo_json(request):
+    try:
+        corpo = await request.json()
+    except ValueError:
+        raise ValueError("O corpo da requisição não é um JSON válido")
+    if not isinstance(corpo, dict):
+        raise ValueError("O corpo da requisição deve ser um objeto JSON")
+    return corpo
+
+async def calcular_baloes(request):
+    try:
+        corpo = await _corpo_json(request)
+    except ValueError as e:
+        return JSONResponse({'erro': str(e)}, status_code=400)
+    tipo_balao = corpo.get('tipo_balao')
+    if tipo_balao is not None and not isinstance(tipo_balao, str):
+        return JSONResponse({'erro': "tipo_balao deve ser um texto"}, status_code=400)
+    qtd_baloes = atualizar_baloes(corpo.get('modalidade'), corpo.get('parcelas') or 0,
+                                  tipo_balao.lower() if tipo_balao else None)
+    return JSONResponse({'qtd_baloes': qtd_baloes})
+
+async def api_simulacao(request):
+    try:
+        parametros = parametros_simulacao(await _corpo_json(request))
+        return JSONResponse(await _executar(request, _tarefa_simulacao, parametros))
+    except ValueError as e:
+        return JSONResponse({'erro': str(e)}, status_code=400)
+    except Exception as e:
+        logger.exception("Erro na simulação")
+        return JSONResponse({'erro': f"Ocorreu um erro durante a simulação: {str(e)}"}, status_code=500)
+
+def _rota_amortizacao(sistema):
+    async def rota(request):
+        try:
+            corpo = await _corpo_json(request)
+        except ValueError as e:
+            return JSONResponse({'erro': str(e)}, status_code=400)
+        if any(corpo.get(nome) in (None, "") for nome in ('valor_financiado', 'taxa_juros', 'prazo_meses')):
+            return JSONResponse({'erro': "Informe valor_financiado, taxa_juros e prazo_meses"}, status_code=400)
+        try:
+            argumentos = (converter_campo('valor_financiado', corpo['valor_financiado'], ler_numero),
+                          converter_campo('taxa_juros', corpo['taxa_juros'], ler_numero),
+                          converter_campo('prazo_meses', corpo['prazo_meses'], ler_inteiro))
+        except ValueError as e:
+            return JSONResponse({'erro': str(e)}, status_code=400)
+        if argumentos[0] < 0 or argumentos[1] < 0:
+            return JSONResponse({'erro': "valor_financiado e taxa_juros não podem ser negativos"}, status_code=400)
+        if not 0 < argumentos[2] <= MAXIMO_PARCELAS:
+            return JSONResponse({'erro': f"prazo_meses deve estar entre 1 e {MAXIMO_PARCELAS}"}, status_code=400)
+        return JSONResponse(await _executar(request, _tarefa_amortizacao, sistema, *argumentos))
+    return rota
+
+async def saude(request):
+    return JSONResponse({'status': "ok", 'processos': request.app.state.qtd_processos})
+
+@asynccontextmanager
+async def ciclo_de_vida(app):
+    app.state.qtd_processos = int(os.environ.get("FINANCEIRO_PROCESSOS", os.cpu_count() or 1))
+    app.state.processos = ProcessPoolExecutor(max_workers=app.state.qtd_processos)
+    try:
+        yield
+    finally:
+        app.state.processos.shutdown(cancel_futures=True)
+
+app = Starlette(
+    routes=[
+        Route("/", simulador, methods=["GET", "POST"]),
+        Route("/calcular_baloes", calcular_baloes, methods=["POST"]),
+        Route("/api/simulacao", api_simulacao, methods=["POST"]),
+        Route("/api/price", _rota_amortizacao("price"), methods=["POST"]),
+        Route("/api/sac", _rota_amortizacao("sac"), methods=["POST"]),
+        Route("/saude", saude)
+    ],
+    lifespan=ciclo_de_vida
+)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("servidor:app", host=os.environ.get("HOST", "127.0.0.1"), port=int(os.environ.get("PORT", 8000)))
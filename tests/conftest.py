@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Permite importar o pacote financeiro ao executar "pytest" a partir da raiz ou de tests/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
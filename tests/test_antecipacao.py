@@ -0,0 +1,22 @@
+import pytest
+
+from financeiro import calcular_antecipacoes, calcular_price
+
+def test_sem_antecipacao_coincide_com_price():
+    antecipado = calcular_antecipacoes(300000.0, 0.9, 360, [])
+    price = calcular_price(300000.0, 0.9, 360)
+    assert antecipado['prazo_final'] == 360
+    assert antecipado['total_juros'] == pytest.approx(price['total_juros'], abs=0.01)
+
+@pytest.mark.parametrize("modo", ["prazo", "parcela"])
+def test_antecipacao_amortiza_todo_o_saldo(modo):
+    resultado = calcular_antecipacoes(300000.0, 0.9, 360, [{'mes': 12, 'valor': 50000.0, 'modo': modo}])
+    parcelas = resultado['parcelas']
+    amortizado = parcelas['Amortização'].sum() + parcelas['Amortização Extra'].sum()
+    assert amortizado == pytest.approx(300000.0, abs=0.01 * len(parcelas))
+    assert parcelas['Saldo Devedor'].iloc[-1] == 0
+    assert resultado['economia_juros'] > 0
+    if modo == "prazo":
+        assert resultado['prazo_final'] < 360
+    else:
+        assert resultado['prazo_final'] == 360
@@ -0,0 +1,53 @@
+import numpy as np
+
+from financeiro import cache as modulo_cache
+from financeiro.cache import CacheSimulacao, memoizar, normalizar
+
+def test_lru_descarta_o_menos_usado_recentemente():
+    cache = CacheSimulacao(max_itens=2)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.obter('a') == (True, 1)
+    cache.guardar('c', 3)
+    assert cache.obter('b') == (False, None)
+    assert cache.obter('a') == (True, 1) and cache.obter('c') == (True, 3)
+    estatisticas = cache.estatisticas()
+    assert (estatisticas['itens'], estatisticas['acertos'], estatisticas['falhas'], estatisticas['remocoes']) == (2, 3, 1, 1)
+    assert estatisticas['taxa_acerto'] == 0.75
+
+def test_itens_expiram_apos_o_ttl(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(modulo_cache.time, "monotonic", lambda: agora[0])
+    cache = CacheSimulacao(ttl=60)
+    cache.guardar('a', 1)
+    agora[0] += 59
+    assert cache.obter('a') == (True, 1)
+    agora[0] += 2
+    assert cache.obter('a') == (False, None)
+    assert cache.estatisticas()['itens'] == 0
+
+def test_limite_de_memoria():
+    cache = CacheSimulacao(max_bytes=10000)
+    cache.guardar('grande', np.zeros(2000))
+    assert cache.obter('grande') == (False, None)
+    cache.guardar('a', np.zeros(1000))
+    cache.guardar('b', np.zeros(1000))
+    assert cache.obter('a') == (False, None)
+    assert cache.obter('b')[0]
+    assert cache.estatisticas()['bytes'] == 8000
+
+def test_memoizar_usa_argumentos_normalizados():
+    cache = CacheSimulacao()
+    chamadas = []
+
+    def dobro(valor, fator=2):
+        chamadas.append(valor)
+        return [valor * fator]
+
+    memorizada = memoizar(dobro, cache)
+    primeiro = memorizada(1.0)
+    assert memorizada(np.float64(1.0), fator=2) is primeiro
+    assert memorizada(1.000000001) is primeiro
+    memorizada(1.0, 3)
+    assert chamadas == [1.0, 1.0]
+    assert normalizar({'b': 1, 'a': [1.0, None]}) == (('a', (1.0, None)), ('b', 1))
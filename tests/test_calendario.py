@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from financeiro import somar_meses
+
+@pytest.mark.parametrize("data, meses, esperado", [
+    ("2025-01-31", 1, "2025-02-28"),
+    ("2024-01-31", 1, "2024-02-29"),
+    ("2025-01-31", 3, "2025-04-30"),
+    ("2025-01-31", 2, "2025-03-31"),
+    ("2024-12-15", 2, "2025-02-15"),
+])
+def test_somar_meses_limita_ao_fim_do_mes(data, meses, esperado):
+    assert somar_meses(np.datetime64(data), meses) == np.datetime64(esperado)
+
+def test_somar_meses_mantem_o_dia_de_vencimento():
+    datas = somar_meses(np.datetime64("2025-01-10"), np.arange(1, 5), dia_vencimento=31)
+    np.testing.assert_array_equal(datas, np.array(["2025-02-28", "2025-03-31", "2025-04-30", "2025-05-31"],
+                                                  dtype='datetime64[D]'))
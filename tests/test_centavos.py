@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from financeiro import amortizar_carteira, calcular_price, calcular_sac, para_centavos
+
+CASOS = [(350000.0, 0.99, 360), (123456.78, 1.37, 97), (50000.05, 0.5, 12), (1000.0, 2.0, 1)]
+
+@pytest.mark.parametrize("calcular", [calcular_price, calcular_sac])
+@pytest.mark.parametrize("valor, taxa, prazo", CASOS)
+def test_exato_fecha_no_centavo(calcular, valor, taxa, prazo):
+    parcelas = calcular(valor, taxa, prazo, exato=True)['parcelas']
+    prestacao, juros, amortizacao, saldo = (para_centavos(parcelas[coluna])
+                                            for coluna in ('Prestação', 'Juros', 'Amortização', 'Saldo Devedor'))
+    np.testing.assert_array_equal(prestacao, juros + amortizacao)
+    assert saldo[-1] == 0
+    assert amortizacao.sum() == para_centavos(valor)
+    np.testing.assert_array_equal(saldo, para_centavos(valor) - np.cumsum(amortizacao))
+
+# Saldo e juros em ponto flutuante pagando as mesmas prestações do modo exato
+def _recorrencia_flutuante(valor, i, prestacoes):
+    saldo = valor
+    juros = []
+    for prestacao in prestacoes:
+        juros.append(saldo * i)
+        saldo += juros[-1] - prestacao
+    return np.array(juros), saldo
+
+@pytest.mark.parametrize("calcular", [calcular_price, calcular_sac])
+@pytest.mark.parametrize("valor, taxa, prazo", CASOS)
+def test_exato_concilia_com_ponto_flutuante(calcular, valor, taxa, prazo):
+    exato = calcular(valor, taxa, prazo, exato=True)
+    parcelas = exato['parcelas']
+    juros, saldo = _recorrencia_flutuante(valor, taxa / 100, parcelas['Prestação'].to_numpy())
+    # Com as mesmas prestações, juros e saldo só diferem pelo arredondamento: até 1 centavo por período
+    assert abs(parcelas['Juros'].sum() - juros.sum()) <= 0.01 * prazo
+    assert abs(saldo) <= 0.01 * prazo
+    assert abs(exato['total_juros'] - juros.sum()) <= 0.01 * prazo
+
+@pytest.mark.parametrize("calcular", [calcular_price, calcular_sac])
+@pytest.mark.parametrize("valor, taxa, prazo", CASOS)
+def test_exato_proximo_do_calculo_em_ponto_flutuante(calcular, valor, taxa, prazo):
+    exato = calcular(valor, taxa, prazo, exato=True)['parcelas']['Prestação'].to_numpy()
+    flutuante = calcular(valor, taxa, prazo)['parcelas']['Prestação'].to_numpy()
+    # Cada parcela difere no máximo pelo arredondamento ao centavo; a última absorve o arredondamento
+    # da parcela (Price) acumulado com juros ao longo do prazo
+    assert np.abs(exato[:-1] - flutuante[:-1]).max(initial=0) <= 0.01 + 1e-9
+    acumulado = ((1 + taxa / 100) ** prazo - 1) / (taxa / 100)
+    assert abs(exato.sum() - flutuante.sum()) <= 0.005 * acumulado + 0.01 * prazo
+
+def test_carteira_exata_zera_cada_contrato():
+    valores = np.array([100000.0, 250000.5, 99999.99])
+    _, tabela = amortizar_carteira(valores, [0.8, 1.3, 0.45], [12, 24, 360], cronogramas=True, exato=True)
+    ultimas = tabela.groupby('Contrato').tail(1)
+    assert (para_centavos(ultimas['Saldo Devedor']) == 0).all()
+    amortizado = tabela.groupby('Contrato')['Amortização'].sum().to_numpy()
+    np.testing.assert_array_equal(para_centavos(amortizado), para_centavos(valores))
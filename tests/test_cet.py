@@ -0,0 +1,44 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from financeiro import calcular_cet, fluxo_com_entrada, parcela_inicial, simular_financiamento, xirr, xirr_lote
+
+def _simulacao(qtd_parcelas_entrada):
+    return simular_financiamento(500000.0, 100000.0, 0.9, "mensal + balão", 60, tipo_balao="anual",
+                                 data_entrada=date(2025, 1, 31), qtd_parcelas_entrada=qtd_parcelas_entrada)
+
+def test_fluxo_com_entrada_a_vista():
+    simulacao = _simulacao(1)
+    datas, fluxos = fluxo_com_entrada(simulacao)
+    assert datas[0] == datas[1] == np.datetime64("2025-01-31")
+    assert fluxos[:2].tolist() == [500000.0, -100000.0]
+    assert np.isclose(-fluxos[2:].sum(), simulacao['cronograma'].totais['Valor'])
+
+def test_fluxo_com_entrada_parcelada():
+    simulacao = _simulacao(3)
+    datas, fluxos = fluxo_com_entrada(simulacao)
+    entrada = simulacao['cronograma_entrada']
+    np.testing.assert_array_equal(datas[1:4], entrada['Data_Vencimento'])
+    np.testing.assert_allclose(fluxos[1:4], -entrada['Valor'])
+
+def test_parcelar_a_entrada_muda_o_cet_com_entrada():
+    a_vista = calcular_cet(_simulacao(1), incluir_entrada=True)['cet_anual']
+    parcelada = calcular_cet(_simulacao(3), incluir_entrada=True)['cet_anual']
+    assert a_vista is not None and parcelada is not None
+    # Pagar a entrada mais tarde, sem juros, barateia a operação como um todo
+    assert parcelada < a_vista
+
+def test_xirr_recupera_a_taxa_de_um_fluxo_conhecido():
+    i = 0.0099
+    prazo = 120
+    parcela = parcela_inicial(300000.0, i * 100, prazo)
+    datas = np.datetime64("2025-01-10") + np.arange(prazo + 1) * 30
+    fluxos = np.r_[300000.0, np.full(prazo, -parcela)]
+    esperado = (1 + i) ** (365 / 30) - 1
+    assert xirr(datas, fluxos) == pytest.approx(esperado, rel=1e-9)
+    # Em lote, com e sem chute inicial, o resultado é o mesmo
+    lote = xirr_lote([datas, datas[:61]], [fluxos, np.r_[300000.0, np.full(60, -parcela_inicial(300000.0, 0.99, 60))]],
+                     chutes=[esperado, 0.0])
+    np.testing.assert_allclose(lote, esperado, rtol=1e-9)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from financeiro import matriz_decisao
+
+POUPANCA = {'nome': "Poupança", 'tipo': "prefixado", 'taxa': 0.6, 'isento_ir': True}
+
+def test_taxa_de_equilibrio_e_a_taxa_do_investimento_isento():
+    # Investindo a 0,6% a.m. sem IR, financiar a 0,6% a.m. zera o saldo no fim do prazo (Price e SAC)
+    matriz = matriz_decisao(200000.0, [POUPANCA], taxas_juros=[0.4, 0.6, 0.8], prazos_meses=[12, 120])
+    np.testing.assert_allclose(matriz['taxa_equilibrio'], 0.6, atol=1e-4)
+    vantagem = matriz.set_index(['sistema', 'taxa_juros', 'prazo_meses'])['vantagem_financiar']
+    assert (vantagem.xs(0.4, level='taxa_juros') > 0).all()
+    assert (vantagem.xs(0.8, level='taxa_juros') < 0).all()
+    assert vantagem.xs(0.6, level='taxa_juros').abs().max() <= 0.01
+
+def test_decisao_segue_o_sinal_da_vantagem():
+    produtos = [POUPANCA, {'nome': "CDB", 'tipo': "cdi", 'taxa': 110}]
+    matriz = matriz_decisao(100000.0, produtos, taxas_juros=[0.5, 1.5], prazos_meses=[24])
+    assert len(matriz) == 2 * 2 * 2
+    esperado = np.where(matriz['vantagem_financiar'] > 0, "Financiar e investir", "Pagar à vista")
+    assert (matriz['decisao'] == esperado).all()
+    # Com IR, o equilíbrio do CDB fica abaixo da taxa bruta do produto
+    cdb = matriz[matriz['produto'] == "CDB"]
+    taxa_bruta = ((1 + 0.105) ** (1 / 12) - 1) * 1.10 * 100
+    assert (cdb['taxa_equilibrio'] < taxa_bruta).all()
+
+def test_entradas_invalidas():
+    with pytest.raises(ValueError):
+        matriz_decisao(100000.0, [], [1.0], [12])
+    with pytest.raises(ValueError):
+        matriz_decisao(100000.0, [POUPANCA], [1.0], [0])
+    with pytest.raises(ValueError):
+        matriz_decisao(100000.0, [POUPANCA], [-1.0], [12])
@@ -0,0 +1,70 @@
+import os
+from datetime import date
+
+import pytest
+
+from financeiro import dados_exportacao, gerar_excel_lote, gerar_pdfs_em_lote, simular_financiamento
+from financeiro.cache import CacheSimulacao
+from financeiro.exportacao import _nome_arquivo_pdf, _titulos_abas, exportacao_pronta, obter_exportacao
+
+ENTRADAS = dict(valor_total=300000.0, entrada=30000.0, taxa_mensal=0.9, modalidade="mensal", qtd_parcelas=24,
+                data_entrada=date(2025, 1, 10))
+
+def test_nome_fica_dentro_do_diretorio_e_termina_em_pdf():
+    usados = set()
+    assert _nome_arquivo_pdf("../../etc/passwd", 1, usados) == "passwd.pdf"
+    assert _nome_arquivo_pdf("lotes/Lote 12.PDF", 2, usados) == "Lote 12.pdf"
+    assert _nome_arquivo_pdf("José: apto 3?", 3, usados) == "José_ apto 3_.pdf"
+    assert _nome_arquivo_pdf("..", 4, usados) == "simulacao_00004.pdf"
+    assert _nome_arquivo_pdf(None, 5, usados) == "simulacao_00005.pdf"
+
+def test_nomes_repetidos_nao_se_sobrescrevem():
+    usados = set()
+    nomes = [_nome_arquivo_pdf(nome, indice, usados) for indice, nome in enumerate(["Lote", "lote", "Lote.pdf"], 1)]
+    assert nomes == ["Lote.pdf", "lote_00002.pdf", "Lote_00003.pdf"]
+
+def test_gerar_pdfs_em_lote(tmp_path):
+    pytest.importorskip("fpdf")
+    simulacao = simular_financiamento(**ENTRADAS)
+    item = {'cronograma': simulacao['cronograma'], 'dados': dados_exportacao(simulacao)}
+    caminhos = gerar_pdfs_em_lote([{**item, 'nome': "../fora"}, {**item, 'nome': "fora"}, item], tmp_path,
+                                  max_processos=1)
+    assert [os.path.basename(caminho) for caminho in caminhos] == ["fora.pdf", "fora_00002.pdf", "simulacao_00003.pdf"]
+    assert sorted(os.listdir(tmp_path)) == ["fora.pdf", "fora_00002.pdf", "simulacao_00003.pdf"]
+
+def test_exportacao_sob_demanda_nao_copia_o_documento():
+    simulacao = simular_financiamento(**ENTRADAS)
+    cache = CacheSimulacao()
+    for formato, assinatura in (("pdf", b"%PDF"), ("excel", b"PK")):
+        conteudo = obter_exportacao("chave", formato, simulacao['cronograma'], simulacao['cronograma_entrada'],
+                                    dados_exportacao(simulacao), cache)
+        assert isinstance(conteudo, memoryview) and conteudo.readonly
+        assert conteudo[:len(assinatura)] == assinatura
+        assert exportacao_pronta("chave", formato, cache) is conteudo
+        assert cache.estatisticas()['bytes'] >= conteudo.nbytes
+        cache.limpar()
+
+def test_titulos_de_abas_validos_e_unicos():
+    usados = set()
+    titulos = [_titulos_abas(nome, indice, usados) for indice, nome in enumerate(
+        ["Apto 3/4", "Apto 3:4", "Residencial Jardim das Acácias Bloco B [cobertura]", "Residencial Jardim das Acácias Bloco C"], 1
+    )]
+    assert titulos[0] == ["Apto 3_4 - Entrada", "Apto 3_4 - Financiamento"]
+    assert titulos[1] == ["Apto 3_4 (2) - Entrada", "Apto 3_4 (2) - Financiamento"]
+    assert titulos[2][1] == "Residencial Jar - Financiamento"
+    assert titulos[3][1] == "Residencial (4) - Financiamento"
+    todos = [titulo for par in titulos for titulo in par]
+    assert all(len(titulo) <= 31 for titulo in todos)
+    assert len({titulo.lower() for titulo in todos}) == len(todos)
+
+def test_gerar_excel_lote_com_nomes_invalidos(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    simulacao = simular_financiamento(**{**ENTRADAS, 'qtd_parcelas_entrada': 3})
+    item = {'cronograma': simulacao['cronograma'], 'cronograma_entrada': simulacao['cronograma_entrada']}
+    destino = gerar_excel_lote([{**item, 'nome': "Apto 3/4"}, {**item, 'nome': "Apto 3\\4"}, item],
+                               os.path.join(tmp_path, "lote.xlsx"))
+    assert openpyxl.load_workbook(destino, read_only=True).sheetnames == [
+        "Apto 3_4 - Entrada", "Apto 3_4 - Financiamento",
+        "Apto 3_4 (2) - Entrada", "Apto 3_4 (2) - Financiamento",
+        "3 - Entrada", "3 - Financiamento"
+    ]
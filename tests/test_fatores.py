@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from financeiro import fator_anuidade, fatores_desconto, tabela_fatores
+from financeiro.fatores import HORIZONTE_TABELA
+
+@pytest.mark.parametrize("taxa", [0.0, 0.005, 0.0079, 0.02, 0.1268])
+@pytest.mark.parametrize("periodos", [0, 1, 12, 360, 600, 7.5])
+def test_fator_anuidade_coincide_com_a_forma_fechada(taxa, periodos):
+    esperado = periodos if taxa == 0 else (1 - (1 + taxa) ** -periodos) / taxa
+    assert fator_anuidade(taxa, periodos) == pytest.approx(esperado, rel=1e-12, abs=1e-12)
+
+def test_fatores_desconto_inteiros_fracionarios_e_negativos():
+    periodos = np.array([0, 1, 12, 12.4, -3, 500])
+    np.testing.assert_allclose(fatores_desconto(0.0079, periodos), 1.0079 ** -periodos, rtol=1e-12)
+
+def test_tabela_e_reutilizada_e_ampliada_alem_do_horizonte():
+    tabela = tabela_fatores(0.0123)
+    assert tabela_fatores(0.0123) is tabela
+    assert len(tabela['anuidade']) == HORIZONTE_TABELA + 1
+    maior = tabela_fatores(0.0123, HORIZONTE_TABELA + 100)
+    assert len(maior['anuidade']) == HORIZONTE_TABELA + 101
+    np.testing.assert_array_equal(maior['desconto'][:HORIZONTE_TABELA + 1], tabela['desconto'])
+    with pytest.raises(ValueError):
+        tabela['anuidade'][1] = 0
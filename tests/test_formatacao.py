@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from financeiro import formatar_moeda, formatar_moedas
+
+VALORES = [0.0, -0.0, 0.004, 0.005, 0.015, 0.125, 0.999, 1.005, 2.675, -2.675, 1234.565, -1234.565, 999.995,
+           999999.995, 1000000.0, -1000000.005, 12345678.9, -98765432.105, 1e12 + 0.5]
+
+@pytest.mark.parametrize("simbolo", [True, False])
+def test_formatar_moedas_coincide_com_formatar_moeda(simbolo):
+    texto = formatar_moedas(VALORES, simbolo)
+    assert texto.tolist() == [formatar_moeda(valor, simbolo) for valor in VALORES]
+
+def test_formatar_moeda_exemplos():
+    assert formatar_moeda(1234567.891) == "R$ 1.234.567,89"
+    assert formatar_moeda(-0.5) == "R$ -0,50"
+    assert formatar_moeda(0.999) == "R$ 1,00"
+    assert formatar_moeda("R$ 1.234,56", simbolo=False) == "1.234,56"
+    assert formatar_moeda(None) == "R$ 0,00"
+
+def test_formatar_moedas_mantem_indice_da_serie_e_aceita_textos():
+    serie = pd.Series([1500.0, None, -20.0], index=[3, 5, 7], name="Valor")
+    texto = formatar_moedas(serie)
+    assert texto.index.tolist() == [3, 5, 7] and texto.name == "Valor"
+    assert texto.tolist() == ["R$ 1.500,00", "R$ 0,00", "R$ -20,00"]
+    assert formatar_moedas(np.array(["R$ 1.234,56", None], dtype=object)).tolist() == ["R$ 1.234,56", "R$ 0,00"]
@@ -0,0 +1,48 @@
+from datetime import date
+
+from financeiro import calcular_cet
+from financeiro.cache import CacheSimulacao
+from financeiro.grafo import GrafoSimulacao
+
+ENTRADAS = dict(valor_total=500000.0, entrada=50000.0, taxa_mensal=0.79, modalidade="mensal + balão",
+                qtd_parcelas=120, tipo_balao="anual", data_entrada=date(2025, 1, 10))
+
+def test_segunda_sessao_reaproveita_o_cache():
+    cache = CacheSimulacao()
+    primeira = GrafoSimulacao(cache=cache, **ENTRADAS)
+    resultado = primeira.resultado()
+    primeira.obter('exibicao')
+
+    segunda = GrafoSimulacao(cache=cache, **ENTRADAS)
+    assert segunda.resultado()['cronograma'] is resultado['cronograma']
+    segunda.obter('exibicao')
+    assert not {'fluxo', 'cronograma', 'cet', 'exibicao'} & set(segunda.execucoes)
+    assert cache.estatisticas()['acertos'] >= 3
+
+def test_entradas_diferentes_nao_compartilham():
+    cache = CacheSimulacao()
+    GrafoSimulacao(cache=cache, **ENTRADAS).resultado()
+    outra = GrafoSimulacao(cache=cache, **{**ENTRADAS, 'qtd_parcelas': 60})
+    outra.resultado()
+    assert outra.execucoes['cronograma'] == 1
+
+def test_sem_data_de_entrada_nao_compartilha():
+    cache = CacheSimulacao()
+    entradas = {**ENTRADAS, 'data_entrada': None}
+    GrafoSimulacao(cache=cache, **entradas).resultado()
+    segunda = GrafoSimulacao(cache=cache, **entradas)
+    segunda.resultado()
+    assert segunda.execucoes['cronograma'] == 1
+
+def test_cet_com_entrada_parcelada_e_uma_etapa_do_grafo():
+    cache = CacheSimulacao()
+    entradas = {**ENTRADAS, 'qtd_parcelas_entrada': 3}
+    grafo = GrafoSimulacao(cache=cache, **entradas)
+    esperado = calcular_cet(grafo.resultado(), incluir_entrada=True)
+    assert grafo.obter('cet_entrada') == esperado
+
+    grafo.atualizar(comissao_imobiliaria=4.0)
+    grafo.obter('cet_entrada')
+    segunda = GrafoSimulacao(cache=cache, **entradas)
+    assert segunda.obter('cet_entrada') == esperado
+    assert grafo.execucoes['cet_entrada'] == 1 and 'cet_entrada' not in segunda.execucoes
@@ -0,0 +1,24 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from financeiro.indices import carregar_indices, ler_numeros
+
+def test_ler_numeros_aceita_virgula_decimal():
+    serie = pd.Series(["0,45", "1.234,5", "", "-0,1"])
+    np.testing.assert_array_equal(ler_numeros(serie).to_numpy(), [0.45, 1234.5, np.nan, -0.1])
+
+def test_cache_das_series_fica_no_diretorio_indicado(tmp_path):
+    origem = tmp_path / "dados"
+    origem.mkdir()
+    arquivo = origem / "indices.csv"
+    arquivo.write_text("data;IPCA;INCC\n01/2025;0,16;0,71\n02/2025;1,31;0,51\n03/2025;0,56;0,39\n")
+    cache = tmp_path / "cache"
+
+    series = carregar_indices(str(arquivo), diretorio_cache=str(cache))
+
+    assert os.listdir(origem) == ["indices.csv"]
+    assert sorted(os.listdir(cache)) == ["indices.csv.indices.npy", "indices.csv.indices.npy.json"]
+    fatores = series.fatores("INCC", "2025-01", 2)
+    np.testing.assert_allclose(fatores, [1, 1.0051, 1.0051 * 1.0039])
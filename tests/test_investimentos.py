@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from financeiro import comparar_investimentos, simular_imobiliario, simular_poupanca
+
+def test_taxa_fixa_retorna_historico_colunar():
+    resultado = simular_poupanca(100000.0, 24, 0.5)
+    historico = resultado['historico']
+    assert isinstance(historico, pd.DataFrame)
+    assert list(historico.columns) == ['Mês', 'Valor', 'Rendimento']
+    esperado = 100000.0 * 1.005 ** np.arange(1, 25)
+    np.testing.assert_allclose(historico['Valor'], esperado.round(2), atol=0.005)
+    assert resultado['valor_final'] == historico['Valor'].iloc[-1]
+    assert resultado['rendimento_total'] == historico['Rendimento'].iloc[-1]
+
+def test_taxa_fixa_coincide_com_o_motor_de_n_produtos():
+    resultado = simular_imobiliario(50000.0, 12)
+    produto = {'nome': "Imobiliário", 'tipo': "prefixado", 'taxa': 0.7, 'isento_ir': True}
+    historico = comparar_investimentos(50000.0, 12, [produto])['historico']
+    np.testing.assert_array_equal(resultado['historico']['Valor'], historico['Valor'])
+
+def test_resgates_limitados_ao_saldo():
+    produto = {'nome': "A", 'tipo': "prefixado", 'taxa': 1.0}
+    resultado = comparar_investimentos(10000.0, 24, [produto], resgate_mensal=1000.0)
+    historico = resultado['historico']
+    assert (historico['Valor'] >= 0).all()
+    # 10 resgates cheios; o 11º leva só o saldo corrigido, e depois disso nada mais sai
+    saldo = 10000.0
+    for _ in range(10):
+        saldo = saldo * 1.01 - 1000.0
+    ultimo = saldo * 1.01
+    assert historico['Valor'].iloc[10:].eq(0).all()
+    np.testing.assert_allclose(historico['Resgatado'].iloc[10:], round(10000.0 + ultimo, 2), atol=0.01)
+    resumo = resultado['resumo'].iloc[0]
+    assert resumo['valor_final'] == 0
+    assert resumo['total_aplicado'] == 10000.0
+    assert resumo['imposto'] == 0
+    np.testing.assert_allclose(resumo['rendimento_bruto'], resumo['total_resgatado'] - 10000.0, atol=0.01)
+    np.testing.assert_allclose(resumo['rentabilidade_liquida'], resumo['rendimento_liquido'] / 100, atol=0.01)
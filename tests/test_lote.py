@@ -0,0 +1,43 @@
+import os
+
+import pandas as pd
+import pytest
+
+from financeiro.lote import simular_lote
+
+CABECALHO = "id,valor_total,entrada,taxa_mensal,modalidade,qtd_parcelas,qtd_parcelas_entrada,valor_parcela,data_entrada"
+LINHAS = [
+    "1,500000,50000,0.79,mensal,120,,,10/01/2025",
+    "2,300000,30000,0.9,mensal,60,,,2025-02-15",
+    "A-3,400000,40000,0.85,mensal,36,3.0,,10/01/2025",
+    "A-4,abc,40000,0.85,mensal,36,,,10/01/2025",
+    ",200000,20000,0.7,mensal + balão,48,,1500,10/01/2025"
+]
+
+@pytest.mark.parametrize("formato", ["parquet", "csv"])
+def test_blocos_com_tipos_diferentes_mantem_o_esquema(tmp_path, formato):
+    pytest.importorskip("pyarrow")
+    entradas = os.path.join(tmp_path, "entradas.csv")
+    with open(entradas, "w") as arquivo:
+        arquivo.write("\n".join([CABECALHO, *LINHAS]) + "\n")
+    saida = os.path.join(tmp_path, f"cronogramas.{formato}")
+    resumo = os.path.join(tmp_path, f"resumo.{formato}")
+
+    estatisticas = simular_lote(entradas, saida, resumo, tamanho_bloco=2, max_processos=1)
+
+    ler = pd.read_parquet if formato == "parquet" else lambda caminho: pd.read_csv(caminho, dtype={'id': str})
+    tabela_resumo = ler(resumo)
+    assert estatisticas['simulacoes'] == len(tabela_resumo) == len(LINHAS)
+    assert estatisticas['erros'] == 1
+    assert tabela_resumo['id'].tolist()[:4] == ["1", "2", "A-3", "A-4"]
+    assert tabela_resumo.loc[3, 'erro'] and tabela_resumo['erro'].isna().sum() == 4
+    assert len(ler(saida)) == estatisticas['linhas'] > 0
+
+def test_entrada_parquet_com_id_numerico(tmp_path):
+    pytest.importorskip("pyarrow")
+    entradas = os.path.join(tmp_path, "entradas.parquet")
+    pd.DataFrame({'id': [10, 20, 30], 'valor_total': [500000.0, 300000.0, 400000.0], 'entrada': 50000.0,
+                  'taxa_mensal': 0.79, 'modalidade': "mensal", 'qtd_parcelas': [120, 60, 36]}).to_parquet(entradas)
+    resumo = os.path.join(tmp_path, "resumo.parquet")
+    simular_lote(entradas, resumo=resumo, tamanho_bloco=2, max_processos=1)
+    assert pd.read_parquet(resumo)['id'].tolist() == ["10", "20", "30"]
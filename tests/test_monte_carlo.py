@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from financeiro import simular_monte_carlo
+
+HISTORICO = [0.8, 0.9, 1.0, 1.1, 1.0, 0.95, 0.85, 0.9, 1.05, 1.0, 0.9, 0.8]
+
+@pytest.mark.parametrize("modelo, parametros", [
+    ("reversao", {'taxa_inicial': 10.5, 'volatilidade': 3.0}),
+    ("bootstrap", {'historico': HISTORICO, 'meses_por_bloco': 3})
+])
+def test_mesma_semente_reproduz_o_resultado(modelo, parametros):
+    primeira = simular_monte_carlo(100000.0, 36, modelo, qtd_caminhos=500, tamanho_bloco=128, semente=42, **parametros)
+    segunda = simular_monte_carlo(100000.0, 36, modelo, qtd_caminhos=500, tamanho_bloco=128, semente=42, **parametros)
+    outra = simular_monte_carlo(100000.0, 36, modelo, qtd_caminhos=500, tamanho_bloco=128, semente=7, **parametros)
+    assert primeira['percentis'] == segunda['percentis']
+    assert primeira['valor_final_medio'] == segunda['valor_final_medio']
+    pd.testing.assert_frame_equal(primeira['faixas'], segunda['faixas'])
+    assert outra['percentis'] != primeira['percentis']
+
+def test_sem_volatilidade_coincide_com_a_capitalizacao_deterministica():
+    resultado = simular_monte_carlo(100000.0, 24, "reversao", qtd_caminhos=10, semente=1, taxa_inicial=12.0,
+                                    taxa_longo_prazo=12.0, volatilidade=0.0)
+    esperado = 100000.0 * 1.12 ** 2
+    assert resultado['valor_final_medio'] == pytest.approx(esperado, abs=0.01)
+    assert set(resultado['percentis'].values()) == {round(esperado, 2)}
+    assert resultado['probabilidade_perda'] == 0.0
+
+def test_bootstrap_usa_blocos_da_serie_historica():
+    resultado = simular_monte_carlo(1000.0, 12, "bootstrap", qtd_caminhos=200, semente=3, historico=[1.0] * 6)
+    np.testing.assert_allclose(resultado['faixas']['P50'], np.round(1000.0 * 1.01 ** np.arange(1, 13), 2))
+
+def test_modelo_desconhecido():
+    with pytest.raises(ValueError):
+        simular_monte_carlo(1000.0, 12, "outro")
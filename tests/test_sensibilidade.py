@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from financeiro import calcular_price, calcular_sac, cores_mapa_calor, grade_sensibilidade, tabela_sensibilidade
+
+TAXAS = [0.0, 0.5, 1.25, 2.5]
+PRAZOS = [1, 12, 60, 360]
+
+def test_grade_coincide_com_calcular_price_e_calcular_sac():
+    grade = grade_sensibilidade([100000.0, 250000.0], TAXAS, PRAZOS)
+    assert len(grade) == 2 * len(TAXAS) * len(PRAZOS)
+    for linha in grade.itertuples():
+        price = calcular_price(linha.valor_financiado, linha.taxa_juros, linha.prazo_meses)
+        sac = calcular_sac(linha.valor_financiado, linha.taxa_juros, linha.prazo_meses)
+        assert linha.parcela_price == pytest.approx(price['valor_parcela'], abs=0.005)
+        assert linha.total_juros_price == pytest.approx(price['total_juros'], abs=0.005)
+        assert linha.total_juros_sac == pytest.approx(sac['total_juros'], abs=0.005)
+        assert linha.diferenca_juros == pytest.approx(linha.total_juros_price - linha.total_juros_sac)
+
+def test_tabela_taxa_por_prazo():
+    grade = grade_sensibilidade([100000.0, 250000.0], TAXAS, PRAZOS)
+    tabela = tabela_sensibilidade(grade, 'parcela_price', 250000.0)
+    assert tabela.index.tolist() == TAXAS and tabela.columns.tolist() == PRAZOS
+    assert tabela.loc[1.25, 60] == pytest.approx(calcular_price(250000.0, 1.25, 60)['valor_parcela'], abs=0.005)
+    with pytest.raises(ValueError):
+        tabela_sensibilidade(grade, 'parcela_price', 1.0)
+
+def test_prazo_invalido():
+    with pytest.raises(ValueError):
+        grade_sensibilidade(100000.0, TAXAS, [0, 12])
+
+def test_cores_mapa_calor_vai_do_verde_ao_vermelho():
+    tabela = tabela_sensibilidade(grade_sensibilidade(100000.0, TAXAS, PRAZOS), 'diferenca_juros')
+    estilos = cores_mapa_calor(tabela)
+    valores = tabela.to_numpy()
+    assert estilos.to_numpy()[np.unravel_index(valores.argmin(), valores.shape)].startswith("background-color: #1a9850")
+    assert estilos.to_numpy()[np.unravel_index(valores.argmax(), valores.shape)].startswith("background-color: #d73027")
@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+from starlette.testclient import TestClient
+
+import servidor
+from financeiro.cache import cache_simulacoes
+
+PARAMETROS = dict(valor_total=500000.0, entrada=50000.0, taxa_mensal=0.79, modalidade="mensal", qtd_parcelas=120)
+
+def test_simulacao_com_data_de_entrada_usa_o_cache():
+    parametros = {**PARAMETROS, 'data_entrada': date(2025, 1, 10)}
+    assert servidor.simular_financiamento(**parametros) is servidor.simular_financiamento(**parametros)
+
+def test_simulacao_sem_data_de_entrada_nao_usa_o_cache():
+    antes = cache_simulacoes.estatisticas()
+    primeira = servidor.simular_financiamento(**PARAMETROS)
+    assert servidor.simular_financiamento(**PARAMETROS) is not primeira
+    depois = cache_simulacoes.estatisticas()
+    assert (depois['acertos'], depois['falhas']) == (antes['acertos'], antes['falhas'])
+
+def test_exportacao_sem_data_de_entrada_nao_usa_o_cache():
+    antes = cache_simulacoes.estatisticas()
+    conteudo = servidor._tarefa_exportacao(PARAMETROS, "excel")
+    assert conteudo[:2] == b"PK"
+    depois = cache_simulacoes.estatisticas()
+    assert (depois['acertos'], depois['falhas'], depois['itens']) == (antes['acertos'], antes['falhas'], antes['itens'])
+
+def test_formulario_le_parcelas_da_entrada_e_dia_de_vencimento():
+    form = {'valor_total': "500000", 'entrada': "60000", 'taxa_mensal': "0.79", 'quantidade_parcelas': "120",
+            'modalidade_plano': "mensal", 'data_entrada': "10/01/2025", 'qtd_parcelas_entrada': "3",
+            'dia_vencimento': "5"}
+    parametros = servidor.parametros_formulario(form)
+    assert (parametros['qtd_parcelas_entrada'], parametros['dia_vencimento']) == (3, 5)
+    assert servidor.parametros_formulario({**form, 'qtd_parcelas_entrada': "", 'dia_vencimento': ""})['dia_vencimento'] is None
+
+@pytest.mark.parametrize("rota", ["/calcular_baloes", "/api/simulacao", "/api/price", "/api/sac"])
+@pytest.mark.parametrize("corpo", [b"{", b"[1, 2]", b"\"texto\"", b"\xff"])
+def test_corpo_json_invalido_retorna_400(rota, corpo):
+    resposta = TestClient(servidor.app).post(rota, content=corpo, headers={'Content-Type': "application/json"})
+    assert resposta.status_code == 400
+    assert "erro" in resposta.json()
+
+@pytest.mark.parametrize("campo, valor", [
+    ('valor_total', [1]),
+    ('qtd_parcelas', "inf"),
+    ('taxa_mensal', "nan"),
+    ('data_entrada', 5),
+    ('qtd_parcelas', 100000000),
+    ('qtd_parcelas_entrada', 100000000)
+])
+def test_simulacao_com_campo_invalido_retorna_400(campo, valor):
+    with TestClient(servidor.app) as cliente:
+        resposta = cliente.post("/api/simulacao", json={**PARAMETROS, campo: valor})
+    assert resposta.status_code == 400
+    assert "parcelas" in resposta.json()['erro'] or campo in resposta.json()['erro']
+
+@pytest.mark.parametrize("sistema", ["price", "sac"])
+@pytest.mark.parametrize("corpo", [
+    {'valor_financiado': "nan", 'taxa_juros': 1.0, 'prazo_meses': 12},
+    {'valor_financiado': 100000.0, 'taxa_juros': "inf", 'prazo_meses': 12},
+    {'valor_financiado': 100000.0, 'taxa_juros': 1.0, 'prazo_meses': 10 ** 9},
+    {'valor_financiado': 100000.0, 'taxa_juros': 1.0, 'prazo_meses': -12},
+    {'valor_financiado': -100000.0, 'taxa_juros': 1.0, 'prazo_meses': 12},
+    {'valor_financiado': 100000.0, 'taxa_juros': 1.0}
+])
+def test_amortizacao_com_campo_invalido_retorna_400(sistema, corpo):
+    resposta = TestClient(servidor.app).post(f"/api/{sistema}", json=corpo)
+    assert resposta.status_code == 400
+    assert "erro" in resposta.json()
+
+def test_tipo_de_balao_que_nao_e_texto_retorna_400():
+    resposta = TestClient(servidor.app).post("/calcular_baloes", json={'modalidade': "mensal + balão", 'parcelas': 120,
+                                                                        'tipo_balao': 5})
+    assert resposta.status_code == 400
+    assert "erro" in resposta.json()
+
+def test_exportacao_que_falha_nao_gera_anexo_vazio(monkeypatch):
+    monkeypatch.setattr(servidor, "obter_exportacao", lambda *args, **kwargs: memoryview(b""))
+    with pytest.raises(RuntimeError):
+        servidor._tarefa_exportacao(PARAMETROS, "pdf")
@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+from financeiro import parcela_inicial, resolver_prazo, resolver_taxa, resolver_valor_financiado
+
+@pytest.mark.parametrize("sistema", ["price", "sac"])
+def test_resolvedores_fazem_o_caminho_de_volta(sistema):
+    valores = np.array([80000.0, 350000.0, 1200000.0])
+    taxas = np.array([0.35, 0.99, 2.4])
+    prazos = np.array([24, 360, 420])
+    parcelas = parcela_inicial(valores, taxas, prazos, sistema)
+    np.testing.assert_allclose(resolver_taxa(valores, parcelas, prazos, sistema), taxas, rtol=1e-9)
+    np.testing.assert_allclose(resolver_valor_financiado(parcelas, taxas, prazos, sistema), valores, rtol=1e-9)
+    np.testing.assert_allclose(resolver_prazo(valores, taxas, parcelas, sistema, inteiro=False), prazos, rtol=1e-9)
+    np.testing.assert_array_equal(resolver_prazo(valores, taxas, parcelas, sistema), prazos)
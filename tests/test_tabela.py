@@ -0,0 +1,43 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from financeiro import Cronograma, calcular_taxas, gerar_cronograma
+
+def _cronograma():
+    taxas = calcular_taxas(0.9)
+    return gerar_cronograma(300000.0, 0, 30000.0, 60, 5, "mensal + balão", "anual", date(2025, 2, 10), taxas, 10)
+
+def test_arrow_ida_e_volta_preserva_colunas_totais_e_erro():
+    cronograma = _cronograma()
+    assert not cronograma.erro and len(cronograma) > 0
+    volta = Cronograma.from_arrow(cronograma.to_arrow())
+    assert volta.nomes == cronograma.nomes
+    for nome in cronograma.nomes:
+        np.testing.assert_array_equal(volta[nome], cronograma[nome])
+    assert volta['Data_Vencimento'].dtype == np.dtype('datetime64[D]')
+    assert volta.totais == cronograma.totais
+    assert volta.erro is None
+
+def test_arrow_ida_e_volta_de_cronograma_com_erro():
+    vazio = Cronograma.vazio(erro="Erro no cálculo")
+    volta = Cronograma.from_arrow(vazio.to_arrow())
+    assert len(volta) == 0 and volta.nomes == vazio.nomes
+    assert volta.erro == "Erro no cálculo" and volta.totais == {}
+
+def test_colunas_somente_leitura_e_compartilhadas():
+    cronograma = _cronograma()
+    with pytest.raises(ValueError):
+        cronograma['Valor'][0] = 0
+    novo = cronograma.com_colunas(totais={'Extra': 1.0}, Extra=np.ones(len(cronograma)))
+    assert np.shares_memory(novo['Valor'], cronograma['Valor'])
+    assert novo.totais == {**cronograma.totais, 'Extra': 1.0} and 'Extra' not in cronograma
+    assert np.shares_memory(cronograma.to_pandas()['Valor'].to_numpy(), cronograma['Valor'])
+
+def test_linhas_e_comprimentos():
+    cronograma = _cronograma()
+    primeira = next(cronograma.linhas())
+    assert primeira['Item'] == "Parcela 1" and isinstance(primeira['Data_Vencimento'], date)
+    with pytest.raises(ValueError):
+        Cronograma({'Valor': [1.0, 2.0], 'Dias': [30]})